@@ -0,0 +1,11 @@
+"""
+Benchmarks for the To-Do application. Run from the repository root:
+
+  python -m benchmarks run ...              throughput/latency/memory suite (see suite.py)
+  python -m benchmarks.memory_report        bytes per task for each storage engine
+  python -m benchmarks.concurrency_stress   threaded readers/writers consistency check
+  python -m benchmarks.shard_scaling        full-store filter speedup per shard count
+  python -m benchmarks.snapshot_startup     startup time from JSON versus mapped binary snapshots
+  python -m benchmarks.undo_journal         time and memory the undo journal adds per mutation
+  python -m benchmarks.load_generator       requests/sec and latency against a running --serve server
+"""
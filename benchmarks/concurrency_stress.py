@@ -0,0 +1,114 @@
+"""
+Stress test and throughput report for ConcurrentTaskManager.
+
+Usage: python -m benchmarks.concurrency_stress [--threads 1,2,4,8] [--seconds 2] [--initial-tasks 10000]
+
+For each thread count, that many writer threads and that many reader threads
+run against one shared store for a fixed time:
+  - writers create, modify, mark and delete tasks through TaskLifecycleService;
+  - readers take snapshots and check that each one is internally consistent
+    (its status counts match its tasks), and run indexed queries.
+After the run the live store, its indexes and a fresh snapshot are checked
+against each other. Any inconsistency aborts with a non-zero exit code.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from typing import List
+from todo_app.services.query_engine import QueryEngine
+from todo_app.services.task_lifecycle_service import TaskLifecycleService
+from todo_app.state_management.concurrent_task_manager import ConcurrentTaskManager
+from todo_app.utils.id_generator import SequentialIDGenerator
+
+class ConsistencyError(AssertionError):
+    pass
+
+def _writer(service: TaskLifecycleService, stop: threading.Event, counter: List[int], seed: int) -> None:
+    rng = random.Random(seed)
+    owned: List[str] = []
+    operations = 0
+    while not stop.is_set():
+        roll = rng.random()
+        try:
+            if roll < 0.4 or not owned:
+                owned.append(service.create_new_task(f"task {rng.randrange(10**6)}", "stress").id)
+            elif roll < 0.6:
+                service.modify_task(rng.choice(owned), f"renamed {rng.randrange(10**6)}", None)
+            elif roll < 0.85:
+                task_id = rng.choice(owned)
+                service.set_task_completion_status(task_id, rng.random() < 0.5)
+            else:
+                service.remove_task(owned.pop(rng.randrange(len(owned))))
+        except ValueError:
+            pass  # e.g. marking a task with the status it already has
+        operations += 1
+    counter.append(operations)
+
+def _reader(query_engine: QueryEngine, stop: threading.Event, counter: List[int], errors: List[str]) -> None:
+    operations = 0
+    while not stop.is_set():
+        snapshot = query_engine.snapshot()
+        complete = sum(1 for task in snapshot.tasks.values() if task.is_complete)
+        if complete != snapshot.complete_count or len(snapshot.tasks) - complete != snapshot.incomplete_count:
+            errors.append(f"torn snapshot at version {snapshot.version}")
+            return
+        query_engine.top_k("title", 10, is_complete=False)
+        query_engine.count(True)
+        operations += 1
+    counter.append(operations)
+
+def _verify_store(task_manager: ConcurrentTaskManager) -> None:
+    tasks = task_manager.get_all_tasks()
+    complete = sum(1 for task in tasks if task.is_complete)
+    if task_manager.count_tasks() != len(tasks) or task_manager.count_tasks(True) != complete:
+        raise ConsistencyError("index counts disagree with stored tasks")
+    ordered = task_manager.find_tasks(order_by="id")
+    if sorted(task.id for task in ordered) != sorted(task.id for task in tasks):
+        raise ConsistencyError("ordered index disagrees with stored tasks")
+
+def run(threads: int, seconds: float, initial_tasks: int) -> None:
+    task_manager = ConcurrentTaskManager()
+    service = TaskLifecycleService(task_manager, SequentialIDGenerator())
+    query_engine = QueryEngine(task_manager)
+    service.create_many((f"seed {number}", None) for number in range(initial_tasks))
+
+    stop = threading.Event()
+    write_counts: List[int] = []
+    read_counts: List[int] = []
+    errors: List[str] = []
+    workers = [threading.Thread(target=_writer, args=(service, stop, write_counts, seed)) for seed in range(threads)]
+    workers += [threading.Thread(target=_reader, args=(query_engine, stop, read_counts, errors)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    if errors:
+        raise ConsistencyError("; ".join(errors))
+    _verify_store(task_manager)
+    print(f"{threads:>7}  {sum(write_counts) / seconds:>14,.0f}  {sum(read_counts) / seconds:>14,.0f}"
+          f"  {task_manager.count_tasks():>8}", flush=True)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent readers/writers stress test.")
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma-separated writer/reader thread counts.")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Duration of each run.")
+    parser.add_argument("--initial-tasks", type=int, default=10_000, help="Tasks created before each run.")
+    args = parser.parse_args(argv)
+
+    print(f"{'threads':>7}  {'writes/sec':>14}  {'snapshots/sec':>14}  {'tasks':>8}")
+    try:
+        for threads in (int(count) for count in args.threads.split(",")):
+            run(threads, args.seconds, args.initial_tasks)
+    except ConsistencyError as e:
+        print(f"FAILED: {e}", file=sys.stderr)
+        return 1
+    print("Store remained consistent.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Load generator for the TaskServer line protocol.
+
+Usage: python -m benchmarks.load_generator [--host 127.0.0.1 --port 7878 | --unix PATH]
+                                          [--connections 1000] [--requests 100] [--pipeline 4]
+
+Opens many concurrent connections, each sending a mix of add/view/search/mark
+commands while keeping up to --pipeline requests in flight, and reports
+requests/sec with p50/p90/p99/max latency measured per request.
+"""
+import argparse
+import asyncio
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+from todo_app.server.line_server import TERMINATOR, raise_open_file_limit
+
+def _command_mix(connection: int, request: int) -> str:
+    kind = request % 10
+    if kind < 4:
+        return f'add "load task c{connection} r{request}" "generated by load_generator"'
+    if kind < 7:
+        return "view --page 1 --limit 5"
+    if kind < 9:
+        return f"search c{connection}"
+    return f"mark {1 + (connection * 7 + request) % 50} complete"
+
+async def _read_response(reader: asyncio.StreamReader) -> bool:
+    """
+    Reads one framed response; returns True if its status was OK.
+    """
+    status = await reader.readline()
+    if not status:
+        raise ConnectionError("Server closed the connection.")
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection mid-response.")
+        if line == TERMINATOR:
+            return status == b"OK\n"
+
+async def _run_connection(connection: int, requests: int, pipeline: int, open_connection,
+                          latencies: List[float], failures: List[int]) -> None:
+    reader, writer = await open_connection()
+    sent_at: Deque[float] = deque()
+
+    async def receive_all() -> None:
+        for _ in range(requests):
+            ok = await _read_response(reader)
+            latencies.append(time.perf_counter() - sent_at.popleft())
+            if not ok:
+                failures[0] += 1
+            window.release()
+
+    window = asyncio.Semaphore(pipeline)
+    receiver = asyncio.create_task(receive_all())
+    try:
+        for request in range(requests):
+            await window.acquire()
+            sent_at.append(time.perf_counter())
+            writer.write((_command_mix(connection, request) + "\n").encode("utf-8"))
+            await writer.drain()
+        await receiver
+    finally:
+        receiver.cancel()
+        writer.close()
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+async def run_load(connections: int, requests: int, pipeline: int, host: str = "127.0.0.1",
+                   port: int = 7878, unix_path: Optional[str] = None) -> Tuple[float, List[float], int]:
+    """
+    Drives the server and returns (elapsed seconds, per-request latencies, failed requests).
+    """
+    raise_open_file_limit()
+    if unix_path:
+        open_connection = lambda: asyncio.open_unix_connection(unix_path)
+    else:
+        open_connection = lambda: asyncio.open_connection(host, port)
+    latencies: List[float] = []
+    failures = [0]
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _run_connection(connection, requests, pipeline, open_connection, latencies, failures)
+        for connection in range(connections)
+    ))
+    return time.perf_counter() - started, latencies, failures[0]
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure TaskServer throughput and latency.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--unix", help="Connect to a Unix socket instead of TCP.")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per connection.")
+    parser.add_argument("--pipeline", type=int, default=4, help="Requests in flight per connection.")
+    args = parser.parse_args(argv)
+
+    elapsed, latencies, failures = asyncio.run(
+        run_load(args.connections, args.requests, args.pipeline, args.host, args.port, args.unix)
+    )
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.connections} connections x {args.requests} requests, pipeline depth {args.pipeline}")
+    print(f"requests: {total} ({failures} returned ERR) in {elapsed:.2f}s -> {total / elapsed:,.0f} req/s")
+    print("latency ms: " + "  ".join(
+        f"{label}={_percentile(latencies, fraction) * 1000:.2f}"
+        for label, fraction in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("max", 1.0))
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Reports memory used per task by the TaskManager storage engines.
+
+Usage: python -m benchmarks.memory_report [--sizes 100000,1000000,10000000] [--store-only]
+
+Each backend is filled with the same synthetic tasks while tracemalloc counts
+every allocation, so the numbers include Task objects, strings, dict tables
+and array buffers alike. By default the whole TaskManager is measured, since
+its status, ordering and search indexes are paid for by every backend; with
+--store-only just the storage engine is.
+
+A TaskManager's change feed also retains its most recent events, Task objects
+included, for lagging consumers. That window is bounded by the feed's retention
+rather than growing with the store, so it is reported in its own column and
+left out of bytes/task.
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, Dict, List, MutableMapping, Tuple
+from todo_app.domain.task import Task
+from todo_app.state_management.columnar_task_store import ColumnarTaskStore
+from todo_app.state_management.task_manager import TaskManager
+
+BACKENDS: Dict[str, Callable[[], MutableMapping[str, Task]]] = {
+    "dict": dict,
+    "columnar": ColumnarTaskStore,
+}
+
+def synthetic_task(number: int) -> Task:
+    description = f"Details for task number {number}" if number % 2 else None
+    return Task(id=str(number), title=f"Task {number}", description=description, is_complete=number % 3 == 0)
+
+def measure_store(backend: str, size: int) -> Tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    store = BACKENDS[backend]()
+    for number in range(1, size + 1):
+        task = synthetic_task(number)
+        store[task.id] = task
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return used, 0
+
+def measure_manager(backend: str, size: int) -> Tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    manager = TaskManager(store=BACKENDS[backend]())
+    for number in range(1, size + 1):
+        manager.add_task(synthetic_task(number))
+    gc.collect()
+    with_feed, _ = tracemalloc.get_traced_memory()
+    feed = manager.change_feed
+    feed.restart_at(feed.last_sequence)
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del manager
+    return used, with_feed - used
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare bytes per task across storage engines.")
+    parser.add_argument("--sizes", default="100000,1000000,10000000",
+                        help="Comma-separated task counts (default: 10^5, 10^6, 10^7).")
+    parser.add_argument("--store-only", action="store_true",
+                        help="Measure only the storage engine, without TaskManager's secondary indexes.")
+    args = parser.parse_args(argv)
+
+    measure = measure_store if args.store_only else measure_manager
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"{'tasks':>10}  {'backend':<9} {'total MiB':>10} {'bytes/task':>11} {'feed MiB':>9}")
+    for size in sizes:
+        for backend in BACKENDS:
+            used, feed = measure(backend, size)
+            print(f"{size:>10}  {backend:<9} {used / 2**20:>10.1f} {used / size:>11.1f} {feed / 2**20:>9.1f}",
+                  flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Scaling report for ShardedTaskManager.
+
+Usage: python -m benchmarks.shard_scaling [--tasks 1000000] [--shards 1,2,4,8] [--repeat 5]
+
+Loads the same tasks into a plain TaskManager and into ShardedTaskManager with
+each shard count, then times a full-store substring filter (QueryEngine.filter
+with `contains`, which has to visit every task), an ordered page and a count.
+Speedups are relative to the plain TaskManager; the filter can only scale up to
+the number of cores the machine actually has.
+"""
+import argparse
+import os
+import time
+from typing import Callable, List
+from todo_app.domain.task import Task
+from todo_app.services.query_engine import QueryEngine
+from todo_app.state_management.sharded_task_manager import ShardedTaskManager
+from todo_app.state_management.task_manager import TaskManager
+
+LOAD_CHUNK_SIZE = 50_000
+
+def _best_of(repeat: int, operation: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def _load(task_manager, task_count: int) -> float:
+    started = time.perf_counter()
+    for first in range(1, task_count + 1, LOAD_CHUNK_SIZE):
+        task_manager.apply_batch(added=[
+            Task(id=str(number), title=f"task {number}", description=f"needle {number}" if number % 1000 == 0 else None,
+                 is_complete=number % 3 == 0)
+            for number in range(first, min(first + LOAD_CHUNK_SIZE, task_count + 1))
+        ])
+    return time.perf_counter() - started
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure ShardedTaskManager scaling.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--shards", default="1,2,4,8", help="Comma-separated shard counts.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per query (best is reported).")
+    args = parser.parse_args(argv)
+
+    print(f"{args.tasks} tasks, {os.cpu_count()} CPUs")
+    print(f"{'store':<12} {'load s':>8} {'filter ms':>10} {'speedup':>8} {'page ms':>8} {'count ms':>9}")
+    baseline = None
+    for shard_count in [0] + [int(count) for count in args.shards.split(",")]:
+        task_manager = ShardedTaskManager(shard_count) if shard_count else TaskManager()
+        try:
+            load_seconds = _load(task_manager, args.tasks)
+            query_engine = QueryEngine(task_manager, cache_size=0)  # measure the stores, not the cache
+            filter_seconds = _best_of(args.repeat, lambda: query_engine.filter(contains="needle 7"))
+            page_seconds = _best_of(args.repeat, lambda: query_engine.get_page(100, 20))
+            count_seconds = _best_of(args.repeat, lambda: query_engine.count(is_complete=True))
+        finally:
+            if shard_count:
+                task_manager.close()
+        baseline = baseline or filter_seconds
+        label = f"{shard_count} shards" if shard_count else "single"
+        print(f"{label:<12} {load_seconds:>8.2f} {filter_seconds * 1000:>10.1f} {baseline / filter_seconds:>7.2f}x "
+              f"{page_seconds * 1000:>8.2f} {count_seconds * 1000:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Startup time of PersistentTaskManager from a JSON versus a binary snapshot.
+
+Usage: python -m benchmarks.snapshot_startup [--tasks 1000000] [--repeat 3]
+
+Writes the same tasks once as a JSON snapshot (parsed row by row into Task
+objects on startup) and once as a binary snapshot (memory-mapped), then
+reports, best of --repeat runs each, the time to open the store, to read one
+task, and to answer the first count (which builds the indexes from a mapped
+store). File sizes are shown alongside.
+"""
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+from typing import List, Tuple
+from todo_app.domain.task import Task
+from todo_app.state_management.persistent_task_manager import PersistentTaskManager, convert_snapshot
+from todo_app.state_management.write_ahead_log import DurabilityMode
+
+LOAD_CHUNK_SIZE = 50_000
+
+def _populate(data_dir: str, task_count: int) -> None:
+    task_manager = PersistentTaskManager(data_dir, durability=DurabilityMode.NEVER, snapshot_every=1 << 62)
+    try:
+        for first in range(1, task_count + 1, LOAD_CHUNK_SIZE):
+            task_manager.apply_batch(added=[
+                Task(id=str(number), title=f"Task {number}",
+                     description=f"Details for task number {number}" if number % 2 else None,
+                     is_complete=number % 3 == 0)
+                for number in range(first, min(first + LOAD_CHUNK_SIZE, task_count + 1))
+            ])
+        task_manager.compact()
+    finally:
+        task_manager.close()
+
+def _time_startup(data_dir: str, probe_id: str) -> Tuple[float, float, float]:
+    gc.collect()
+    started = time.perf_counter()
+    task_manager = PersistentTaskManager(data_dir, durability=DurabilityMode.NEVER)
+    opened = time.perf_counter()
+    try:
+        task_manager.get_task(probe_id)
+        fetched = time.perf_counter()
+        task_manager.count_tasks(True)
+        counted = time.perf_counter()
+    finally:
+        task_manager.close()
+    return opened - started, fetched - opened, counted - fetched
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare startup from JSON and binary snapshots.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per format (best is reported).")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="snapshot-startup-")
+    try:
+        json_dir, binary_dir = os.path.join(root, "json"), os.path.join(root, "binary")
+        _populate(json_dir, args.tasks)
+        shutil.copytree(json_dir, binary_dir)
+        convert_snapshot(binary_dir, "binary")
+
+        probe_id = str(max(1, args.tasks // 2))
+        print(f"{args.tasks} tasks")
+        print(f"{'snapshot':<10} {'size MB':>8} {'open ms':>10} {'first get ms':>13} {'first count ms':>15}")
+        for label, data_dir in (("json", json_dir), ("binary", binary_dir)):
+            runs = [_time_startup(data_dir, probe_id) for _ in range(args.repeat)]
+            open_s, get_s, count_s = (min(column) for column in zip(*runs))
+            size_mb = os.path.getsize(os.path.join(data_dir, "tasks.snapshot")) / (1 << 20)
+            print(f"{label:<10} {size_mb:>8.1f} {open_s * 1000:>10.1f} {get_s * 1000:>13.3f} {count_s * 1000:>15.1f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
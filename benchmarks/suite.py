@@ -0,0 +1,207 @@
+"""
+Reproducible benchmark suite for the store, services and dispatcher.
+
+Usage:
+  python -m benchmarks run [--sizes 1000,10000,100000,1000000] [--workloads all]
+                           [--operations 20000] [--repeat 5] [--output results.json]
+                           [--baseline previous.json] [--threshold 0.10] [--p99-threshold 0.50]
+  python -m benchmarks compare BASELINE.json CURRENT.json [--threshold 0.10] [--p99-threshold 0.50]
+
+Each (workload, size) case runs --repeat times, every run in a fresh
+interpreter so that its memory belongs to that run alone and earlier cases
+cannot warm caches for later ones. A run first does a small untimed warmup
+pass of the same workload, then records the resident memory and runs the
+case; its memory figure is how far peak RSS grew beyond that point, so the
+interpreter, imports and warmup are not counted. A case reports the median of
+its runs for every figure.
+
+Results are written as JSON. Comparing two result files reports every case
+whose median throughput dropped or whose memory grew by more than
+--threshold, or whose median p99 latency grew by more than the wider
+--p99-threshold (tail latency is the noisiest figure), and exits with status
+1 if there is any. Memory differences under MEMORY_SLACK_BYTES are ignored.
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+from benchmarks.workloads import WORKLOADS, percentiles
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_P99_THRESHOLD = 0.50
+# Warmup passes use at most this many tasks and operations: enough to load and
+# exercise every code path, small enough not to leave memory the case reuses.
+WARMUP_SCALE = 100
+# Memory growth this small is allocator noise rather than a regression.
+MEMORY_SLACK_BYTES = 2**20
+# Figures reported as the median of a case's runs.
+MEDIAN_FIELDS = ("seconds", "ops_per_sec", "p50_us", "p95_us", "p99_us", "memory_bytes")
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _current_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Without /proc the peak so far is the closest available figure.
+        return _peak_rss_bytes()
+
+def _run_case(workload: str, size: int, operations: int) -> Dict:
+    WORKLOADS[workload](min(size, WARMUP_SCALE), min(operations, WARMUP_SCALE))
+    gc.collect()
+    before = _current_rss_bytes()
+    recorder = WORKLOADS[workload](size, operations)
+    peak = _peak_rss_bytes()
+    p50, p95, p99 = percentiles(recorder)
+    return {
+        "seconds": recorder.seconds,
+        "operations": recorder.operations,
+        "ops_per_sec": recorder.operations / recorder.seconds if recorder.seconds else 0.0,
+        "p50_us": p50,
+        "p95_us": p95,
+        "p99_us": p99,
+        "memory_bytes": max(0, peak - before) if peak is not None and before is not None else None,
+    }
+
+def _median_result(workload: str, size: int, runs: List[Dict]) -> Dict:
+    result = {"workload": workload, "size": size, "operations": runs[0]["operations"], "runs": len(runs)}
+    for field in MEDIAN_FIELDS:
+        values = [run[field] for run in runs if run[field] is not None]
+        result[field] = statistics.median(values) if values else None
+    result["seconds"] = round(result["seconds"], 6)
+    for field in ("ops_per_sec", "p50_us", "p95_us", "p99_us"):
+        result[field] = round(result[field], 3)
+    if result["memory_bytes"] is not None:
+        result["memory_bytes"] = int(result["memory_bytes"])
+    result["ops_per_sec_runs"] = [round(run["ops_per_sec"], 1) for run in runs]
+    return result
+
+def run_suite(workloads: List[str], sizes: List[int], operations: int, repeat: int = DEFAULT_REPEAT) -> Dict:
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for size in sizes:
+        for workload in workloads:
+            runs = []
+            for _ in range(repeat):
+                with context.Pool(1) as pool:
+                    runs.append(pool.apply(_run_case, (workload, size, operations)))
+            result = _median_result(workload, size, runs)
+            results.append(result)
+            memory = result["memory_bytes"]
+            memory_text = f"{memory / 2**20:>8.1f}" if memory is not None else f"{'n/a':>8}"
+            print(f"{workload:<13} {size:>9} {result['ops_per_sec']:>12,.0f} "
+                  f"{result['p50_us']:>9.1f} {result['p95_us']:>9.1f} {result['p99_us']:>9.1f} {memory_text}",
+                  flush=True)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "operations": operations,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD,
+            p99_threshold: Optional[float] = DEFAULT_P99_THRESHOLD) -> List[str]:
+    """
+    Returns a description of every case that regressed by more than `threshold`
+    (`p99_threshold` for p99 latency, which is not checked if it is None).
+    """
+    previous = {(r["workload"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get((result["workload"], result["size"]))
+        if old is None:
+            continue
+        case = f"{result['workload']} @ {result['size']}"
+        if old["ops_per_sec"] and result["ops_per_sec"] < old["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{case}: throughput {old['ops_per_sec']:,.0f} -> {result['ops_per_sec']:,.0f} ops/s")
+        if p99_threshold is not None and old["p99_us"] and result["p99_us"] > old["p99_us"] * (1 + p99_threshold):
+            regressions.append(f"{case}: p99 {old['p99_us']:.1f} -> {result['p99_us']:.1f} us")
+        # Results saved before memory was measured from the end of setup have no comparable figure.
+        old_memory, new_memory = old.get("memory_bytes"), result.get("memory_bytes")
+        if (old_memory is not None and new_memory is not None
+                and new_memory > old_memory * (1 + threshold) + MEMORY_SLACK_BYTES):
+            regressions.append(f"{case}: memory {old_memory / 2**20:.1f} -> {new_memory / 2**20:.1f} MiB")
+    return regressions
+
+def _report_regressions(regressions: List[str], threshold: float) -> int:
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}.")
+        return 0
+    print(f"{len(regressions)} regression(s) beyond {threshold:.0%}:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
+
+def _add_threshold_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed throughput and memory regression (default: {DEFAULT_THRESHOLD}).")
+    parser.add_argument("--p99-threshold", type=float, default=DEFAULT_P99_THRESHOLD,
+                        help=f"Allowed p99 latency regression; negative to not check p99 "
+                             f"(default: {DEFAULT_P99_THRESHOLD}).")
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="To-Do app benchmark suite.")
+    subcommands = parser.add_subparsers(dest="subcommand", required=True)
+
+    run_parser = subcommands.add_parser("run", help="Run the workloads and save the results.")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Store sizes (default: {DEFAULT_SIZES}).")
+    run_parser.add_argument("--workloads", default="all",
+                            help=f"Comma-separated subset of: {', '.join(WORKLOADS)} (default: all).")
+    run_parser.add_argument("--operations", type=int, default=20_000,
+                            help="Timed operations per read/mixed/dispatcher case (inserts time `size` operations).")
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                            help=f"Runs per case, each in a fresh interpreter; medians are reported "
+                                 f"(default: {DEFAULT_REPEAT}).")
+    run_parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results.")
+    run_parser.add_argument("--baseline", help="Compare against this earlier results file.")
+    _add_threshold_arguments(run_parser)
+
+    compare_parser = subcommands.add_parser("compare", help="Compare two saved result files.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    _add_threshold_arguments(compare_parser)
+
+    args = parser.parse_args(argv)
+    p99_threshold = args.p99_threshold if args.p99_threshold >= 0 else None
+    if args.subcommand == "compare":
+        with open(args.baseline, encoding="utf-8") as baseline_file, open(args.current, encoding="utf-8") as current_file:
+            regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold, p99_threshold)
+            return _report_regressions(regressions, args.threshold)
+
+    workloads = list(WORKLOADS) if args.workloads == "all" else args.workloads.split(",")
+    unknown = [name for name in workloads if name not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workload(s): {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+    if args.repeat <= 0:
+        parser.error("--repeat must be positive")
+
+    print(f"{'workload':<13} {'size':>9} {'ops/sec':>12} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'mem MiB':>8}")
+    current = run_suite(workloads, sizes, args.operations, args.repeat)
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(current, output_file, indent=2)
+    print(f"Results written to {args.output}.")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(json.load(baseline_file), current, args.threshold, p99_threshold)
+            return _report_regressions(regressions, args.threshold)
+    return 0
@@ -0,0 +1,81 @@
+"""
+Per-mutation cost of the undo journal in TaskLifecycleService.
+
+Usage: python -m benchmarks.undo_journal [--tasks 10000] [--mutations 100000] [--repeat 3]
+
+Runs the same stream of single-task mutations (alternating completion
+toggles and retitles) against a service without a journal and one with a
+journal large enough to hold every operation. Reports, best of --repeat
+runs, the extra nanoseconds per mutation, then the bytes retained per
+mutation as measured by tracemalloc next to the journal's own estimate.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import List, Optional
+from todo_app.services.task_lifecycle_service import TaskLifecycleService
+from todo_app.services.undo_journal import UndoJournal
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.utils.id_generator import SequentialIDGenerator
+
+def _service(task_count: int, journal: Optional[UndoJournal]) -> TaskLifecycleService:
+    service = TaskLifecycleService(TaskManager(), SequentialIDGenerator(), journal=journal)
+    service.create_many([(f"Task {number}", None) for number in range(task_count)])
+    if journal is not None:
+        journal.clear()
+    return service
+
+def _mutate(service: TaskLifecycleService, task_count: int, mutations: int) -> float:
+    started = time.perf_counter()
+    for step in range(mutations):
+        task_id = str(step % task_count + 1)
+        if step % 2:
+            service.modify_task(task_id, f"Task {task_id} rev {step}", None)
+        else:
+            service.set_task_completion_status(task_id, (step // task_count) % 2 == 0)
+    return time.perf_counter() - started
+
+def _time(task_count: int, mutations: int, journal: Optional[UndoJournal]) -> float:
+    service = _service(task_count, journal)
+    gc.collect()
+    return _mutate(service, task_count, mutations)
+
+def _retained(task_count: int, mutations: int, journal: Optional[UndoJournal]) -> int:
+    service = _service(task_count, journal)
+    gc.collect()
+    tracemalloc.start()
+    _mutate(service, task_count, mutations)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure the undo journal's time and memory per mutation.")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--mutations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant (best is reported).")
+    args = parser.parse_args(argv)
+
+    def new_journal() -> UndoJournal:
+        return UndoJournal(capacity=args.mutations, max_deltas=args.mutations)
+
+    # Timed without tracemalloc, whose overhead would swamp the difference.
+    base_seconds = min(_time(args.tasks, args.mutations, None) for _ in range(args.repeat))
+    journal_seconds = min(_time(args.tasks, args.mutations, new_journal()) for _ in range(args.repeat))
+    base_bytes = _retained(args.tasks, args.mutations, None)
+    journal = new_journal()
+    journal_bytes = _retained(args.tasks, args.mutations, journal)
+    info = journal.info()
+
+    per_mutation_ns = 1e9 / args.mutations
+    print(f"{args.mutations} mutations over {args.tasks} tasks")
+    print(f"without journal: {base_seconds * per_mutation_ns:>8.0f} ns/mutation")
+    print(f"with journal:    {journal_seconds * per_mutation_ns:>8.0f} ns/mutation "
+          f"(+{(journal_seconds - base_seconds) * per_mutation_ns:.0f} ns)")
+    print(f"retained:        {(journal_bytes - base_bytes) / args.mutations:>8.0f} B/mutation measured, "
+          f"{info.bytes / info.undo_entries:.0f} B/entry estimated by the journal")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Synthetic workloads for the benchmark suite.
+
+Every workload takes the store size and an operation count, builds a fresh
+set of components, pre-populates the store where needed (untimed) and then
+times its operations. Random choices come from a fixed seed so two runs do
+the same work.
+"""
+import random
+import time
+from array import array
+from typing import Callable, Dict, Tuple
+from todo_app.cli import commands
+from todo_app.cli.command_dispatcher import CommandDispatcher
+from todo_app.services.query_engine import QueryEngine
+from todo_app.services.task_lifecycle_service import TaskLifecycleService
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.utils.id_generator import SequentialIDGenerator
+
+SEED = 20240601
+# At most this many per-operation latencies are kept, evenly spaced over the run.
+MAX_LATENCY_SAMPLES = 100_000
+WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet")
+
+class Components:
+    def __init__(self, size: int):
+        self.task_manager = TaskManager()
+        self.lifecycle = TaskLifecycleService(self.task_manager, SequentialIDGenerator())
+        self.query_engine = QueryEngine(self.task_manager)
+        if size:
+            self.lifecycle.create_many(
+                (f"seed task {number} {WORDS[number % len(WORDS)]}", f"description {number}") for number in range(size)
+            )
+
+class Recorder:
+    """
+    Times a sequence of operations, keeping a bounded, evenly spaced latency sample.
+    """
+    def __init__(self, operations: int):
+        self.stride = max(1, operations // MAX_LATENCY_SAMPLES)
+        self.samples = array("q")
+        self.operations = 0
+        self.seconds = 0.0
+
+    def run(self, operations: int, operation: Callable[[int], object]) -> None:
+        stride = self.stride
+        samples = self.samples
+        clock = time.perf_counter_ns
+        started = clock()
+        for step in range(operations):
+            if step % stride:
+                operation(step)
+            else:
+                before = clock()
+                operation(step)
+                samples.append(clock() - before)
+        self.seconds += (clock() - started) / 1e9
+        self.operations += operations
+
+def insert_heavy(size: int, operations: int) -> Recorder:
+    """Creates `size` tasks one by one through TaskLifecycleService."""
+    components = Components(0)
+    recorder = Recorder(size)
+    create = components.lifecycle.create_new_task
+    recorder.run(size, lambda step: create(f"task {step} {WORDS[step % len(WORDS)]}", f"description {step}"))
+    return recorder
+
+def read_heavy(size: int, operations: int) -> Recorder:
+    """Point lookups, counts, ordered top-k, status filters, pages and searches on a store of `size` tasks."""
+    components = Components(size)
+    rng = random.Random(SEED)
+    task_manager, query_engine = components.task_manager, components.query_engine
+    task_ids = [str(rng.randint(1, size)) for _ in range(operations)]
+    page_count = max(1, size // 20)
+
+    def operation(step: int) -> None:
+        kind = step % 6
+        if kind == 0 or kind == 1:
+            task_manager.get_task(task_ids[step])
+        elif kind == 2:
+            query_engine.count(is_complete=False)
+        elif kind == 3:
+            query_engine.top_k("title", 10)
+        elif kind == 4:
+            query_engine.get_page(1 + step % page_count, 20)
+        else:
+            query_engine.search(f"{task_ids[step]} {WORDS[step % len(WORDS)][:3]}* OR description {task_ids[step - 1]}", 10)
+
+    recorder = Recorder(operations)
+    recorder.run(operations, operation)
+    return recorder
+
+def mixed(size: int, operations: int) -> Recorder:
+    """Modify, mark and delete-then-recreate against a store of `size` tasks (size stays constant)."""
+    components = Components(size)
+    rng = random.Random(SEED)
+    lifecycle, task_manager = components.lifecycle, components.task_manager
+    live_ids = [str(number) for number in range(1, size + 1)]
+
+    def operation(step: int) -> None:
+        position = rng.randrange(len(live_ids))
+        task_id = live_ids[position]
+        roll = step % 10
+        if roll < 4:
+            lifecycle.modify_task(task_id, f"renamed {step}", None)
+        elif roll < 8:
+            lifecycle.set_task_completion_status(task_id, not task_manager.get_task(task_id).is_complete)
+        else:
+            lifecycle.remove_task(task_id)
+            live_ids[position] = lifecycle.create_new_task(f"replacement {step}", None).id
+
+    recorder = Recorder(operations)
+    recorder.run(operations, operation)
+    return recorder
+
+def dispatcher_loop(size: int, operations: int) -> Recorder:
+    """Parses and dispatches a fixed mix of command lines through CommandDispatcher."""
+    components = Components(size)
+    commands.init_command_handlers(components.lifecycle, components.query_engine)
+    dispatcher = CommandDispatcher()
+    commands.register_commands(dispatcher)
+    rng = random.Random(SEED)
+    targets = [rng.randint(1, size) for _ in range(operations)]
+    page_count = max(1, size // 10)
+
+    def operation(step: int) -> None:
+        kind = step % 5
+        if kind == 0:
+            dispatcher.dispatch(f'add "dispatched task {step}" "via the dispatcher"')
+        elif kind == 1:
+            dispatcher.dispatch(f'update {targets[step]} "retitled {step}"')
+        elif kind == 2:
+            dispatcher.dispatch(f"mark {targets[step]} {'complete' if step % 2 else 'incomplete'}")
+        elif kind == 3:
+            dispatcher.dispatch(f"view --page {1 + step % page_count} --limit 10 --compact")
+        else:
+            dispatcher.dispatch(f"search {targets[step]} --limit 5")
+
+    recorder = Recorder(operations)
+    recorder.run(operations, operation)
+    return recorder
+
+WORKLOADS: Dict[str, Callable[[int, int], Recorder]] = {
+    "insert_heavy": insert_heavy,
+    "read_heavy": read_heavy,
+    "mixed": mixed,
+    "dispatcher": dispatcher_loop,
+}
+
+def percentiles(recorder: Recorder) -> Tuple[float, float, float]:
+    """Returns (p50, p95, p99) latency in microseconds."""
+    samples = sorted(recorder.samples)
+    if not samples:
+        return 0.0, 0.0, 0.0
+    def at(fraction: float) -> float:
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))] / 1000
+    return at(0.50), at(0.95), at(0.99)
@@ -1,21 +1,268 @@
+import sys
+from todo_app.utils.profiler import Profiler, profile_requested
+
+# Started ahead of the remaining imports so --profile also covers them.
+_startup_profiler = (Profiler("startup").start()
+                     if __name__ == "__main__" and profile_requested(sys.argv[1:]) else None)
+
+import argparse
+import asyncio
+import os
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from todo_app.cli import commands
 from todo_app.cli.app import CLIApplication
-from todo_app.services.query_engine import QueryEngine
+from todo_app.cli.batch_runner import DEFAULT_GROUP_SIZE, BatchRunner
+from todo_app.cli.command_dispatcher import CommandDispatcher
+from todo_app.server.line_server import TaskServer
+from todo_app.services.materialized_views import ViewRegistry
+from todo_app.services.query_engine import DEFAULT_CACHE_SIZE, QueryEngine
 from todo_app.services.task_lifecycle_service import TaskLifecycleService
+from todo_app.services.undo_journal import DEFAULT_CAPACITY, UndoJournal
+from todo_app.state_management.cold_task_store import ColdTaskStore
+from todo_app.state_management.columnar_task_store import ColumnarTaskStore
+from todo_app.state_management.concurrent_task_manager import ConcurrentTaskManager
+from todo_app.state_management.persistent_task_manager import SNAPSHOT_FORMATS, PersistentTaskManager, convert_snapshot
+from todo_app.state_management.sharded_task_manager import ShardedTaskManager
 from todo_app.state_management.task_manager import TaskManager
-from todo_app.utils.id_generator import SequentialIDGenerator
+from todo_app.state_management.tiered_task_manager import TieredTaskManager
+from todo_app.state_management.write_ahead_log import DurabilityMode
+from todo_app.utils.id_generator import BlockIDGenerator, SequentialIDGenerator
+from todo_app.utils.metrics import Metrics
+
+ID_STATE_FILE = "ids.state"
+ARCHIVE_FILE = "tasks.archive"
+COMPLETION_LOG_FILE = "completions.log"
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="To-Do console application.")
+    parser.add_argument("--storage", choices=["dict", "columnar"], default="dict",
+                        help="Task storage engine: plain dict (default) or compact columnar store.")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="Partition tasks across this many worker processes (in-memory only).")
+    parser.add_argument("--data-dir",
+                        help="Persist tasks in this directory. Without it tasks live in memory only.")
+    parser.add_argument("--durability", choices=[mode.value for mode in DurabilityMode],
+                        default=DurabilityMode.ALWAYS.value,
+                        help="When to fsync the write-ahead log (default: always).")
+    parser.add_argument("--fsync-interval-ms", type=int, default=100,
+                        help="fsync period for --durability interval (default: 100).")
+    parser.add_argument("--snapshot-every", type=int, default=100_000,
+                        help="Compact the log into a snapshot after this many operations.")
+    parser.add_argument("--snapshot-format", choices=SNAPSHOT_FORMATS, default="json",
+                        help="Format for new snapshots; binary ones are memory-mapped on startup (default: json).")
+    parser.add_argument("--convert-snapshot", action="store_true",
+                        help="Rewrite the snapshot in --data-dir in --snapshot-format, then exit.")
+    parser.add_argument("--archive-after", type=float, metavar="SECONDS",
+                        help="Move tasks completed more than SECONDS ago to a compressed archive in --data-dir.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run commands from FILE ('-' for stdin) instead of the interactive menu. Unless "
+                             f"--durability is always, writes are group-committed every {DEFAULT_GROUP_SIZE} commands.")
+    parser.add_argument("--continue-on-error", action="store_true",
+                        help="In batch mode, keep going after a failed command (default: stop).")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="Serve commands over a line protocol on HOST:PORT or unix:PATH.")
+    parser.add_argument("--max-connections", type=int, default=10_000,
+                        help="Connection limit for --serve (default: 10000).")
+    parser.add_argument("--serve-threads", type=int, default=0, metavar="N",
+                        help="Run --serve commands on N worker threads over a thread-safe in-memory store "
+                             "(default: 0, run them on the event loop).")
+    parser.add_argument("--command-prefixes", action="store_true",
+                        help="In --batch and --serve, accept any unambiguous prefix of a command name "
+                             "(e.g. 'sum' for summary).")
+    parser.add_argument("--query-cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Query results cached per store version; 0 disables (default: {DEFAULT_CACHE_SIZE}).")
+    parser.add_argument("--undo-history", type=int, default=DEFAULT_CAPACITY, metavar="N",
+                        help=f"Operations kept for the undo command; 0 disables undo (default: {DEFAULT_CAPACITY}).")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Count and time every command and service operation (see the 'stats' command).")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="Write the collected metrics to FILE as JSON on exit (implies --metrics).")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="Profile startup and the run separately; write reports and flame graph stacks to DIR.")
+    args = parser.parse_args(argv)
+    if args.query_cache_size < 0:
+        parser.error("--query-cache-size must not be negative.")
+    if args.undo_history < 0:
+        parser.error("--undo-history must not be negative.")
+    if args.shards < 0:
+        parser.error("--shards must not be negative.")
+    if args.shards and args.data_dir:
+        parser.error("--shards cannot be combined with --data-dir.")
+    if args.convert_snapshot and not args.data_dir:
+        parser.error("--convert-snapshot requires --data-dir.")
+    if args.archive_after is not None and not args.data_dir:
+        parser.error("--archive-after requires --data-dir.")
+    if args.serve_threads < 0:
+        parser.error("--serve-threads must not be negative.")
+    if args.serve_threads and not args.serve:
+        parser.error("--serve-threads requires --serve.")
+    if args.serve_threads and (args.data_dir or args.shards):
+        parser.error("--serve-threads cannot be combined with --data-dir or --shards.")
+    return args
+
+def _highest_task_id(task_manager: TaskManager) -> int:
+    return max((int(task.id) for task in task_manager.get_all_tasks() if task.id.isdigit()), default=0)
+
+def _save_profile(profiler: Profiler, directory: str) -> None:
+    report = profiler.stop()
+    text_path, folded_path = report.save(directory)
+    print(f"Profile '{report.label}': {report.seconds:.3f}s, peak traced memory {report.peak_bytes / 1024:,.1f} KiB "
+          f"(report: {text_path}, stacks: {folded_path}).", file=sys.stderr)
+
+@contextmanager
+def _profiled(directory: Optional[str], label: str) -> Iterator[None]:
+    if directory is None:
+        yield
+        return
+    profiler = Profiler(label).start()
+    try:
+        yield
+    finally:
+        _save_profile(profiler, directory)
+
+def build_dispatcher(task_lifecycle_service: TaskLifecycleService, query_engine: QueryEngine,
+                     metrics: Optional[Metrics] = None,
+                     views: Optional[ViewRegistry] = None,
+                     tiers: Optional[TieredTaskManager] = None, local: bool = True,
+                     prefix_matching: bool = False) -> CommandDispatcher:
+    """
+    Wires the command handlers to the services. Pass local=False for a dispatcher
+    served to remote clients, which leaves out the commands that write or read files,
+    and prefix_matching=True to accept any unambiguous prefix of a command name.
+    """
+    commands.init_command_handlers(task_lifecycle_service, query_engine, metrics, views, tiers)
+    dispatcher = CommandDispatcher(metrics, prefix_matching)
+    commands.register_commands(dispatcher, local)
+    return dispatcher
+
+def run_batch(args: argparse.Namespace, dispatcher: CommandDispatcher, task_manager: TaskManager) -> int:
+    """
+    Runs the --batch script. With a persistent store and --durability interval
+    or never, commands are group-committed DEFAULT_GROUP_SIZE at a time: one log
+    write per group, and the log can be compacted between groups. With
+    --durability always (the default) each command is committed and synced
+    before the next one runs, exactly as at the interactive prompt.
+    """
+    if isinstance(task_manager, TieredTaskManager):
+        task_manager = task_manager.hot
+    group = None
+    if isinstance(task_manager, PersistentTaskManager) and args.durability != DurabilityMode.ALWAYS.value:
+        group = task_manager.batch
+    runner = BatchRunner(dispatcher, sys.stdout, stop_on_error=not args.continue_on_error, group=group)
+    source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    try:
+        summary = runner.run(source)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(summary.describe(), file=sys.stderr)
+    return 1 if summary.failures else 0
+
+async def serve(address: str, dispatcher: CommandDispatcher, max_connections: int, worker_threads: int = 0) -> None:
+    server = TaskServer(dispatcher, max_connections=max_connections, worker_threads=worker_threads)
+    if address.startswith("unix:"):
+        await server.start_unix(address[len("unix:"):])
+    else:
+        host, _, port = address.rpartition(":")
+        if not port.isdigit():
+            raise ValueError(f"Invalid server address '{address}'. Use HOST:PORT or unix:PATH.")
+        await server.start_tcp(host or "127.0.0.1", int(port))
+    print(f"Serving on {address}. Press Ctrl+C to stop.", file=sys.stderr)
+    await server.serve_forever()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    global _startup_profiler
+    startup_profiler, _startup_profiler = _startup_profiler, None
+    if startup_profiler is None and profile_requested(sys.argv[1:] if argv is None else argv):
+        startup_profiler = Profiler("startup").start()
+    args = parse_arguments(argv)
+    if args.convert_snapshot:
+        if startup_profiler is not None:
+            _save_profile(startup_profiler, args.profile)
+        with _profiled(args.profile, "convert"):
+            stats = convert_snapshot(args.data_dir, args.snapshot_format)
+        print(f"Converted {stats.snapshot_tasks} snapshot tasks and {stats.replayed_operations} log operations "
+              f"to a {args.snapshot_format} snapshot (loading took {stats.seconds:.3f}s).")
+        return 0
 
-def main():
     # Instantiate core components
-    task_manager = TaskManager()
-    id_generator = SequentialIDGenerator()
+    store = ColumnarTaskStore() if args.storage == "columnar" else None
+    if args.data_dir:
+        task_manager = PersistentTaskManager(
+            args.data_dir,
+            durability=DurabilityMode(args.durability),
+            fsync_interval_ms=args.fsync_interval_ms,
+            snapshot_every=args.snapshot_every,
+            store=store,
+            snapshot_format=args.snapshot_format,
+        )
+        stats = task_manager.recovery_stats
+        print(f"Recovered {stats.snapshot_tasks} snapshot tasks and replayed "
+              f"{stats.replayed_operations} log operations in {stats.seconds:.3f}s.",
+              file=sys.stderr if args.batch or args.serve else sys.stdout)
+        if args.archive_after is not None:
+            task_manager = TieredTaskManager(task_manager, ColdTaskStore(os.path.join(args.data_dir, ARCHIVE_FILE)),
+                                             args.archive_after,
+                                             completion_log=os.path.join(args.data_dir, COMPLETION_LOG_FILE))
+    elif args.shards:
+        task_manager = ShardedTaskManager(args.shards, ColumnarTaskStore if args.storage == "columnar" else None)
+    elif args.serve_threads:
+        task_manager = ConcurrentTaskManager(store)
+    else:
+        task_manager = TaskManager(store)
+    if args.data_dir:
+        # Persist the ID high-water mark so IDs of deleted tasks are never reissued.
+        # Once the state file exists it covers every stored ID, so startup need not
+        # scan the store (which would decode every task of a mapped snapshot).
+        id_state_path = os.path.join(args.data_dir, ID_STATE_FILE)
+        start = 0 if os.path.exists(id_state_path) else _highest_task_id(task_manager)
+        id_generator = BlockIDGenerator(id_state_path, start=start)
+    else:
+        id_generator = SequentialIDGenerator(start=_highest_task_id(task_manager))
+
+    metrics = Metrics() if args.metrics or args.metrics_json else None
 
     # Instantiate services
-    task_lifecycle_service = TaskLifecycleService(task_manager, id_generator)
-    query_engine = QueryEngine(task_manager)
+    journal = UndoJournal(args.undo_history) if args.undo_history else None
+    task_lifecycle_service = TaskLifecycleService(task_manager, id_generator, metrics, journal)
+    query_engine = QueryEngine(task_manager, cache_size=args.query_cache_size)
+
+    try:
+        if args.batch or args.serve:
+            # Sharded stores have no single change feed to follow.
+            views = ViewRegistry(task_manager) if not isinstance(task_manager, ShardedTaskManager) else None
+            tiers = task_manager if isinstance(task_manager, TieredTaskManager) else None
+            dispatcher = build_dispatcher(task_lifecycle_service, query_engine, metrics, views, tiers,
+                                          local=not args.serve, prefix_matching=args.command_prefixes)
+        else:
+            # Instantiate the CLI application
+            app = CLIApplication(task_lifecycle_service, query_engine)
+        if startup_profiler is not None:
+            _save_profile(startup_profiler, args.profile)
+            startup_profiler = None
 
-    # Instantiate and run the CLI application
-    app = CLIApplication(task_lifecycle_service, query_engine)
-    app.run()
+        with _profiled(args.profile, "run"):
+            if args.batch:
+                return run_batch(args, dispatcher, task_manager)
+            if args.serve:
+                try:
+                    asyncio.run(serve(args.serve, dispatcher, args.max_connections, args.serve_threads))
+                except KeyboardInterrupt:
+                    pass
+                return 0
+            app.run()
+            return 0
+    finally:
+        if isinstance(task_manager, TieredTaskManager):
+            task_manager.close()
+            task_manager = task_manager.hot
+        if isinstance(task_manager, (PersistentTaskManager, ShardedTaskManager)):
+            task_manager.close()
+        if isinstance(id_generator, BlockIDGenerator):
+            id_generator.close()
+        if args.metrics_json:
+            metrics.dump(args.metrics_json)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import os
+import pytest
+from todo_app.domain.task import Task
+from todo_app.state_management.binary_snapshot import (BINARY_SNAPSHOT_MAGIC, MappedSnapshot, MappedTaskStore,
+                                                       is_binary_snapshot, write_binary_snapshot)
+
+TASKS = [Task("10", "ten"), Task("2", "two", "with a description", is_complete=True), Task("note", "not numeric")]
+
+@pytest.fixture
+def snapshot_path(tmp_path) -> str:
+    path = os.path.join(str(tmp_path), "tasks.snapshot")
+    write_binary_snapshot(path, TASKS, generation=3, sequence=7)
+    return path
+
+@pytest.fixture
+def store(snapshot_path):
+    store = MappedTaskStore(MappedSnapshot(snapshot_path))
+    yield store
+    store.close()
+
+def test_snapshot_round_trips_in_id_order(snapshot_path):
+    assert is_binary_snapshot(snapshot_path)
+    snapshot = MappedSnapshot(snapshot_path)
+    assert snapshot.header == (3, 3, 7)
+    assert list(snapshot.tasks()) == [TASKS[1], TASKS[0], TASKS[2]]
+    assert snapshot.find("2") == 0 and snapshot.find("3") == -1
+    snapshot.close()
+
+def test_truncated_snapshot_is_rejected(snapshot_path):
+    with open(snapshot_path, "r+b") as snapshot_file:
+        snapshot_file.truncate(os.path.getsize(snapshot_path) - 1)
+    with pytest.raises(ValueError, match="truncated"):
+        MappedSnapshot(snapshot_path)
+    with open(snapshot_path, "r+b") as snapshot_file:
+        snapshot_file.truncate(len(BINARY_SNAPSHOT_MAGIC))
+    with pytest.raises(ValueError, match="truncated"):
+        MappedSnapshot(snapshot_path)
+
+def test_corrupted_snapshot_fails_the_checksum(snapshot_path):
+    with open(snapshot_path, "r+b") as snapshot_file:
+        snapshot_file.seek(-1, os.SEEK_END)
+        last = snapshot_file.read(1)
+        snapshot_file.seek(-1, os.SEEK_END)
+        snapshot_file.write(bytes([last[0] ^ 0xFF]))
+    with pytest.raises(ValueError, match="checksum"):
+        MappedSnapshot(snapshot_path)
+    # Skipping verification (as after compact() writes a snapshot itself) opens it anyway.
+    MappedSnapshot(snapshot_path, verify_checksum=False).close()
+
+def test_store_overlays_updates_on_the_mapped_tasks(store):
+    store["2"] = Task("2", "two, reopened")
+    store["11"] = Task("11", "eleven")
+    assert store["2"].title == "two, reopened"
+    assert len(store) == 4
+    assert sorted(store) == ["10", "11", "2", "note"]
+    assert sorted(task.title for task in store.values()) == ["eleven", "not numeric", "ten", "two, reopened"]
+
+def test_store_hides_deleted_tasks(store):
+    del store["10"]
+    store["11"] = Task("11", "eleven")
+    del store["11"]
+    assert "10" not in store and "11" not in store
+    assert len(store) == 2
+    assert sorted(store) == ["2", "note"]
+    with pytest.raises(KeyError):
+        del store["10"]
+    # A hidden ID can be added again, and the overlay copy is the one read back.
+    store["10"] = Task("10", "ten again")
+    assert store["10"].title == "ten again"
+    assert len(store) == 3
@@ -0,0 +1,74 @@
+import time
+import pytest
+from todo_app.cli.command_dispatcher import CommandDispatcher, split_command_line
+from todo_app.utils.metrics import Metrics
+
+def _add(title: str, description: str = None) -> str:
+    """
+    Usage: add <title> [description]
+    """
+    return f"added {title!r} {description!r}"
+
+def _dispatcher(prefix_matching: bool = False) -> CommandDispatcher:
+    dispatcher = CommandDispatcher(prefix_matching=prefix_matching)
+    dispatcher.register_command("add", _add)
+    dispatcher.register_command("archive", lambda: "archived")
+    dispatcher.register_command("view", lambda *args: f"viewed {list(args)}")
+    dispatcher.register_alias("ls", "view")
+    return dispatcher
+
+@pytest.mark.parametrize("line, expected", [
+    ("add milk", ["add", "milk"]),
+    ("  add   milk  ", ["add", "milk"]),
+    ('add "buy milk" \'and bread\'', ["add", "buy milk", "and bread"]),
+    ('add buy\\ milk', ["add", "buy milk"]),
+    ("add\tmilk", ["add", "milk"]),
+    ("add crème brûlée", ["add", "crème", "brûlée"]),
+])
+def test_split_command_line_matches_shlex(line, expected):
+    assert split_command_line(line) == expected
+
+def test_unbalanced_quotes_are_reported():
+    with pytest.raises(ValueError):
+        split_command_line('add "buy milk')
+    assert _dispatcher().dispatch('add "buy milk').startswith("Error: Could not parse command.")
+
+def test_arity_errors_are_reported_before_the_call():
+    dispatcher = _dispatcher()
+    assert dispatcher.dispatch('add "buy milk"') == "added 'buy milk' None"
+    assert dispatcher.dispatch("add") == ("Error: Invalid arguments for command 'add'. "
+                                          "Details: expected 1 to 2 arguments, got 0. Usage: add <title> [description]")
+    assert dispatcher.dispatch("add a b c").endswith("got 3. Usage: add <title> [description]")
+    assert dispatcher.dispatch("archive now") == ("Error: Invalid arguments for command 'archive'. "
+                                                  "Details: expected no arguments, got 1.")
+    assert dispatcher.dispatch("view a b c") == "viewed ['a', 'b', 'c']"
+
+def test_names_and_aliases_are_case_insensitive():
+    dispatcher = _dispatcher()
+    assert dispatcher.dispatch("LS 1") == "viewed ['1']"
+    assert dispatcher.dispatch("Archive") == "archived"
+    assert "ls" not in dispatcher and "view" in dispatcher
+    with pytest.raises(ValueError):
+        dispatcher.register_alias("add", "view")
+    with pytest.raises(ValueError):
+        dispatcher.register_alias("list", "missing")
+
+def test_prefixes_resolve_only_when_unambiguous():
+    dispatcher = _dispatcher(prefix_matching=True)
+    assert dispatcher.dispatch("v") == "viewed []"
+    assert dispatcher.dispatch("arc") == "archived"
+    assert dispatcher.dispatch("l") == "viewed []"
+    # "a" starts both "add" and "archive".
+    assert dispatcher.dispatch("a").startswith("Error: Unknown command 'a'.")
+    assert _dispatcher().dispatch("v").startswith("Error: Unknown command 'v'.")
+
+def test_streamed_timing_excludes_the_consumer():
+    metrics = Metrics()
+    dispatcher = CommandDispatcher(metrics)
+    dispatcher.register_command("pages", lambda: iter(["page 1", "page 2", "page 3"]))
+    for _ in dispatcher.dispatch_stream("pages"):
+        time.sleep(0.02)
+    stats = metrics.operation("command.pages")
+    stats.fold()
+    assert stats.calls == 1
+    assert stats.total_ns < 20_000_000
@@ -0,0 +1,50 @@
+import pytest
+from todo_app.domain.task import Task
+from todo_app.services.query_engine import QueryEngine
+from todo_app.state_management.columnar_task_store import ColumnarTaskStore
+from todo_app.state_management.task_manager import TaskManager
+
+@pytest.fixture(params=["dict", "columnar"])
+def task_manager(request) -> TaskManager:
+    task_manager = TaskManager(ColumnarTaskStore() if request.param == "columnar" else None)
+    task_manager.apply_batch(added=[Task(str(number), f"task {number}", is_complete=number % 3 == 0)
+                                    for number in range(1, 26)])
+    return task_manager
+
+def _ids(tasks) -> list:
+    return [task.id for task in tasks]
+
+def test_pages_cover_every_task_once_in_id_order(task_manager):
+    pages = list(QueryEngine(task_manager).iter_tasks(page_size=10))
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [task.id for page in pages for task in page] == [str(number) for number in range(1, 26)]
+
+def test_exact_multiple_of_page_size_ends_without_an_empty_page(task_manager):
+    pages = list(QueryEngine(task_manager).iter_tasks(page_size=5))
+    assert [len(page) for page in pages] == [5] * 5
+
+def test_iteration_resumes_after_the_cursor(task_manager):
+    pages = QueryEngine(task_manager).iter_tasks(after_id="20", page_size=10)
+    assert [_ids(page) for page in pages] == [["21", "22", "23", "24", "25"]]
+
+def test_cursor_survives_deletion_of_the_cursor_task(task_manager):
+    pages = QueryEngine(task_manager).iter_tasks(page_size=10)
+    first = next(pages)
+    task_manager.delete_task(first[-1].id)
+    task_manager.add_task(Task("26", "added while paging"))
+    rest = [task.id for page in pages for task in page]
+    assert rest == [str(number) for number in range(11, 27)]
+
+def test_cursor_with_status_filter(task_manager):
+    assert _ids(task_manager.find_tasks(is_complete=True, after_id="10")) == ["12", "15", "18", "21", "24"]
+    assert _ids(task_manager.find_tasks(is_complete=False, after_id="22", limit=2)) == ["23", "25"]
+
+def test_cursor_past_the_end_or_non_numeric_yields_nothing(task_manager):
+    assert task_manager.find_tasks(after_id="25") == []
+    assert task_manager.find_tasks(after_id="zzz") == []
+
+def test_cursor_requires_id_order_and_a_positive_page_size(task_manager):
+    with pytest.raises(ValueError):
+        task_manager.find_tasks(order_by="title", after_id="3")
+    with pytest.raises(ValueError):
+        next(QueryEngine(task_manager).iter_tasks(page_size=0))
@@ -0,0 +1,56 @@
+import json
+import os
+import pytest
+from todo_app.utils.id_generator import BlockIDGenerator
+
+BLOCK_SIZE = 10
+
+def _generator(tmp_path, start: int = 0) -> BlockIDGenerator:
+    return BlockIDGenerator(os.path.join(str(tmp_path), "ids.state"), BLOCK_SIZE, start=start)
+
+def test_ids_are_sequential_across_blocks(tmp_path):
+    generator = _generator(tmp_path)
+    assert [generator.generate_id() for _ in range(3)] == ["1", "2", "3"]
+    assert generator.reserve_ids(9) == [str(number) for number in range(4, 13)]
+    generator.close()
+
+def test_a_clean_restart_resumes_after_the_last_issued_id(tmp_path):
+    generator = _generator(tmp_path)
+    generator.reserve_ids(3)
+    generator.close()
+    # main.py passes start=0 once the state file exists, relying on it alone.
+    restarted = _generator(tmp_path, start=0)
+    assert restarted.generate_id() == "4"
+    restarted.close()
+
+def test_a_crash_mid_block_skips_the_rest_of_the_block(tmp_path):
+    generator = _generator(tmp_path)
+    generator.reserve_ids(3)
+    # No close(): the last issued ID was never recorded.
+    restarted = _generator(tmp_path)
+    assert restarted.generate_id() == "11"
+    crashed_again = _generator(tmp_path)
+    assert crashed_again.generate_id() == "21"
+    crashed_again.close()
+
+def test_a_restart_never_reissues_ids_after_a_full_block(tmp_path):
+    generator = _generator(tmp_path)
+    generator.reserve_ids(BLOCK_SIZE)
+    generator.close()
+    restarted = _generator(tmp_path)
+    assert restarted.generate_id() == "11"
+    restarted.close()
+
+def test_start_skips_ids_already_stored(tmp_path):
+    generator = _generator(tmp_path, start=25)
+    assert generator.generate_id() == "31"
+    generator.close()
+    # A start beyond the saved state wins over it.
+    assert _generator(tmp_path, start=40).generate_id() == "41"
+
+def test_the_state_file_must_match_the_block_size(tmp_path):
+    _generator(tmp_path).generate_id()
+    with open(os.path.join(str(tmp_path), "ids.state"), encoding="utf-8") as state_file:
+        assert json.load(state_file)["block_size"] == BLOCK_SIZE
+    with pytest.raises(ValueError):
+        BlockIDGenerator(os.path.join(str(tmp_path), "ids.state"), BLOCK_SIZE * 2)
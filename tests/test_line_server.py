@@ -0,0 +1,45 @@
+import asyncio
+from typing import List, Tuple
+from todo_app.cli.command_dispatcher import CommandDispatcher
+from todo_app.server.line_server import TaskServer, encode_payload
+
+def _dispatcher() -> CommandDispatcher:
+    dispatcher = CommandDispatcher()
+    dispatcher.register_command("echo", lambda *words: " ".join(words))
+    dispatcher.register_command("dots", lambda: iter([".hidden\nshown", "..", "."]))
+    return dispatcher
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[str, List[str]]:
+    status = (await reader.readline()).decode("utf-8").rstrip("\n")
+    lines: List[str] = []
+    while True:
+        line = (await reader.readline()).decode("utf-8").rstrip("\n")
+        if line == ".":
+            return status, lines
+        lines.append(line[1:] if line.startswith(".") else line)
+
+async def _exchange(requests: List[str]) -> List[Tuple[str, List[str]]]:
+    server = TaskServer(_dispatcher())
+    listener = await server.start_tcp("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    # Pipelined: every request is sent before any response is read.
+    writer.write("".join(request + "\n" for request in requests).encode("utf-8"))
+    await writer.drain()
+    responses = [await _read_response(reader) for _ in requests]
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return responses
+
+def test_payload_lines_starting_with_a_dot_are_stuffed():
+    assert encode_payload(".hidden\nshown\n.") == b"..hidden\nshown\n..\n"
+
+def test_responses_come_back_framed_and_in_order():
+    responses = asyncio.run(_exchange(["echo hello world", "dots", "nope", "exit"]))
+    assert responses == [
+        ("OK", ["hello world"]),
+        ("OK", [".hidden", "shown", "..", "."]),
+        ("ERR", ["Error: Unknown command 'nope'. Type 'help' for available commands."]),
+        ("OK", ["Goodbye!"]),
+    ]
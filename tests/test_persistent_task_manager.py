@@ -0,0 +1,106 @@
+import os
+import pytest
+from todo_app.domain.task import Task
+from todo_app.state_management.persistent_task_manager import PersistentTaskManager
+from todo_app.state_management.write_ahead_log import DurabilityMode, WriteAheadLog
+
+def _ids_and_titles(task_manager: PersistentTaskManager) -> list:
+    return [(task.id, task.title, task.is_complete) for task in task_manager.find_tasks()]
+
+def test_log_is_replayed_on_restart(tmp_path):
+    task_manager = PersistentTaskManager(str(tmp_path))
+    task_manager.add_task(Task("1", "first"))
+    task_manager.add_task(Task("2", "second"))
+    task_manager.update_task(Task("1", "first, renamed", is_complete=True))
+    task_manager.delete_task("2")
+    task_manager.close()
+
+    recovered = PersistentTaskManager(str(tmp_path))
+    assert recovered.recovery_stats.snapshot_tasks == 0
+    assert recovered.recovery_stats.replayed_operations == 4
+    assert _ids_and_titles(recovered) == [("1", "first, renamed", True)]
+    recovered.close()
+
+def test_batch_is_replayed_as_a_whole(tmp_path):
+    task_manager = PersistentTaskManager(str(tmp_path), durability=DurabilityMode.NEVER)
+    task_manager.apply_batch(added=[Task(str(number), f"task {number}") for number in range(1, 6)])
+    task_manager.apply_batch(updated=[Task("3", "three")], deleted=["4"])
+    task_manager.close()
+
+    recovered = PersistentTaskManager(str(tmp_path))
+    assert [task.id for task in recovered.find_tasks()] == ["1", "2", "3", "5"]
+    assert recovered.get_task("3").title == "three"
+    recovered.close()
+
+def test_torn_log_tail_is_dropped_and_truncated(tmp_path):
+    task_manager = PersistentTaskManager(str(tmp_path))
+    task_manager.add_task(Task("1", "kept"))
+    task_manager.close()
+    log_path = os.path.join(str(tmp_path), "tasks.0.wal")
+    with open(log_path, "ab") as log_file:
+        log_file.write(b'["add", "2", "half writ')
+    valid_length = os.path.getsize(log_path) - len(b'["add", "2", "half writ')
+
+    recovered = PersistentTaskManager(str(tmp_path))
+    assert _ids_and_titles(recovered) == [("1", "kept", False)]
+    assert os.path.getsize(log_path) == valid_length
+    recovered.add_task(Task("2", "after the crash"))
+    recovered.close()
+
+    reopened = PersistentTaskManager(str(tmp_path))
+    assert [task.id for task in reopened.find_tasks()] == ["1", "2"]
+    reopened.close()
+
+@pytest.mark.parametrize("snapshot_format", ["json", "binary"])
+def test_compaction_writes_snapshot_and_starts_a_new_log(tmp_path, snapshot_format):
+    task_manager = PersistentTaskManager(str(tmp_path), snapshot_format=snapshot_format)
+    for number in range(1, 4):
+        task_manager.add_task(Task(str(number), f"task {number}", f"description {number}"))
+    task_manager.compact()
+    task_manager.delete_task("2")
+    task_manager.close()
+
+    assert sorted(os.listdir(str(tmp_path))) == ["tasks.1.wal", "tasks.snapshot"]
+    recovered = PersistentTaskManager(str(tmp_path))
+    assert recovered.recovery_stats.snapshot_tasks == 3
+    assert recovered.recovery_stats.replayed_operations == 1
+    assert [(task.id, task.description) for task in recovered.find_tasks()] == [
+        ("1", "description 1"), ("3", "description 3")]
+    recovered.close()
+
+def test_compaction_happens_every_snapshot_every_operations(tmp_path):
+    task_manager = PersistentTaskManager(str(tmp_path), snapshot_every=3)
+    for number in range(1, 8):
+        task_manager.add_task(Task(str(number), f"task {number}"))
+    task_manager.close()
+
+    recovered = PersistentTaskManager(str(tmp_path))
+    assert recovered.recovery_stats.snapshot_tasks == 6
+    assert recovered.recovery_stats.replayed_operations == 1
+    assert recovered.count_tasks() == 7
+    recovered.close()
+
+def test_mutations_are_rolled_back_when_the_log_append_fails(tmp_path, monkeypatch):
+    task_manager = PersistentTaskManager(str(tmp_path))
+    task_manager.apply_batch(added=[Task("1", "first"), Task("2", "second")])
+
+    def fail(self, record):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(WriteAheadLog, "append", fail)
+    with pytest.raises(OSError):
+        task_manager.add_task(Task("3", "third"))
+    with pytest.raises(OSError):
+        task_manager.update_task(Task("1", "renamed", is_complete=True))
+    with pytest.raises(OSError):
+        task_manager.delete_task("2")
+    with pytest.raises(OSError):
+        task_manager.apply_batch(added=[Task("3", "third")], updated=[Task("1", "renamed")], deleted=["2"])
+    assert _ids_and_titles(task_manager) == [("1", "first", False), ("2", "second", False)]
+    assert [task.id for _, task in task_manager.search_tasks("renamed OR third")] == []
+    monkeypatch.undo()
+    task_manager.close()
+
+    recovered = PersistentTaskManager(str(tmp_path))
+    assert _ids_and_titles(recovered) == [("1", "first", False), ("2", "second", False)]
+    recovered.close()
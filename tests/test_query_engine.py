@@ -0,0 +1,74 @@
+import pytest
+from todo_app.domain.task import Task
+from todo_app.services.query_engine import QueryEngine
+from todo_app.state_management.columnar_task_store import ColumnarTaskStore
+from todo_app.state_management.task_manager import TaskManager
+
+@pytest.fixture
+def task_manager() -> TaskManager:
+    task_manager = TaskManager()
+    task_manager.apply_batch(added=[Task(str(number), f"task {number}") for number in range(1, 6)])
+    return task_manager
+
+def test_repeated_query_is_served_from_the_cache(task_manager):
+    query_engine = QueryEngine(task_manager)
+    first = query_engine.get_page(1, 2)
+    assert query_engine.get_page(1, 2) is first
+    info = query_engine.cache_info()
+    assert (info.hits, info.misses, info.size) == (1, 1, 1)
+
+def test_every_write_invalidates_cached_results(task_manager):
+    query_engine = QueryEngine(task_manager)
+    assert [task.title for task in query_engine.search("task")][:1] == ["task 1"]
+    assert len(query_engine.filter(is_complete=True)) == 0
+
+    task_manager.update_task(Task("1", "renamed", is_complete=True))
+    assert [task.id for task in query_engine.filter(is_complete=True)] == ["1"]
+    assert "1" not in [task.id for task in query_engine.search("task")]
+
+    task_manager.delete_task("1")
+    assert query_engine.filter(is_complete=True) == ()
+    assert len(query_engine.get_all_tasks()) == 4
+
+def test_cached_results_cannot_be_modified(task_manager):
+    query_engine = QueryEngine(task_manager)
+    result = query_engine.top_k("title", 3)
+    assert isinstance(result, tuple)
+    with pytest.raises(AttributeError):
+        result.append(Task("99", "intruder"))
+
+def test_least_recently_used_entry_is_evicted(task_manager):
+    query_engine = QueryEngine(task_manager, cache_size=2)
+    query_engine.get_page(1, 1)
+    query_engine.get_page(2, 1)
+    query_engine.get_page(1, 1)
+    query_engine.get_page(3, 1)
+    assert query_engine.cache_info().evictions == 1
+    query_engine.get_page(1, 1)
+    assert query_engine.cache_info().hits == 2
+
+def test_zero_cache_size_disables_caching(task_manager):
+    query_engine = QueryEngine(task_manager, cache_size=0)
+    assert query_engine.get_page(1, 2) == query_engine.get_page(1, 2)
+    assert query_engine.cache_info().size == 0
+    with pytest.raises(ValueError):
+        QueryEngine(task_manager, cache_size=-1)
+
+def test_clear_cache_resets_counters(task_manager):
+    query_engine = QueryEngine(task_manager)
+    query_engine.get_all_tasks()
+    query_engine.get_all_tasks()
+    query_engine.clear_cache()
+    info = query_engine.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.size) == (0, 0, 0, 0)
+
+def test_a_rejected_store_write_keeps_the_version_and_the_cache():
+    task_manager = TaskManager(ColumnarTaskStore())
+    task_manager.add_task(Task("1", "numeric"))
+    query_engine = QueryEngine(task_manager)
+    first = query_engine.get_all_tasks()
+    with pytest.raises(ValueError):
+        # The columnar store only accepts numeric IDs.
+        task_manager.add_task(Task("note", "rejected by the store"))
+    assert task_manager.version == 1
+    assert query_engine.get_all_tasks() is first
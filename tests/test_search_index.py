@@ -0,0 +1,68 @@
+import pytest
+from todo_app.domain.task import Task
+from todo_app.state_management.columnar_task_store import ColumnarTaskStore
+from todo_app.state_management.search_index import InvertedIndex, search_stream, tokenize
+from todo_app.state_management.task_manager import TaskManager
+
+@pytest.fixture(params=["dict", "columnar"])
+def task_manager(request) -> TaskManager:
+    task_manager = TaskManager(ColumnarTaskStore() if request.param == "columnar" else None)
+    task_manager.apply_batch(added=[
+        Task("1", "Buy milk", "and bread"),
+        Task("2", "Write report", "quarterly milk sales"),
+        Task("3", "Read book"),
+        Task("4", "Milky Way photo", "astronomy"),
+    ])
+    return task_manager
+
+def _ids(task_manager: TaskManager, query: str, limit: int = 10) -> list:
+    return [task.id for _, task in task_manager.search_tasks(query, limit)]
+
+def test_tokenize_casefolds_and_splits_on_non_word_characters():
+    assert tokenize("To-Do: Ünïcode STRASSE") == ["to", "do", "ünïcode", "strasse"]
+    assert tokenize(None) == []
+
+def test_terms_are_anded(task_manager):
+    assert _ids(task_manager, "milk bread") == ["1"]
+    assert _ids(task_manager, "milk astronomy") == []
+
+def test_or_separates_alternatives(task_manager):
+    assert sorted(_ids(task_manager, "bread OR book")) == ["1", "3"]
+
+def test_and_binds_tighter_than_or(task_manager):
+    assert sorted(_ids(task_manager, "milk bread OR book")) == ["1", "3"]
+
+def test_title_matches_rank_above_description_matches(task_manager):
+    assert _ids(task_manager, "milk") == ["1", "2"]
+
+def test_prefix_terms_expand_to_every_matching_word(task_manager):
+    assert sorted(_ids(task_manager, "mil*")) == ["1", "2", "4"]
+    assert _ids(task_manager, "zz*") == []
+
+def test_prefix_expansion_is_not_truncated():
+    index = InvertedIndex()
+    for number in range(500):
+        index.add(Task(str(number), f"word{number:04d}"))
+    assert len(index.search("word*", limit=1000)) == 500
+
+def test_index_follows_updates_and_deletions(task_manager):
+    task_manager.update_task(Task("3", "Read milk carton"))
+    task_manager.delete_task("1")
+    assert sorted(_ids(task_manager, "milk")) == ["2", "3"]
+    assert _ids(task_manager, "book") == []
+    assert _ids(task_manager, "bread") == []
+
+def test_limit_caps_the_results(task_manager):
+    assert len(_ids(task_manager, "mil*", limit=2)) == 2
+    assert _ids(task_manager, "milk", limit=0) == []
+    with pytest.raises(ValueError):
+        task_manager.search_tasks("milk", -1)
+
+@pytest.mark.parametrize("query", ["milk", "milk bread", "mil*", "milk OR book", "mil* sales OR read", "nothing"])
+def test_search_stream_ranks_like_the_index(task_manager, query):
+    index = InvertedIndex()
+    for task in task_manager.get_all_tasks():
+        index.add(task)
+    streamed = search_stream(task_manager.get_all_tasks(), query, 3)
+    assert [task_id for _, task_id in streamed] == [task_id for _, task_id in index.search(query, 3)]
+    assert [score for score, _ in streamed] == pytest.approx([score for score, _ in index.search(query, 3)])
@@ -0,0 +1,30 @@
+import pytest
+from todo_app.domain.task import Task
+from todo_app.state_management.sharded_task_manager import ShardedTaskManager
+
+@pytest.fixture
+def sharded():
+    sharded = ShardedTaskManager(2)
+    sharded.apply_batch(added=[Task(str(number), f"task {number}") for number in range(1, 5)])
+    yield sharded
+    sharded.close()
+
+def test_tasks_are_spread_over_the_shards(sharded):
+    assert [sharded.shard_for(str(number)) for number in range(1, 5)] == [1, 0, 1, 0]
+    assert sharded.count_tasks() == 4
+    assert [task.id for task in sharded.find_tasks(limit=3)] == ["1", "2", "3"]
+
+def test_an_error_on_one_shard_leaves_no_stale_replies(sharded):
+    with pytest.raises(ValueError):
+        sharded.delete_task("99")
+    assert sharded.get_task("2").title == "task 2"
+    assert sharded.count_tasks() == 4
+
+def test_a_dead_worker_leaves_no_stale_replies_on_the_others(sharded):
+    worker = sharded._workers[1]
+    worker.terminate()
+    worker.join()
+    with pytest.raises(RuntimeError):
+        sharded.count_tasks()
+    # Shard 0's reply to the count was collected, so this reads its own answer.
+    assert sharded.get_task("2").title == "task 2"
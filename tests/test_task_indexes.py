@@ -0,0 +1,59 @@
+import pytest
+from todo_app.domain.task import Task
+from todo_app.state_management.columnar_task_store import ColumnarTaskStore
+from todo_app.state_management.task_manager import TaskManager
+
+def _manager(store=None) -> TaskManager:
+    task_manager = TaskManager(store)
+    task_manager.apply_batch(added=[
+        Task("10", "banana", is_complete=True),
+        Task("2", "Apple"),
+        Task("33", "cherry", is_complete=True),
+        Task("4", "apple"),
+    ])
+    return task_manager
+
+def _ids(tasks) -> list:
+    return [task.id for task in tasks]
+
+@pytest.fixture(params=["dict", "columnar"])
+def task_manager(request) -> TaskManager:
+    return _manager(ColumnarTaskStore() if request.param == "columnar" else None)
+
+def test_ids_are_ordered_numerically(task_manager):
+    assert _ids(task_manager.find_tasks()) == ["2", "4", "10", "33"]
+
+def test_non_numeric_ids_follow_numeric_ones():
+    task_manager = _manager()
+    task_manager.add_task(Task("abc", "text id"))
+    assert _ids(task_manager.find_tasks()) == ["2", "4", "10", "33", "abc"]
+
+def test_title_order_is_case_insensitive_with_id_as_tie_break(task_manager):
+    assert _ids(task_manager.find_tasks(order_by="title")) == ["2", "4", "10", "33"]
+    task_manager.update_task(Task("2", "zucchini"))
+    assert _ids(task_manager.find_tasks(order_by="title")) == ["4", "10", "33", "2"]
+
+def test_status_filter_limit_and_offset(task_manager):
+    assert _ids(task_manager.find_tasks(is_complete=True)) == ["10", "33"]
+    assert _ids(task_manager.find_tasks(is_complete=False, order_by="title", limit=1)) == ["2"]
+    assert _ids(task_manager.find_tasks(limit=2, offset=1)) == ["4", "10"]
+    assert task_manager.find_tasks(limit=0) == []
+
+def test_counts_follow_status_changes_and_deletions(task_manager):
+    assert (task_manager.count_tasks(), task_manager.count_tasks(True), task_manager.count_tasks(False)) == (4, 2, 2)
+    task_manager.update_task(Task("2", "Apple", is_complete=True))
+    task_manager.delete_task("33")
+    assert (task_manager.count_tasks(), task_manager.count_tasks(True), task_manager.count_tasks(False)) == (3, 2, 1)
+    assert _ids(task_manager.find_tasks(is_complete=True)) == ["2", "10"]
+
+def test_invalid_queries_are_rejected(task_manager):
+    with pytest.raises(ValueError):
+        task_manager.find_tasks(order_by="description")
+    with pytest.raises(ValueError):
+        task_manager.find_tasks(limit=-1)
+
+def test_failed_batch_leaves_indexes_unchanged(task_manager):
+    with pytest.raises(ValueError):
+        task_manager.apply_batch(added=[Task("5", "new")], deleted=["404"])
+    assert task_manager.count_tasks() == 4
+    assert _ids(task_manager.find_tasks()) == ["2", "4", "10", "33"]
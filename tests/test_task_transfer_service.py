@@ -0,0 +1,60 @@
+import io
+from typing import Tuple
+import pytest
+from todo_app.domain.task import Task
+from todo_app.services.query_engine import QueryEngine
+from todo_app.services.task_lifecycle_service import TaskLifecycleService
+from todo_app.services.task_transfer_service import TaskTransferService
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.utils.id_generator import SequentialIDGenerator
+
+TASKS = [
+    Task("1", "Buy milk", "semi-skimmed, 2 litres", is_complete=True),
+    Task("2", "Write report, \"Q3\""),
+    Task("3", "Crème brûlée", "line one\nline two"),
+]
+
+def _service(tasks=()) -> Tuple[TaskTransferService, TaskManager]:
+    task_manager = TaskManager()
+    task_manager.apply_batch(added=list(tasks))
+    lifecycle = TaskLifecycleService(task_manager, SequentialIDGenerator(start=len(tasks)))
+    return TaskTransferService(lifecycle, QueryEngine(task_manager)), task_manager
+
+def _contents(task_manager: TaskManager) -> list:
+    return [(task.title, task.description, task.is_complete) for task in task_manager.find_tasks()]
+
+@pytest.mark.parametrize("transfer_format", ["jsonl", "csv"])
+def test_export_then_import_round_trips(transfer_format):
+    source, _ = _service(TASKS)
+    out = io.StringIO(newline="")
+    assert source.export_tasks(out, transfer_format).rows == 3
+
+    target, task_manager = _service()
+    result = target.import_tasks(io.StringIO(out.getvalue(), newline=""), transfer_format)
+    assert (result.rows, result.rejected_count) == (3, 0)
+    assert _contents(task_manager) == [(task.title, task.description, task.is_complete) for task in TASKS]
+
+def test_invalid_jsonl_rows_are_rejected_by_line_number():
+    lines = [
+        '{"title": "kept", "is_complete": "yes"}',
+        "not json",
+        "",
+        '["a list"]',
+        '{"title": "   "}',
+        '{"title": "bad status", "is_complete": "maybe"}',
+        '{"title": "also kept", "description": ""}',
+    ]
+    service, task_manager = _service()
+    result = service.import_tasks(io.StringIO("\n".join(lines) + "\n"), "jsonl", chunk_size=2)
+    assert (result.rows, result.rejected_count) == (2, 4)
+    assert [line_number for line_number, _ in result.rejected] == [2, 4, 5, 6]
+    assert _contents(task_manager) == [("kept", None, True), ("also kept", None, False)]
+
+def test_invalid_csv_rows_are_rejected_by_line_number():
+    csv_text = "title,description,is_complete\nkept,,false\n,no title,false\ntoo,many,false,fields\n"
+    service, _ = _service()
+    result = service.import_tasks(io.StringIO(csv_text, newline=""), "csv")
+    assert (result.rows, result.rejected_count) == (1, 2)
+    assert [line_number for line_number, _ in result.rejected] == [3, 4]
+    with pytest.raises(ValueError):
+        service.import_tasks(io.StringIO("name\nkept\n"), "csv")
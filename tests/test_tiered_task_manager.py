@@ -0,0 +1,126 @@
+import os
+import pytest
+from todo_app.domain.task import Task
+from todo_app.state_management.cold_task_store import ColdTaskStore
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.state_management.tiered_task_manager import TieredTaskManager
+
+ARCHIVE_AFTER = 100.0
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def _tiers(tmp_path, clock: FakeClock, hot: TaskManager = None, completion_log: bool = False) -> TieredTaskManager:
+    return TieredTaskManager(
+        TaskManager() if hot is None else hot,
+        ColdTaskStore(os.path.join(str(tmp_path), "tasks.archive")),
+        ARCHIVE_AFTER,
+        sweep_interval=ARCHIVE_AFTER,
+        clock=clock,
+        completion_log=os.path.join(str(tmp_path), "completions.log") if completion_log else None,
+    )
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+def _populated(tmp_path, clock: FakeClock) -> TieredTaskManager:
+    """
+    Tasks 1-7, of which 2 and 4 are archived by the mutation that adds 7, completed just now.
+    """
+    tiers = _tiers(tmp_path, clock)
+    tiers.apply_batch(added=[Task(str(number), f"task {number}") for number in range(1, 7)])
+    tiers.apply_batch(updated=[Task(str(number), f"task {number}", is_complete=True) for number in (2, 4)])
+    clock.now += ARCHIVE_AFTER + 1
+    tiers.add_task(Task("7", "late", is_complete=True))
+    return tiers
+
+@pytest.fixture
+def tiers(tmp_path, clock):
+    tiers = _populated(tmp_path, clock)
+    yield tiers
+    tiers.close()
+
+def _ids(tasks) -> list:
+    return [task.id for task in tasks]
+
+def test_only_tasks_completed_long_enough_ago_are_archived(tiers):
+    assert tiers.archive_due() == 0
+    assert tiers.archived_count == 2
+    assert _ids(tiers.hot.find_tasks()) == ["1", "3", "5", "6", "7"]
+
+def test_queries_cover_both_tiers(tiers):
+    assert tiers.get_task("2").title == "task 2"
+    assert (tiers.count_tasks(), tiers.count_tasks(True), tiers.count_tasks(False)) == (7, 3, 4)
+    assert _ids(tiers.find_tasks()) == [str(number) for number in range(1, 8)]
+    assert _ids(tiers.find_tasks(is_complete=True)) == ["2", "4", "7"]
+    assert _ids(tiers.find_tasks(limit=2, offset=1)) == ["2", "3"]
+    assert _ids(tiers.find_tasks(is_complete=False)) == ["1", "3", "5", "6"]
+    assert _ids(tiers.scan_tasks("task", is_complete=True)) == ["2", "4"]
+    assert sorted(task.id for _, task in tiers.search_tasks("task", 10)) == ["1", "2", "3", "4", "5", "6"]
+    assert sorted(_ids(tiers.get_all_tasks())) == [str(number) for number in range(1, 8)]
+
+def test_updating_an_archived_task_promotes_it(tiers):
+    version = tiers.version
+    tiers.update_task(Task("2", "reopened"))
+    assert tiers.archived_count == 1
+    assert tiers.hot.get_task("2").title == "reopened"
+    assert tiers.version > version
+    assert _ids(tiers.find_tasks(is_complete=False)) == ["1", "2", "3", "5", "6"]
+
+def test_deleting_an_archived_task_removes_it_from_the_archive(tiers):
+    tiers.delete_task("4")
+    assert tiers.get_task("4") is None
+    assert tiers.count_tasks() == 6
+    with pytest.raises(ValueError):
+        tiers.add_task(Task("2", "duplicate of an archived task"))
+
+def test_archive_survives_a_restart(tmp_path, clock):
+    tiers = _populated(tmp_path, clock)
+    hot = tiers.hot
+    tiers.close()
+    reopened = _tiers(tmp_path, clock, hot)
+    assert reopened.archived_count == 2
+    assert reopened.get_task("4").is_complete
+    reopened.close()
+
+def test_completion_times_survive_a_restart(tmp_path, clock):
+    tiers = _tiers(tmp_path, clock, completion_log=True)
+    tiers.add_task(Task("1", "done early", is_complete=True))
+    clock.now += ARCHIVE_AFTER / 2
+    tiers.add_task(Task("2", "done later", is_complete=True))
+    tiers.archive_due()
+    hot = tiers.hot
+    tiers.close()
+
+    clock.now += ARCHIVE_AFTER / 2 + 1
+    reopened = _tiers(tmp_path, clock, hot, completion_log=True)
+    assert reopened.archive_due() == 1
+    assert _ids(reopened.hot.find_tasks()) == ["2"]
+    reopened.close()
+
+def test_id_pages_resume_across_tiers(tiers, clock):
+    tiers.add_task(Task("note", "not numeric", is_complete=True))
+    tiers.update_task(Task("5", "task 5", is_complete=True))
+    clock.now += ARCHIVE_AFTER + 1
+    tiers.archive_due()
+    assert tiers.archived_count == 5
+    assert _ids(tiers.find_tasks(limit=3, after_id="2")) == ["3", "4", "5"]
+    assert _ids(tiers.find_tasks(after_id="6")) == ["7", "note"]
+    assert _ids(tiers.find_tasks(is_complete=True, order_by="title", limit=2)) == ["7", "note"]
+    assert _ids(tiers.scan_tasks("TASK")) == ["1", "2", "3", "4", "5", "6"]
+    assert [task.id for _, task in tiers.search_tasks("numeric")] == ["note"]
+
+def test_completed_tasks_missing_from_the_log_are_found_by_the_first_sweep(tmp_path, clock):
+    hot = TaskManager()
+    hot.apply_batch(added=[Task("1", "done before tiering", is_complete=True), Task("2", "open")])
+    tiers = _tiers(tmp_path, clock, hot, completion_log=True)
+    assert tiers.archive_due() == 0
+    clock.now += ARCHIVE_AFTER + 1
+    assert tiers.archive_due() == 1
+    assert _ids(tiers.hot.find_tasks()) == ["2"]
+    tiers.close()
@@ -0,0 +1,101 @@
+import io
+from typing import Tuple
+import pytest
+from todo_app.domain.task import Task
+from todo_app.services.query_engine import QueryEngine
+from todo_app.services.task_lifecycle_service import TaskLifecycleService
+from todo_app.services.task_transfer_service import TaskTransferService
+from todo_app.services.undo_journal import UndoJournal, diff_tasks
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.utils.id_generator import SequentialIDGenerator
+
+def _service(journal: UndoJournal) -> Tuple[TaskLifecycleService, TaskManager]:
+    task_manager = TaskManager()
+    return TaskLifecycleService(task_manager, SequentialIDGenerator(), journal=journal), task_manager
+
+def _titles(task_manager: TaskManager) -> list:
+    return [(task.id, task.title, task.is_complete) for task in task_manager.find_tasks()]
+
+def test_deltas_hold_only_changed_fields():
+    before = Task("1", "title", "description")
+    assert diff_tasks(before, Task("1", "title", "description", is_complete=True)) == ("1", "is_complete", False, True)
+    assert diff_tasks(before, before) is None
+
+def test_undo_and_redo_walk_the_history():
+    service, task_manager = _service(UndoJournal())
+    service.create_new_task("first", None)
+    service.modify_task("1", "renamed", None)
+    service.set_task_completion_status("1", True)
+
+    assert service.undo().operation == "mark"
+    assert service.undo().operation == "update"
+    assert _titles(task_manager) == [("1", "first", False)]
+    assert service.redo().operation == "update"
+    assert _titles(task_manager) == [("1", "renamed", False)]
+    assert service.undo().operation == "update"
+    assert service.undo().operation == "add"
+    assert _titles(task_manager) == []
+    with pytest.raises(ValueError):
+        service.undo()
+
+def test_delete_is_undone_with_the_original_task():
+    service, task_manager = _service(UndoJournal())
+    service.create_new_task("kept", "with a description")
+    service.remove_task("1")
+    service.undo()
+    assert task_manager.get_task("1") == Task("1", "kept", "with a description")
+
+def test_new_operation_clears_redo():
+    service, task_manager = _service(UndoJournal())
+    service.create_new_task("first", None)
+    service.undo()
+    service.create_new_task("second", None)
+    with pytest.raises(ValueError):
+        service.redo()
+
+def test_bulk_operation_is_one_entry():
+    service, task_manager = _service(UndoJournal())
+    service.create_many([("a", None), ("b", None), ("c", None)])
+    service.set_completion_many(["1", "3", "404"], True)
+    entry = service.undo()
+    assert entry.describe() == "bulk mark (2 tasks)"
+    assert all(not task.is_complete for task in task_manager.find_tasks())
+
+def test_undo_refuses_when_a_task_changed_since():
+    journal = UndoJournal()
+    service, task_manager = _service(journal)
+    service.create_new_task("first", None)
+    service.modify_task("1", "renamed", None)
+    task_manager.update_task(Task("1", "changed behind the journal's back"))
+    with pytest.raises(ValueError, match="has changed since"):
+        service.undo()
+    assert journal.info().undo_entries == 2
+
+def test_capacity_and_delta_limit_forget_the_oldest_entries():
+    journal = UndoJournal(capacity=2, max_deltas=3)
+    service, task_manager = _service(journal)
+    for title in ("a", "b", "c"):
+        service.create_new_task(title, None)
+    assert journal.info().undo_entries == 2
+    service.create_many([("d", None), ("e", None)])
+    assert (journal.info().undo_entries, journal.info().deltas) == (2, 3)
+    service.create_many([("f", None), ("g", None), ("h", None), ("i", None)])
+    assert journal.info().undo_entries == 0
+
+def test_import_is_undone_in_one_step():
+    journal = UndoJournal()
+    service, task_manager = _service(journal)
+    transfer = TaskTransferService(service, QueryEngine(task_manager))
+    rows = "".join(f'{{"title": "row {number}"}}\n' for number in range(12))
+    assert transfer.import_tasks(io.StringIO(rows), "jsonl", chunk_size=5).rows == 12
+    entry = service.undo()
+    assert entry.describe() == "import (12 tasks)"
+    assert _titles(task_manager) == []
+    service.redo()
+    assert len(_titles(task_manager)) == 12
+
+def test_journal_rejects_bad_limits():
+    with pytest.raises(ValueError):
+        UndoJournal(capacity=0)
+    with pytest.raises(ValueError):
+        UndoJournal(max_deltas=0)
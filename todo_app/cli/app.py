@@ -1,17 +1,22 @@
-from typing import Optional, Callable, List
+import sys
+from typing import Optional, Callable, TextIO
 from todo_app.services.task_lifecycle_service import TaskLifecycleService
 from todo_app.services.query_engine import QueryEngine
-from todo_app.domain.task import Task
+from todo_app.cli.task_renderer import TaskRenderer
 
 class CLIApplication:
     """
     The main entry point for the console application.
     Handles the application loop, user input, and output display.
     """
+    # Number of tasks formatted and written per chunk when listing tasks.
+    VIEW_PAGE_SIZE = 100
+
     def __init__(self, task_lifecycle_service: TaskLifecycleService,
                  query_engine: QueryEngine):
         self._task_lifecycle_service = task_lifecycle_service
         self._query_engine = query_engine
+        self._renderer = TaskRenderer()
         self._running = False
         self._menu_options = {
             "1": {"name": "Add Task", "command": self._interactive_add_task},
@@ -19,30 +24,11 @@ class CLIApplication:
             "3": {"name": "Update Task", "command": self._interactive_update_task},
             "4": {"name": "Delete Task", "command": self._interactive_delete_task},
             "5": {"name": "Mark Task Status", "command": self._interactive_mark_task_status},
-            "6": {"name": "Show Menu", "command": self._interactive_help},
-            "7": {"name": "Exit", "command": self._exit_application}
+            "6": {"name": "Search Tasks", "command": self._interactive_search_tasks},
+            "7": {"name": "Show Menu", "command": self._interactive_help},
+            "8": {"name": "Exit", "command": self._exit_application}
         }
     
-    def _format_task_output(self, task: Task) -> str:
-        """Helper function to format a single task for display."""
-        status = "✅ Complete" if task.is_complete else "⏳ Incomplete"
-        description_line = f"  Description: {task.description}" if task.description else ""
-        return (
-            f"ID: {task.id}\n"
-            f"  Title: {task.title}\n"
-            f"{description_line}\n"
-            f"  Status: {status}\n"
-            "--------------------"
-        )
-
-    def _format_tasks_list_output(self, tasks: List[Task]) -> str:
-        """Helper function to format a list of tasks for display."""
-        if not tasks:
-            return "No tasks found."
-        
-        formatted_tasks = [self._format_task_output(task) for task in tasks]
-        return "\n".join(formatted_tasks)
-
     def _display_menu(self) -> None:
         """Displays the main menu options to the user."""
         print("\n--- To-Do Application Menu ---")
@@ -80,10 +66,33 @@ class CLIApplication:
             print(f"Failed to add task: {e}")
 
     def _interactive_view_tasks(self) -> None:
-        """Displays all tasks."""
+        """Displays all tasks, streaming them page by page."""
         print("\n--- All Tasks ---")
-        tasks = self._query_engine.get_all_tasks()
-        print(self._format_tasks_list_output(tasks))
+        self._write_task_pages(sys.stdout)
+
+    def _write_task_pages(self, out: TextIO) -> None:
+        """
+        Writes every task to `out` one page at a time, so the first page appears
+        immediately and only one page of formatted text is held in memory.
+        """
+        empty = True
+        for page in self._query_engine.iter_tasks(page_size=self.VIEW_PAGE_SIZE):
+            empty = False
+            out.write(self._renderer.render_list(page))
+            out.write("\n")
+            out.flush()
+        if empty:
+            out.write(self._renderer.render_list([]) + "\n")
+
+    def _interactive_search_tasks(self) -> None:
+        """Searches task titles and descriptions."""
+        print("\n--- Search Tasks ---")
+        query = input("Enter search terms (use OR for alternatives, * for prefixes): ").strip()
+        if not query:
+            print("Search query cannot be empty.")
+            return
+        tasks = self._query_engine.search(query, limit=20)
+        print(self._renderer.render_list(tasks))
 
     def _interactive_update_task(self) -> None:
         """Guides the user through updating a task."""
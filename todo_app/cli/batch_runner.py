@@ -0,0 +1,101 @@
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Iterable, List, Optional, TextIO
+from todo_app.cli.command_dispatcher import CommandDispatcher, reports_failure
+
+# Commands per group when the runner is given a `group` context.
+DEFAULT_GROUP_SIZE = 1000
+
+@dataclass(frozen=True)
+class BatchSummary:
+    """
+    Outcome of a batch run.
+    """
+    commands: int
+    failures: int
+    seconds: float
+    stopped_early: bool
+
+    @property
+    def commands_per_second(self) -> float:
+        return self.commands / self.seconds if self.seconds > 0 else 0.0
+
+    def describe(self) -> str:
+        status = "stopped at first error" if self.stopped_early else "complete"
+        return (f"Batch {status}: {self.commands} commands, {self.failures} failed, "
+                f"{self.seconds:.3f}s ({self.commands_per_second:,.0f} commands/sec).")
+
+class BatchRunner:
+    """
+    Runs command lines (from a script file or piped stdin) through the CommandDispatcher
+    without the interactive menu. Output is collected in a buffer and written in
+    large blocks rather than one write per command.
+
+    Blank lines and lines starting with '#' are skipped; 'exit' ends the run.
+    A command fails if its result reports an error or a partial failure (see
+    reports_failure), e.g. a bulk operation with a rejected item.
+
+    With a `group` context factory (such as PersistentTaskManager.batch),
+    commands run inside one group context per `group_size` commands, so their
+    writes are committed together while each group stays bounded.
+    """
+    def __init__(self, dispatcher: CommandDispatcher, out: TextIO,
+                 stop_on_error: bool = True, buffer_size: int = 64 * 1024,
+                 group: Optional[Callable[[], ContextManager]] = None, group_size: int = DEFAULT_GROUP_SIZE):
+        if group_size <= 0:
+            raise ValueError("Group size must be positive.")
+        self._dispatcher = dispatcher
+        self._out = out
+        self._stop_on_error = stop_on_error
+        self._buffer_size = buffer_size
+        self._group = group
+        self._group_size = group_size
+
+    def run(self, lines: Iterable[str]) -> BatchSummary:
+        """
+        Dispatches every command line and returns a summary of the run.
+        """
+        buffer: List[str] = []
+        buffered = 0
+        commands = 0
+        failures = 0
+        stopped_early = False
+        finished = False
+        started = time.perf_counter()
+        lines = iter(lines)
+        try:
+            while not finished:
+                finished = True
+                with self._group() if self._group is not None else nullcontext():
+                    for line in lines:
+                        command_line = line.strip()
+                        if not command_line or command_line.startswith("#"):
+                            continue
+                        if command_line.lower() == "exit":
+                            break
+                        commands += 1
+                        failed = False
+                        for position, chunk in enumerate(self._dispatcher.dispatch_stream(command_line)):
+                            if position == 0 and reports_failure(chunk):
+                                failed = True
+                            buffer.append(chunk)
+                            buffer.append("\n")
+                            buffered += len(chunk) + 1
+                            if buffered >= self._buffer_size:
+                                self._out.write("".join(buffer))
+                                buffer.clear()
+                                buffered = 0
+                        if failed:
+                            failures += 1
+                            if self._stop_on_error:
+                                stopped_early = True
+                                break
+                        if self._group is not None and commands % self._group_size == 0:
+                            # End this group; the next one resumes with the following line.
+                            finished = False
+                            break
+        finally:
+            self._out.write("".join(buffer))
+            self._out.flush()
+        return BatchSummary(commands, failures, time.perf_counter() - started, stopped_early)
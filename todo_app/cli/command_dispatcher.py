@@ -1,55 +1,268 @@
-from typing import Callable, Dict, List, Any
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+import inspect
 import shlex
+from todo_app.utils.metrics import Metrics, OperationStats
+
+# Handlers report failures as messages rather than exceptions; these are the
+# prefixes every failure message in the command layer starts with.
+ERROR_MESSAGE_PREFIXES = ("Error", "Failed", "An unexpected error")
+
+def is_error_message(message: str) -> bool:
+    """
+    Returns True if a dispatcher or handler result reports a failure.
+    """
+    return message.startswith(ERROR_MESSAGE_PREFIXES)
+
+class PartialFailure(str):
+    """
+    Result text of a command that applied some of its items and rejected others,
+    such as a bulk operation or an import with invalid rows. It is displayed like
+    any other result, but reports_failure lets callers that count failures (e.g.
+    BatchRunner) tell it apart without parsing the message.
+    """
+
+def reports_failure(message: str) -> bool:
+    """
+    Returns True if a result reports a failure, complete or partial.
+    """
+    return isinstance(message, PartialFailure) or is_error_message(message)
+
+# Characters that need shlex's quoting and escaping rules; lines without any of
+# them (and with plain spaces as the only whitespace) are split with str.split.
+_SHLEX_SPECIAL_CHARACTERS = ("\"", "'", "\\")
+
+def split_command_line(command_line_input: str) -> List[str]:
+    """
+    Splits a command line the way shlex.split does, taking a fast path for lines
+    without quotes, escapes or unusual whitespace. Raises ValueError on unbalanced quotes.
+    """
+    if (command_line_input.isascii() and command_line_input.isprintable()
+            and not any(character in command_line_input for character in _SHLEX_SPECIAL_CHARACTERS)):
+        return command_line_input.split()
+    return shlex.split(command_line_input)
+
+@dataclass(frozen=True)
+class CommandSpec:
+    """
+    A registered handler with its positional arity, read once from its signature.
+    `max_args` is None when the handler accepts any number of arguments (*args);
+    `checked` is False when the signature could not be inspected.
+    """
+    name: str
+    handler: Callable[..., Union[str, Iterable[str]]]
+    min_args: int = 0
+    max_args: Optional[int] = None
+    checked: bool = False
+    usage: str = ""
+
+    @classmethod
+    def inspect(cls, name: str, handler: Callable[..., Union[str, Iterable[str]]]) -> "CommandSpec":
+        usage = next((line.strip() for line in (inspect.getdoc(handler) or "").splitlines()
+                      if line.strip().startswith("Usage:")), "")
+        try:
+            parameters = inspect.signature(handler).parameters.values()
+        except (TypeError, ValueError):
+            return cls(name, handler, usage=usage)
+        positional = [p for p in parameters if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        required = sum(1 for p in positional if p.default is p.empty)
+        variadic = any(p.kind == p.VAR_POSITIONAL for p in parameters)
+        return cls(name, handler, required, None if variadic else len(positional), True, usage)
+
+    def arity_error(self, given: int) -> Optional[str]:
+        """
+        Returns a description of the mismatch if `given` arguments cannot be passed, else None.
+        """
+        if not self.checked or (given >= self.min_args and (self.max_args is None or given <= self.max_args)):
+            return None
+        if self.max_args is None:
+            expected = f"at least {self.min_args}"
+        elif self.min_args == self.max_args:
+            expected = str(self.min_args) if self.min_args else "no"
+        else:
+            expected = f"{self.min_args} to {self.max_args}"
+        details = f"expected {expected} argument{'' if expected in ('1', 'at least 1') else 's'}, got {given}."
+        return f"{details} {self.usage}" if self.usage else details
 
 class CommandDispatcher:
     """
     Maps user commands (e.g., "add", "view", "update") to specific actions/methods.
     Parses user input, validates, and invokes the appropriate registered handler.
+
+    Command names, aliases and (with prefix_matching) every unambiguous prefix are
+    resolved through one lookup table rebuilt on registration. Handler signatures
+    are inspected at registration, so a wrong argument count is reported before
+    the call and a TypeError raised inside a handler is reported as the
+    unexpected error it is.
+
+    With a Metrics registry every dispatch is counted and timed under
+    "command.<name>", with failures classified as TypeError, ValueError, other,
+    or "reported" when the handler returned an error message. The recorded time
+    is the handler's own: the call plus, for streamed output, the time spent
+    producing each chunk, excluding the time the consumer holds a chunk before
+    asking for the next one.
     """
-    def __init__(self):
-        self._commands: Dict[str, Callable[..., str]] = {}
+    def __init__(self, metrics: Optional[Metrics] = None, prefix_matching: bool = False):
+        self._commands: Dict[str, CommandSpec] = {}
+        self._aliases: Dict[str, str] = {}
+        self._lookup: Dict[str, CommandSpec] = {}
+        self._prefix_matching = prefix_matching
+        self._metrics = metrics
+        self._command_stats: Dict[str, OperationStats] = {}
 
-    def register_command(self, command_name: str, handler_function: Callable[..., str]) -> None:
+    def register_command(self, command_name: str, handler_function: Callable[..., Union[str, Iterable[str]]]) -> None:
         """
         Registers a command with its corresponding handler function.
-        The handler function should return a string message to be displayed to the user.
+        The handler function should return a string message to be displayed to the user,
+        or an iterable of strings for output that is streamed in chunks.
         """
         if not isinstance(command_name, str) or not command_name:
             raise ValueError("Command name must be a non-empty string.")
         if not callable(handler_function):
             raise ValueError("Handler function must be callable.")
         
-        if command_name in self._commands:
+        if command_name in self._commands or command_name in self._aliases:
             raise ValueError(f"Command '{command_name}' is already registered.")
         
-        self._commands[command_name] = handler_function
+        self._commands[command_name] = CommandSpec.inspect(command_name, handler_function)
+        if self._metrics is not None:
+            self._command_stats[command_name] = self._metrics.operation(f"command.{command_name}")
+        self._rebuild_lookup()
+
+    def __contains__(self, command_name: object) -> bool:
+        """
+        Returns True if `command_name` is a registered command (not an alias or prefix).
+        """
+        return command_name in self._commands
+
+    def register_alias(self, alias: str, command_name: str) -> None:
+        """
+        Makes `alias` another name for an already registered command.
+        """
+        if not isinstance(alias, str) or not alias:
+            raise ValueError("Alias must be a non-empty string.")
+        if command_name not in self._commands:
+            raise ValueError(f"Cannot alias unknown command '{command_name}'.")
+        if alias in self._commands or alias in self._aliases:
+            raise ValueError(f"Command '{alias}' is already registered.")
+        self._aliases[alias] = command_name
+        self._rebuild_lookup()
+
+    def _rebuild_lookup(self) -> None:
+        """
+        Precomputes the name -> command table: exact names and aliases (matched
+        case-insensitively) plus, with prefix matching, every prefix that selects
+        exactly one of them.
+        """
+        names = {name: self._commands[name] for name in self._commands}
+        names.update((alias, self._commands[target]) for alias, target in self._aliases.items())
+        lookup: Dict[str, CommandSpec] = {}
+        if self._prefix_matching:
+            candidates: Dict[str, set] = {}
+            for name, spec in names.items():
+                lowered = name.lower()
+                for end in range(1, len(lowered)):
+                    candidates.setdefault(lowered[:end], set()).add(spec.name)
+            lookup.update((prefix, self._commands[next(iter(targets))])
+                          for prefix, targets in candidates.items() if len(targets) == 1)
+        lookup.update((name.lower(), spec) for name, spec in names.items())
+        self._lookup = lookup
 
     def dispatch(self, command_line_input: str) -> str:
         """
         Parses the command line input, dispatches the command to its handler,
         and returns the result or an error message.
         """
+        return "\n".join(self.dispatch_stream(command_line_input))
+
+    def dispatch_stream(self, command_line_input: str) -> Iterator[str]:
+        """
+        Like dispatch, but yields the output in chunks as the handler produces them.
+        Handlers may return a single string or an iterable of strings (e.g. one per
+        page of a long listing); chunks are meant to be written one per line.
+        """
         if not command_line_input or not command_line_input.strip():
-            return "Error: Command cannot be empty."
+            yield "Error: Command cannot be empty."
+            return
 
-        # Use shlex to correctly parse arguments, handling quotes
-        args: List[str] = shlex.split(command_line_input)
-        command_name = args[0].lower()
+        try:
+            args: List[str] = split_command_line(command_line_input)
+        except ValueError as e:
+            yield f"Error: Could not parse command. Details: {e}"
+            return
         command_args = args[1:]
 
-        handler = self._commands.get(command_name)
-        if not handler:
-            return f"Error: Unknown command '{command_name}'. Type 'help' for available commands."
+        spec = self._lookup.get(args[0]) or self._lookup.get(args[0].lower())
+        if spec is None:
+            if self._metrics is not None:
+                self._metrics.operation("command.<unknown>").record(0, "unknown")
+            yield f"Error: Unknown command '{args[0].lower()}'. Type 'help' for available commands."
+            return
+        command_name = spec.name
+
+        arity_error = spec.arity_error(len(command_args))
+        if arity_error is not None:
+            if self._metrics is not None:
+                self._command_stats[command_name].record(0, "TypeError")
+            yield f"Error: Invalid arguments for command '{command_name}'. Details: {arity_error}"
+            return
+
+        if self._metrics is not None:
+            yield from self._run_measured(spec, command_args, self._command_stats[command_name])
+            return
+
+        try:
+            result = spec.handler(*command_args)
+            if isinstance(result, str):
+                yield result
+                return
+            # Streaming handlers raise lazily, so errors are caught while iterating.
+            for chunk in result:
+                yield chunk
+        except TypeError as e:
+            yield self._type_error_message(spec, e)
+        except ValueError as e:
+            yield f"Error processing command '{command_name}'. Details: {e}"
+        except Exception as e:
+            yield f"An unexpected error occurred while executing '{command_name}'. Details: {e}"
+
+    @staticmethod
+    def _type_error_message(spec: CommandSpec, error: TypeError) -> str:
+        if spec.checked:
+            # Arity was verified up front, so this came from inside the handler.
+            return f"An unexpected error occurred while executing '{spec.name}'. Details: {error}"
+        return f"Error: Invalid arguments for command '{spec.name}'. Details: {error}"
 
+    @classmethod
+    def _run_measured(cls, spec: CommandSpec, command_args: List[str], stats: OperationStats) -> Iterator[str]:
+        """
+        The handler call from dispatch_stream, recording the latency and error type in `stats`.
+        The clock is paused while a streamed chunk is out with the consumer.
+        """
+        command_name = spec.name
+        elapsed = 0
+        started = perf_counter_ns()
         try:
-            # Dynamically call the handler with its arguments
-            # This assumes handlers expect arguments in the order they are provided
-            # and that type hinting will guide their usage.
-            return handler(*command_args)
+            result = spec.handler(*command_args)
+            if isinstance(result, str):
+                stats.record(perf_counter_ns() - started, "reported" if is_error_message(result) else None)
+                yield result
+                return
+            error_type = None
+            for position, chunk in enumerate(result):
+                elapsed += perf_counter_ns() - started
+                if position == 0 and is_error_message(chunk):
+                    error_type = "reported"
+                yield chunk
+                started = perf_counter_ns()
+            stats.record(elapsed + perf_counter_ns() - started, error_type)
         except TypeError as e:
-            # This can happen if the number of arguments is wrong
-            return f"Error: Invalid arguments for command '{command_name}'. Details: {e}"
+            stats.record(elapsed + perf_counter_ns() - started, "TypeError")
+            yield cls._type_error_message(spec, e)
         except ValueError as e:
-            return f"Error processing command '{command_name}'. Details: {e}"
+            stats.record(elapsed + perf_counter_ns() - started, "ValueError")
+            yield f"Error processing command '{command_name}'. Details: {e}"
         except Exception as e:
-            return f"An unexpected error occurred while executing '{command_name}'. Details: {e}"
+            stats.record(elapsed + perf_counter_ns() - started, "other")
+            yield f"An unexpected error occurred while executing '{command_name}'. Details: {e}"
@@ -1,46 +1,94 @@
-from typing import Optional, Callable, List
-from todo_app.services.task_lifecycle_service import TaskLifecycleService
+import shlex
+from typing import Optional, Callable, Iterable, Iterator, List, Union
+from todo_app.cli.command_dispatcher import CommandDispatcher, PartialFailure
+from todo_app.cli.task_renderer import TaskRenderer
+from todo_app.services.task_lifecycle_service import BulkResult, TaskLifecycleService
+from todo_app.services.materialized_views import RecentlyCompletedView, StatusCountsView, ViewRegistry
 from todo_app.services.query_engine import QueryEngine
-from todo_app.domain.task import Task
+from todo_app.state_management.tiered_task_manager import TieredTaskManager
+from todo_app.services.task_transfer_service import (TRANSFER_FORMATS, TaskTransferService, TransferResult,
+                                                     format_for_path)
+from todo_app.utils.metrics import Metrics
+from todo_app.utils.profiler import Profiler
 from datetime import datetime
 
+# Number of tasks formatted per output chunk when streaming a full listing.
+VIEW_STREAM_PAGE_SIZE = 100
+# Page size used by "view --page N" when no --limit is given.
+VIEW_DEFAULT_PAGE_LIMIT = 20
+# Where "profile" writes the sampled call stacks unless --stacks is given.
+PROFILE_DEFAULT_STACKS_FILE = "profile.folded"
+
 # These service instances will be injected at runtime
 _task_lifecycle_service: Optional[TaskLifecycleService] = None
 _query_engine: Optional[QueryEngine] = None
+_renderer: TaskRenderer = TaskRenderer()
+_metrics: Optional[Metrics] = None
+_views: Optional[ViewRegistry] = None
+_transfer_service: Optional[TaskTransferService] = None
+_tiers: Optional[TieredTaskManager] = None
+# The dispatcher the commands were registered with, which "profile" runs its command through.
+_dispatcher: Optional[CommandDispatcher] = None
+
+# Names under which the "summary" command expects its views in the ViewRegistry.
+STATUS_COUNTS_VIEW = "status_counts"
+RECENTLY_COMPLETED_VIEW = "recently_completed"
 
-def init_command_handlers(lifecycle_service: TaskLifecycleService, query_engine: QueryEngine):
+def init_command_handlers(lifecycle_service: TaskLifecycleService, query_engine: QueryEngine,
+                          metrics: Optional[Metrics] = None, views: Optional[ViewRegistry] = None,
+                          tiers: Optional[TieredTaskManager] = None):
     """
     Initializes the command handlers with the necessary service instances.
     This function should be called once during application startup.
+    The metrics registry, if any, is what the "stats" command reports; the view
+    registry, if any, backs the "summary" command, and a tiered store enables "archive".
     """
-    global _task_lifecycle_service, _query_engine
+    global _task_lifecycle_service, _query_engine, _metrics, _views, _transfer_service, _tiers
     _task_lifecycle_service = lifecycle_service
     _query_engine = query_engine
+    _transfer_service = TaskTransferService(lifecycle_service, query_engine)
+    _metrics = metrics
+    _views = views
+    _tiers = tiers
+
+def _register_summary_views(views: ViewRegistry) -> None:
+    # Registered on first use: building the views reads every task, which a
+    # freshly mapped snapshot would otherwise have to decode at startup.
+    if STATUS_COUNTS_VIEW not in views:
+        views.register(STATUS_COUNTS_VIEW, StatusCountsView())
+        views.register(RECENTLY_COMPLETED_VIEW, RecentlyCompletedView(capacity=5))
 
 def _check_services_initialized():
     if _task_lifecycle_service is None or _query_engine is None:
         raise RuntimeError("Command handlers not initialized. Call init_command_handlers first.")
 
-def _format_task_output(task: Task) -> str:
-    """Helper function to format a single task for display."""
-    status = "✅ Complete" if task.is_complete else "⏳ Incomplete"
-    description_line = f"  Description: {task.description}" if task.description else ""
-    return (
-        f"ID: {task.id}\n"
-        f"  Title: {task.title}\n"
-        f"{description_line}\n"
-        f"  Status: {status}\n"
-        "--------------------"
-    )
-
-def _format_tasks_list_output(tasks: List[Task]) -> str:
-    """Helper function to format a list of tasks for display."""
-    if not tasks:
-        return "No tasks found."
-    
-    formatted_tasks = [_format_task_output(task) for task in tasks]
-    return "\n".join(formatted_tasks)
+def _pop_int_option(args: List[str], option: str) -> Optional[int]:
+    """
+    Removes `option N` from args and returns N as a positive int (None if absent).
+    Raises ValueError if the value is missing or not a positive number.
+    """
+    if option not in args:
+        return None
+    position = args.index(option)
+    if position + 1 >= len(args):
+        raise ValueError(f"{option} requires a number.")
+    try:
+        value = int(args[position + 1])
+    except ValueError:
+        raise ValueError(f"{option} requires a number.")
+    if value <= 0:
+        raise ValueError(f"{option} must be a positive number.")
+    del args[position:position + 2]
+    return value
 
+def _stream_tasks(render_format: str, page_size: int = VIEW_STREAM_PAGE_SIZE) -> Iterator[str]:
+    """Yields the formatted task list one page at a time."""
+    empty = True
+    for page in _query_engine.iter_tasks(page_size=page_size):
+        empty = False
+        yield _renderer.render_list(page, render_format)
+    if empty:
+        yield _renderer.render_list([])
 
 def add_task_command(title: str, description: Optional[str] = None) -> str:
     """
@@ -54,14 +102,35 @@ def add_task_command(title: str, description: Optional[str] = None) -> str:
     except ValueError as e:
         return f"Failed to add task: {e}"
 
-def view_tasks_command() -> str:
+def view_tasks_command(*options: str) -> Union[str, Iterable[str]]:
     """
-    Views all tasks.
-    Usage: view
+    Views tasks in ID order.
+    Usage: view [--page N] [--limit N] [--compact]
+    Without options every task is streamed page by page; with --page/--limit
+    only the requested page is shown. --compact prints one line per task.
     """
     _check_services_initialized()
-    tasks = _query_engine.get_all_tasks()
-    return _format_tasks_list_output(tasks)
+    args = list(options)
+    render_format = "full"
+    if "--compact" in args:
+        args.remove("--compact")
+        render_format = "compact"
+    try:
+        page = _pop_int_option(args, "--page")
+        limit = _pop_int_option(args, "--limit")
+    except ValueError as e:
+        return f"Error: {e}"
+    if args:
+        return f"Error: Unexpected arguments for view: {' '.join(args)}"
+    if page is None and limit is None:
+        return _stream_tasks(render_format)
+
+    page = page or 1
+    limit = limit or VIEW_DEFAULT_PAGE_LIMIT
+    tasks = _query_engine.get_page(page, limit)
+    total = _query_engine.count()
+    page_count = max(1, -(-total // limit))
+    return f"{_renderer.render_list(tasks, render_format)}\nPage {page} of {page_count} ({total} tasks)."
 
 def update_task_command(task_id: str, title: Optional[str] = None, description: Optional[str] = None) -> str:
     """
@@ -115,6 +184,240 @@ def mark_task_status_command(task_id: str, status: str) -> str:
     except ValueError as e:
         return f"Failed to mark task status: {e}"
 
+def _format_bulk_result(operation: str, result: BulkResult) -> str:
+    """Helper function to summarize a bulk operation, listing each rejected item."""
+    lines = [f"Bulk {operation}: {len(result.succeeded)} succeeded, {len(result.errors)} failed."]
+    for position, message in result.errors:
+        lines.append(f"  item {position + 1}: {message}")
+    text = "\n".join(lines)
+    return PartialFailure(text) if result.errors else text
+
+def bulk_command(operation: str, *args: str) -> str:
+    """
+    Applies one operation to many tasks as a single atomic batch.
+    Usage: bulk add <title>...
+           bulk delete <task_id>...
+           bulk mark <complete|incomplete> <task_id>...
+           bulk update <task_id> <title> [<task_id> <title>...]
+    """
+    _check_services_initialized()
+    operation = operation.lower()
+    if operation == "add":
+        result = _task_lifecycle_service.create_many((title, None) for title in args)
+    elif operation == "delete":
+        result = _task_lifecycle_service.delete_many(args)
+    elif operation == "mark":
+        if not args or args[0].lower() not in ("complete", "incomplete"):
+            return "Error: Status must be 'complete' or 'incomplete'."
+        result = _task_lifecycle_service.set_completion_many(args[1:], args[0].lower() == "complete")
+    elif operation == "update":
+        if len(args) % 2:
+            return "Error: bulk update expects <task_id> <title> pairs."
+        result = _task_lifecycle_service.modify_many(
+            (args[i], args[i + 1], None) for i in range(0, len(args), 2)
+        )
+    else:
+        return f"Error: Unknown bulk operation '{operation}'. Use add, delete, mark or update."
+    if not result.succeeded and not result.errors:
+        return f"Error: bulk {operation} needs at least one item."
+    return _format_bulk_result(operation, result)
+
+def search_tasks_command(*query_terms: str) -> str:
+    """
+    Searches task titles and descriptions.
+    Usage: search <term>... [--limit N]
+    Terms are ANDed; use OR between alternatives and a trailing * for prefixes.
+    """
+    _check_services_initialized()
+    terms = list(query_terms)
+    try:
+        limit = _pop_int_option(terms, "--limit") or 10
+    except ValueError as e:
+        return f"Error: {e}"
+    if not terms:
+        return "Error: Search query cannot be empty."
+    tasks = _query_engine.search(" ".join(terms), limit)
+    return _renderer.render_list(tasks)
+
+def _pop_format_option(args: List[str], path: str) -> str:
+    """
+    Removes `--format F` from args and returns F, or the format implied by the
+    file extension. Raises ValueError if neither names a supported format.
+    """
+    transfer_format = None
+    if "--format" in args:
+        position = args.index("--format")
+        if position + 1 >= len(args):
+            raise ValueError("--format requires a value.")
+        transfer_format = args[position + 1].lower()
+        del args[position:position + 2]
+    transfer_format = transfer_format or format_for_path(path)
+    if transfer_format not in TRANSFER_FORMATS:
+        raise ValueError(f"Cannot tell the file format; use --format {'|'.join(TRANSFER_FORMATS)}.")
+    return transfer_format
+
+def _format_transfer_result(summary: str, result: TransferResult) -> str:
+    """Helper function to summarize an import or export, listing rejected rows."""
+    lines = [f"{summary} in {result.seconds:.3f}s ({result.rows_per_second:,.0f} rows/sec)."]
+    if result.rejected_count:
+        lines.append(f"Rejected {result.rejected_count} rows:")
+        for line_number, message in sorted(result.rejected):
+            lines.append(f"  line {line_number}: {message}")
+        if result.rejected_count > len(result.rejected):
+            lines.append(f"  ... and {result.rejected_count - len(result.rejected)} more.")
+    text = "\n".join(lines)
+    return PartialFailure(text) if result.rejected_count else text
+
+def export_command(path: str, *options: str) -> str:
+    """
+    Writes every task to a JSON Lines or CSV file, streaming page by page.
+    Usage: export <file> [--format jsonl|csv]
+    """
+    _check_services_initialized()
+    args = list(options)
+    try:
+        transfer_format = _pop_format_option(args, path)
+    except ValueError as e:
+        return f"Error: {e}"
+    if args:
+        return f"Error: Unexpected arguments for export: {' '.join(args)}"
+    try:
+        with open(path, "w", encoding="utf-8", newline="") as out:
+            result = _transfer_service.export_tasks(out, transfer_format)
+    except OSError as e:
+        return f"Failed to export tasks: {e}"
+    return _format_transfer_result(f"Exported {result.rows} tasks to '{path}'", result)
+
+def import_command(path: str, *options: str) -> str:
+    """
+    Adds a task for every valid row of a JSON Lines or CSV file, in chunked batches.
+    Usage: import <file> [--format jsonl|csv]
+    Rows need a title; description and is_complete are optional. IDs are reassigned.
+    """
+    _check_services_initialized()
+    args = list(options)
+    try:
+        transfer_format = _pop_format_option(args, path)
+    except ValueError as e:
+        return f"Error: {e}"
+    if args:
+        return f"Error: Unexpected arguments for import: {' '.join(args)}"
+    try:
+        with open(path, encoding="utf-8", newline="") as source:
+            result = _transfer_service.import_tasks(source, transfer_format)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return f"Failed to import tasks: {e}"
+    return _format_transfer_result(f"Imported {result.rows} tasks from '{path}'", result)
+
+def undo_command() -> str:
+    """
+    Reverts the most recent add, update, delete, mark or bulk operation.
+    Usage: undo
+    """
+    _check_services_initialized()
+    try:
+        entry = _task_lifecycle_service.undo()
+    except ValueError as e:
+        return f"Error: {e}"
+    return f"Undid {entry.describe()}."
+
+def redo_command() -> str:
+    """
+    Reapplies the most recently undone operation.
+    Usage: redo
+    """
+    _check_services_initialized()
+    try:
+        entry = _task_lifecycle_service.redo()
+    except ValueError as e:
+        return f"Error: {e}"
+    return f"Redid {entry.describe()}."
+
+def archive_command() -> str:
+    """
+    Moves tasks completed longer ago than the archive age out of the working set now.
+    Usage: archive
+    """
+    if _tiers is None:
+        return "Error: Archiving is not enabled. Start the application with --data-dir and --archive-after."
+    archived = _tiers.archive_due()
+    return (f"Archived {archived} tasks. {_tiers.archived_count} archived, "
+            f"{_tiers.hot.count_tasks()} in the working set.")
+
+def summary_command() -> str:
+    """
+    Shows task counts and the most recently completed tasks, read from materialized views.
+    Usage: summary
+    """
+    if _views is None:
+        return "Error: Summary views are not available for this store."
+    _register_summary_views(_views)
+    counts = _views.get(STATUS_COUNTS_VIEW)
+    recent = _views.get(RECENTLY_COMPLETED_VIEW).tasks()
+    # The views follow the working set's change feed, where archiving a task reads as deleting it.
+    archived = _tiers.archived_count if _tiers is not None else 0
+    archived_note = f", {archived} of them archived" if archived else ""
+    lines = [f"Tasks: {counts.total + archived} ({counts.complete + archived} complete{archived_note}, "
+             f"{counts.incomplete} incomplete)."]
+    if recent:
+        lines.append("Recently completed:")
+        lines.extend(_renderer.render(task, "compact") for task in recent)
+    return "\n".join(lines)
+
+def stats_command(*options: str) -> str:
+    """
+    Shows call counts, errors and latency percentiles per command and service operation.
+    Usage: stats [--json] [--reset]
+    """
+    if _metrics is None:
+        return "Error: Metrics are not enabled. Start the application with --metrics."
+    args = list(options)
+    as_json = "--json" in args
+    reset = "--reset" in args
+    unexpected = [arg for arg in args if arg not in ("--json", "--reset")]
+    if unexpected:
+        return f"Error: Unexpected arguments for stats: {' '.join(unexpected)}"
+    if as_json:
+        output = _metrics.to_json()
+    else:
+        output = f"{_metrics.report()}\n{_query_engine.cache_info().describe()}"
+        journal_info = _task_lifecycle_service.journal_info()
+        if journal_info is not None:
+            output += f"\n{journal_info.describe()}"
+    if reset:
+        _metrics.reset()
+        _query_engine.clear_cache()
+    return output
+
+def profile_command(*command: str) -> str:
+    """
+    Runs one command under cProfile, tracemalloc and a stack sampler, then shows its
+    output followed by the hotspot and allocation tables.
+    Usage: profile [--stacks FILE] <command> [args...]
+    The sampled stacks are written to FILE in collapsed-stack (flame graph) format.
+    """
+    if _dispatcher is None:
+        raise RuntimeError("Commands not registered. Call register_commands first.")
+    args = list(command)
+    stacks_path = PROFILE_DEFAULT_STACKS_FILE
+    if args[:1] == ["--stacks"]:
+        if len(args) < 2:
+            return "Error: --stacks requires a value."
+        stacks_path = args[1]
+        del args[:2]
+    if not args:
+        return "Error: Usage: profile [--stacks FILE] <command> [args...]"
+    try:
+        with Profiler(args[0]) as profiler:
+            output = _dispatcher.dispatch(shlex.join(args))
+    except ValueError as e:
+        return f"Error: {e}"
+    try:
+        profiler.report.write_folded(stacks_path)
+    except OSError as e:
+        return f"{output}\n{profiler.report.format()}\nFailed to write stack samples: {e}"
+    return f"{output}\n{profiler.report.format()}\nStack samples written to '{stacks_path}'."
+
 def help_command() -> str:
     """
     Displays available commands and their usage.
@@ -122,10 +425,55 @@ def help_command() -> str:
     """
     help_text = "Available commands:\n"
     help_text += "  add <title> [description] - Adds a new task.\n"
-    help_text += "  view - Views all tasks.\n"
+    help_text += "  view [--page N] [--limit N] [--compact] - Views all tasks, or one page of them.\n"
     help_text += "  update <task_id> [title] [description] - Updates an existing task's title or description.\n"
     help_text += "  delete <task_id> - Deletes a task by ID.\n"
     help_text += "  mark <task_id> <complete|incomplete> - Marks a task as complete or incomplete.\n"
+    help_text += "  bulk add <title>... | bulk delete <task_id>... - Adds or deletes many tasks at once.\n"
+    help_text += "  bulk mark <complete|incomplete> <task_id>... - Marks many tasks at once.\n"
+    help_text += "  bulk update <task_id> <title> [<task_id> <title>...] - Retitles many tasks at once.\n"
+    help_text += "  search <term>... [--limit N] - Searches titles and descriptions (AND, OR, prefix*).\n"
+    if _dispatcher is None or "export" in _dispatcher:
+        help_text += "  export <file> [--format jsonl|csv] - Writes all tasks to a JSON Lines or CSV file.\n"
+        help_text += "  import <file> [--format jsonl|csv] - Adds tasks from a JSON Lines or CSV file.\n"
+    help_text += "  undo / redo - Reverts the last operation (a bulk operation or import is one) or reapplies it.\n"
+    help_text += "  archive - Archives tasks completed longer ago than --archive-after now.\n"
+    help_text += "  summary - Shows task counts and recently completed tasks.\n"
+    help_text += "  stats [--json] [--reset] - Shows per-command call counts and latency percentiles.\n"
+    if _dispatcher is None or "profile" in _dispatcher:
+        help_text += "  profile [--stacks FILE] <command> [args...] - Profiles one command's time and memory.\n"
     help_text += "  help - Displays this help message.\n"
     help_text += "  exit - Exits the application.\n"
+    help_text += "Aliases: ls = view, rm = delete, ? = help.\n"
     return help_text
+
+def register_commands(dispatcher: CommandDispatcher, local: bool = True) -> None:
+    """
+    Registers every command handler in this module with the dispatcher.
+    Commands that read or write files on this machine (export, import, profile) are only
+    registered for a local dispatcher; pass local=False for one that serves
+    remote clients, which must not reach the server's filesystem.
+    """
+    global _dispatcher
+    _dispatcher = dispatcher
+    dispatcher.register_command("add", add_task_command)
+    dispatcher.register_command("view", view_tasks_command)
+    dispatcher.register_command("update", update_task_command)
+    dispatcher.register_command("delete", delete_task_command)
+    dispatcher.register_command("mark", mark_task_status_command)
+    dispatcher.register_command("bulk", bulk_command)
+    dispatcher.register_command("search", search_tasks_command)
+    if local:
+        dispatcher.register_command("export", export_command)
+        dispatcher.register_command("import", import_command)
+    dispatcher.register_command("undo", undo_command)
+    dispatcher.register_command("redo", redo_command)
+    dispatcher.register_command("archive", archive_command)
+    dispatcher.register_command("summary", summary_command)
+    dispatcher.register_command("stats", stats_command)
+    if local:
+        dispatcher.register_command("profile", profile_command)
+    dispatcher.register_command("help", help_command)
+    dispatcher.register_alias("ls", "view")
+    dispatcher.register_alias("rm", "delete")
+    dispatcher.register_alias("?", "help")
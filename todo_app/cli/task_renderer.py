@@ -0,0 +1,56 @@
+from typing import Callable, Dict, Iterable
+from todo_app.domain.task import Task
+
+RENDER_FORMATS = ("full", "compact")
+
+class TaskRenderer:
+    """
+    Formats tasks for display, for the interactive menu and the command handlers alike.
+
+    Text is formatted on every call and nothing is cached: formatting a task
+    is a single f-string, cheaper than looking up and validating a cached
+    copy, and a per-task cache would keep every listed Task alive. Repeated
+    listings of an unchanged store are served from QueryEngine's result
+    cache instead.
+    """
+    @staticmethod
+    def _format_full(task: Task) -> str:
+        status = "✅ Complete" if task.is_complete else "⏳ Incomplete"
+        description_line = f"  Description: {task.description}" if task.description else ""
+        return (
+            f"ID: {task.id}\n"
+            f"  Title: {task.title}\n"
+            f"{description_line}\n"
+            f"  Status: {status}\n"
+            "--------------------"
+        )
+
+    @staticmethod
+    def _format_compact(task: Task) -> str:
+        mark = "x" if task.is_complete else " "
+        description = f" — {task.description}" if task.description else ""
+        return f"{task.id:>6} [{mark}] {task.title}{description}"
+
+    _FORMATTERS: Dict[str, Callable[[Task], str]] = {
+        "full": _format_full.__func__,
+        "compact": _format_compact.__func__,
+    }
+
+    def _formatter(self, render_format: str) -> Callable[[Task], str]:
+        formatter = self._FORMATTERS.get(render_format)
+        if formatter is None:
+            raise ValueError(f"Unknown render format '{render_format}'. Choose one of: {', '.join(RENDER_FORMATS)}.")
+        return formatter
+
+    def render(self, task: Task, render_format: str = "full") -> str:
+        """
+        Returns the display text for one task.
+        """
+        return self._formatter(render_format)(task)
+
+    def render_list(self, tasks: Iterable[Task], render_format: str = "full") -> str:
+        """
+        Formats a list of tasks, one block (or line, in compact format) per task.
+        """
+        rendered = "\n".join(map(self._formatter(render_format), tasks))
+        return rendered or "No tasks found."
@@ -0,0 +1,163 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+from todo_app.cli.command_dispatcher import CommandDispatcher, is_error_message
+
+# Response framing. Every request line gets exactly one response:
+#   OK | ERR          status line
+#   <payload lines>   lines starting with "." are sent with an extra leading "."
+#   .                 terminator
+STATUS_OK = b"OK\n"
+STATUS_ERROR = b"ERR\n"
+TERMINATOR = b".\n"
+CLOSING_COMMANDS = ("exit", "quit")
+
+def raise_open_file_limit() -> None:
+    """
+    Raises the soft open-file limit to the hard limit so a single process can hold
+    thousands of sockets. Silently does nothing where the platform does not allow it.
+    """
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+def encode_payload(chunk: str) -> bytes:
+    """
+    Dot-stuffs a chunk of output so no payload line can be mistaken for the terminator.
+    """
+    lines = chunk.split("\n")
+    return b"".join(("." + line if line.startswith(".") else line).encode("utf-8") + b"\n" for line in lines)
+
+class TaskServer:
+    """
+    Serves CommandDispatcher over TCP or a Unix socket using a line protocol.
+
+    Each connection sends one command per line, exactly as typed at the CLI, and
+    may pipeline many commands without waiting for replies; responses come back
+    in request order. Commands run on the event loop thread, so the store needs
+    no locking; with `worker_threads` they run on a pool of that many threads
+    instead, so one slow command does not stall other connections, and the
+    dispatcher must then be built over a ConcurrentTaskManager.
+
+    Backpressure: a response is written chunk by chunk as the handler yields
+    it (e.g. one page of a long listing at a time), draining the transport
+    below the write high-water mark between chunks, and a connection's next
+    command is not read until its previous response has been handed over. A
+    client that stops reading therefore stops being served, and a huge reply
+    never has to be held in server memory at once.
+    """
+    def __init__(self, dispatcher: CommandDispatcher, max_connections: int = 10_000,
+                 max_line_bytes: int = 64 * 1024, write_high_water: int = 256 * 1024,
+                 fairness_interval: int = 32, worker_threads: int = 0):
+        if max_connections <= 0:
+            raise ValueError("Maximum number of connections must be positive.")
+        if worker_threads < 0:
+            raise ValueError("Number of worker threads must not be negative.")
+        self._dispatcher = dispatcher
+        self._max_connections = max_connections
+        self._max_line_bytes = max_line_bytes
+        self._write_high_water = write_high_water
+        self._fairness_interval = fairness_interval
+        self._active_connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor = ThreadPoolExecutor(worker_threads, "task-server") if worker_threads else None
+
+    @property
+    def active_connections(self) -> int:
+        return self._active_connections
+
+    async def start_tcp(self, host: str, port: int) -> asyncio.AbstractServer:
+        raise_open_file_limit()
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=self._max_line_bytes, backlog=4096)
+        return self._server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        raise_open_file_limit()
+        self._server = await asyncio.start_unix_server(self._handle_connection, path,
+                                                       limit=self._max_line_bytes, backlog=4096)
+        return self._server
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise RuntimeError("Server not started. Call start_tcp or start_unix first.")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+
+    async def _next_chunk(self, stream: Iterator[str]) -> Optional[str]:
+        """
+        Advances the command's output stream, on a worker thread if there are any. None marks its end.
+        """
+        if self._executor is None:
+            return next(stream, None)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, next, stream, None)
+
+    async def _respond(self, writer: asyncio.StreamWriter, command_line: str) -> None:
+        """
+        Runs one command and writes its framed response, one chunk at a time.
+        A chunk is written once the handler has produced the next one (or
+        finished), so the status line goes out with the first chunk and the
+        terminator with the last, and a single-chunk reply is one write.
+        """
+        stream = self._dispatcher.dispatch_stream(command_line)
+        chunk = await self._next_chunk(stream)
+        if chunk is None:
+            writer.write(STATUS_OK + TERMINATOR)
+            return
+        pending = (STATUS_ERROR if is_error_message(chunk) else STATUS_OK) + encode_payload(chunk)
+        while True:
+            chunk = await self._next_chunk(stream)
+            if chunk is None:
+                writer.write(pending + TERMINATOR)
+                return
+            writer.write(pending)
+            # drain() only waits when the client is not keeping up with the reply.
+            await writer.drain()
+            pending = encode_payload(chunk)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self._active_connections >= self._max_connections:
+            writer.write(STATUS_ERROR + encode_payload("Error: Server is at its connection limit.") + TERMINATOR)
+            writer.close()
+            return
+        self._active_connections += 1
+        writer.transport.set_write_buffer_limits(high=self._write_high_water)
+        handled = 0
+        try:
+            while True:
+                try:
+                    raw_line = await reader.readline()
+                except ValueError:
+                    writer.write(STATUS_ERROR + encode_payload("Error: Command line too long.") + TERMINATOR)
+                    break
+                if not raw_line:
+                    break
+                command_line = raw_line.decode("utf-8", errors="replace").strip()
+                if command_line.lower() in CLOSING_COMMANDS:
+                    writer.write(STATUS_OK + encode_payload("Goodbye!") + TERMINATOR)
+                    break
+                await self._respond(writer, command_line)
+                handled += 1
+                # drain() only waits when the client is not keeping up with its replies.
+                await writer.drain()
+                if handled % self._fairness_interval == 0:
+                    # Let other connections run between long pipelined bursts.
+                    await asyncio.sleep(0)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._active_connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
@@ -0,0 +1,206 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set
+from todo_app.domain.task import Task
+from todo_app.state_management.change_feed import ChangeEvent, ChangeFeedGapError
+from todo_app.state_management.task_indexes import id_sort_key
+from todo_app.state_management.task_manager import TaskManager
+
+class MaterializedView(ABC):
+    """
+    Base class for derived data kept current from the task change feed.
+
+    Subclasses implement apply (one event, O(1)) and rebuild (from a full list
+    of tasks). `sequence` is the last change feed sequence number reflected in
+    the view; saving it alongside the view's state lets the view catch up from
+    there later instead of rebuilding.
+    """
+    def __init__(self):
+        self.sequence = 0
+
+    @abstractmethod
+    def apply(self, event: ChangeEvent) -> None:
+        """
+        Updates the view for one change event.
+        """
+
+    @abstractmethod
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """
+        Recomputes the view from scratch over every task.
+        """
+
+class StatusCountsView(MaterializedView):
+    """
+    Total, complete and incomplete task counts.
+    """
+    def __init__(self):
+        super().__init__()
+        self.complete = 0
+        self.incomplete = 0
+
+    @property
+    def total(self) -> int:
+        return self.complete + self.incomplete
+
+    def _count(self, task: Optional[Task], delta: int) -> None:
+        if task is None:
+            return
+        if task.is_complete:
+            self.complete += delta
+        else:
+            self.incomplete += delta
+
+    def apply(self, event: ChangeEvent) -> None:
+        self._count(event.before, -1)
+        self._count(event.after, 1)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        self.complete = self.incomplete = 0
+        for task in tasks:
+            self._count(task, 1)
+
+class RecentlyCompletedView(MaterializedView):
+    """
+    The `capacity` tasks completed most recently, newest first. A task leaves
+    the view when it is deleted or marked incomplete, and is refreshed when edited.
+
+    Completion times are not stored, so after a rebuild the view holds the
+    completed tasks with the highest IDs instead.
+    """
+    def __init__(self, capacity: int = 10):
+        super().__init__()
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self._capacity = capacity
+        # Ordered oldest to newest; may hold more than `capacity` entries so tasks
+        # leaving the view can be backfilled without a scan.
+        self._tasks: "OrderedDict[str, Task]" = OrderedDict()
+        self._limit = 4 * capacity
+
+    def tasks(self) -> List[Task]:
+        return list(islice(reversed(self._tasks.values()), self._capacity))
+
+    def apply(self, event: ChangeEvent) -> None:
+        before, after = event.before, event.after
+        was_complete = before is not None and before.is_complete
+        is_complete = after is not None and after.is_complete
+        if is_complete and not was_complete:
+            self._tasks[after.id] = after
+            self._tasks.move_to_end(after.id)
+            if len(self._tasks) > self._limit:
+                self._tasks.popitem(last=False)
+        elif was_complete and not is_complete:
+            self._tasks.pop(before.id, None)
+        elif is_complete and after.id in self._tasks:
+            self._tasks[after.id] = after
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        completed = sorted((task for task in tasks if task.is_complete), key=lambda task: id_sort_key(task.id))
+        self._tasks = OrderedDict((task.id, task) for task in completed[-self._limit:])
+
+class ViewRegistry:
+    """
+    Keeps registered materialized views current from a TaskManager's change feed.
+
+    A view is brought up to date when registered: from `from_sequence` through
+    the feed's retained events if possible, otherwise by a rebuild from a store
+    snapshot. After that each change costs every view one O(1) apply, and
+    reading a view never touches the store. A view whose apply raises is
+    rebuilt on its next read (see get).
+    """
+    def __init__(self, task_manager: TaskManager):
+        self._task_manager = task_manager
+        self._feed = task_manager.change_feed
+        self._views: Dict[str, MaterializedView] = {}
+        self._stale: Dict[str, bool] = {}
+        # Names of views being registered, reserved until they are installed.
+        self._reserved: Set[str] = set()
+        self._lock = threading.RLock()
+        self._feed.subscribe(self._on_event)
+
+    def register(self, name: str, view: MaterializedView, from_sequence: Optional[int] = None) -> MaterializedView:
+        """
+        Adds a view under `name` and brings it up to date. With `from_sequence`
+        the view is assumed to already reflect every change up to that sequence number.
+        """
+        with self._lock:
+            # The name is reserved in the same critical section as the check, since
+            # the rebuild below runs without the lock and another register may race it.
+            if name in self._views or name in self._reserved:
+                raise ValueError(f"A view named '{name}' is already registered.")
+            self._reserved.add(name)
+        try:
+            if from_sequence is None:
+                self._rebuild(view)
+            else:
+                view.sequence = from_sequence
+            self._catch_up(name, view)
+        finally:
+            with self._lock:
+                self._reserved.discard(name)
+        return view
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._views
+
+    def get(self, name: str) -> MaterializedView:
+        """
+        Returns a registered view, rebuilding it first if an earlier update failed.
+        """
+        with self._lock:
+            view = self._views.get(name)
+            if view is None:
+                raise ValueError(f"No view named '{name}' is registered.")
+            if not self._stale[name]:
+                return view
+        self._rebuild(view)
+        self._catch_up(name, view)
+        return view
+
+    def close(self) -> None:
+        """
+        Stops following the change feed.
+        """
+        self._feed.unsubscribe(self._on_event)
+
+    def _rebuild(self, view: MaterializedView) -> None:
+        # Never called with self._lock held: a snapshot may wait for a writer,
+        # and writers wait for self._lock to deliver events.
+        snapshot = self._task_manager.snapshot()
+        view.rebuild(snapshot.get_all_tasks())
+        view.sequence = snapshot.version
+
+    def _catch_up(self, name: str, view: MaterializedView) -> None:
+        """
+        Applies the retained events the view has not seen and (re)enables live
+        updates for it, rebuilding first if some of those events were dropped.
+        """
+        while True:
+            with self._lock:
+                try:
+                    events = self._feed.events_since(view.sequence)
+                except ChangeFeedGapError:
+                    events = None
+                if events is not None:
+                    for event in events:
+                        view.apply(event)
+                        view.sequence = event.sequence
+                    self._views[name] = view
+                    self._stale[name] = False
+                    return
+            self._rebuild(view)
+
+    def _on_event(self, event: ChangeEvent) -> None:
+        with self._lock:
+            for name, view in self._views.items():
+                if self._stale[name] or event.sequence <= view.sequence:
+                    continue
+                try:
+                    view.apply(event)
+                    view.sequence = event.sequence
+                except Exception:
+                    self._stale[name] = True
@@ -1,16 +1,171 @@
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from todo_app.domain.task import Task
 from todo_app.state_management.task_manager import TaskManager
+from todo_app.state_management.task_snapshot import TaskSnapshot
+
+DEFAULT_CACHE_SIZE = 128
+
+_MISSING = object()
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+
+    def describe(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"Query cache: {self.hits} hits, {self.misses} misses ({hit_rate:.0%} hit rate), "
+                f"{self.evictions} evictions, {self.size}/{self.capacity} entries.")
 
 class QueryEngine:
     """
     Provides read-only access to task data.
+
+    Results of get_all_tasks, get_page, filter, top_k and search are kept in an
+    LRU cache of `cache_size` entries keyed by the query parameters. The whole
+    cache belongs to one store version: the first query after a mutation finds
+    task_manager.version changed and starts over, so a cached result is never
+    stale. Results are returned as tuples, so a result shared between callers
+    through the cache cannot be modified by any of them. A cache_size of 0
+    disables caching.
     """
-    def __init__(self, task_manager: TaskManager):
+    def __init__(self, task_manager: TaskManager, cache_size: int = DEFAULT_CACHE_SIZE):
+        if cache_size < 0:
+            raise ValueError("Cache size must not be negative.")
         self._task_manager = task_manager
+        self._cache_capacity = cache_size
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._cache_version = -1
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _cached(self, key: Hashable, compute: Callable[[], Iterable[Task]]) -> Tuple[Task, ...]:
+        """
+        Returns the cached result for `key` at the current store version, computing it on a miss.
+        """
+        if not self._cache_capacity:
+            return tuple(compute())
+        version = self._task_manager.version
+        cache = self._cache
+        with self._cache_lock:
+            if version != self._cache_version:
+                cache.clear()
+                self._cache_version = version
+            else:
+                result = cache.get(key, _MISSING)
+                if result is not _MISSING:
+                    cache.move_to_end(key)
+                    self._hits += 1
+                    return result
+            self._misses += 1
+        result = tuple(compute())
+        with self._cache_lock:
+            # A write during compute() started a new version; its cache must not get this result.
+            if self._cache_version == version:
+                cache[key] = result
+                if len(cache) > self._cache_capacity:
+                    cache.popitem(last=False)
+                    self._evictions += 1
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns the cache's hit, miss and eviction counters and its current size.
+        """
+        with self._cache_lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, len(self._cache), self._cache_capacity)
+
+    def clear_cache(self) -> None:
+        """
+        Empties the cache and zeroes its counters.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = 0
 
-    def get_all_tasks(self) -> List[Task]:
+    def get_all_tasks(self) -> Tuple[Task, ...]:
         """
         Retrieves all tasks from the TaskManager.
         """
-        return self._task_manager.get_all_tasks()
+        return self._cached(("all",), self._task_manager.get_all_tasks)
+
+    def snapshot(self) -> TaskSnapshot:
+        """
+        Returns an immutable point-in-time view of all tasks, for readers that need
+        several consistent reads or a long scan that must not see concurrent writes.
+        """
+        return self._task_manager.snapshot()
+
+    def iter_tasks(self, after_id: Optional[str] = None, page_size: int = 100) -> Iterator[List[Task]]:
+        """
+        Yields tasks in ID order, one page at a time, starting after the `after_id` cursor.
+        Each page is fetched with its own index seek, so memory and time-to-first-page
+        stay constant however many tasks the store holds.
+        """
+        if page_size <= 0:
+            raise ValueError("Page size must be a positive number.")
+        cursor = after_id
+        while True:
+            page = self._task_manager.find_tasks(order_by="id", limit=page_size, after_id=cursor)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            cursor = page[-1].id
+
+    def get_page(self, page: int, page_size: int) -> Tuple[Task, ...]:
+        """
+        Retrieves the 1-based `page` of tasks in ID order.
+        """
+        if page <= 0 or page_size <= 0:
+            raise ValueError("Page number and page size must be positive numbers.")
+        return self._cached(
+            ("page", page, page_size),
+            lambda: self._task_manager.find_tasks(order_by="id", limit=page_size, offset=(page - 1) * page_size),
+        )
+
+    def filter(self, is_complete: Optional[bool] = None, limit: Optional[int] = None,
+               contains: Optional[str] = None) -> Tuple[Task, ...]:
+        """
+        Retrieves tasks with the given completion status in ID order, using the status index.
+        With `contains`, only tasks whose title or description contains that text
+        (case-insensitively) are returned; that requires scanning the tasks.
+        """
+        if contains is not None:
+            return self._cached(("scan", contains, is_complete, limit),
+                                lambda: self._task_manager.scan_tasks(contains, is_complete, limit))
+        return self._cached(("find", "id", is_complete, limit),
+                            lambda: self._task_manager.find_tasks(is_complete=is_complete, order_by="id", limit=limit))
+
+    def count(self, is_complete: Optional[bool] = None) -> int:
+        """
+        Counts tasks, optionally only those with the given completion status. O(1).
+        """
+        return self._task_manager.count_tasks(is_complete)
+
+    def top_k(self, order_by: str = "id", limit: int = 10, is_complete: Optional[bool] = None) -> Tuple[Task, ...]:
+        """
+        Retrieves the first `limit` tasks ordered by "id" or "title", read straight
+        from the ordered index instead of sorting the whole store.
+        """
+        return self._cached(
+            ("find", order_by, is_complete, limit),
+            lambda: self._task_manager.find_tasks(is_complete=is_complete, order_by=order_by, limit=limit),
+        )
+
+    def search(self, query: str, limit: int = 10) -> Tuple[Task, ...]:
+        """
+        Retrieves up to `limit` tasks whose title or description matches the query,
+        most relevant first. Terms are ANDed; "OR" separates alternatives and a
+        trailing "*" matches a prefix.
+        """
+        return self._cached(("search", query, limit),
+                            lambda: (task for _, task in self._task_manager.search_tasks(query, limit)))
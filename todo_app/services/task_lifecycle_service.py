@@ -1,16 +1,45 @@
-from typing import Optional
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
+from typing import ContextManager, Iterable, List, Optional, Set, Tuple, Union
 from todo_app.domain.task import Task
+from todo_app.services.undo_journal import TASK_ADDED, TASK_DELETED, JournalEntry, JournalInfo, UndoJournal
 from todo_app.state_management.task_manager import TaskManager
-from todo_app.utils.id_generator import SequentialIDGenerator
+from todo_app.utils.id_generator import BlockIDGenerator, SequentialIDGenerator
 from todo_app.utils.input_validator import InputValidator
+from todo_app.utils.metrics import Metrics
+
+# Public operations that are counted and timed when the service is given a Metrics registry.
+INSTRUMENTED_OPERATIONS = (
+    "create_new_task", "modify_task", "remove_task", "set_task_completion_status",
+    "create_many", "delete_many", "set_completion_many", "modify_many", "undo", "redo",
+)
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk operation: the tasks (or IDs, for deletions) that were applied,
+    and an error message for every rejected item keyed by its position in the input.
+    """
+    succeeded: List = field(default_factory=list)
+    errors: List[Tuple[int, str]] = field(default_factory=list)
 
 class TaskLifecycleService:
     """
     Encapsulates the business rules for task operations (add, update, delete, mark complete/incomplete).
+    Given an UndoJournal, every operation is journaled (a bulk operation as one entry) and can be undone.
+
+    Every operation reads, validates, applies and journals while holding the
+    task locks of the tasks it touches (bulk operations take all of them up
+    front), so concurrent operations on a task cannot overwrite each other and
+    the journal records them in the order they were committed.
     """
-    def __init__(self, task_manager: TaskManager, id_generator: SequentialIDGenerator):
+    def __init__(self, task_manager: TaskManager, id_generator: Union[SequentialIDGenerator, BlockIDGenerator],
+                 metrics: Optional[Metrics] = None, journal: Optional[UndoJournal] = None):
         self._task_manager = task_manager
         self._id_generator = id_generator
+        self._journal = journal
+        if metrics is not None:
+            metrics.instrument(self, INSTRUMENTED_OPERATIONS, prefix="lifecycle.")
 
     def create_new_task(self, title: str, description: Optional[str]) -> Task:
         """
@@ -19,56 +48,257 @@ class TaskLifecycleService:
         InputValidator.is_not_empty(title, "Task title")
         task_id = self._id_generator.generate_id()
         new_task = Task(id=task_id, title=title, description=description, is_complete=False)
-        self._task_manager.add_task(new_task)
+        with self._task_manager.task_lock(task_id):
+            self._task_manager.add_task(new_task)
+            if self._journal is not None:
+                self._journal.record("add", [(None, new_task)])
         return new_task
 
     def modify_task(self, task_id: str, new_title: Optional[str], new_description: Optional[str]) -> Task:
         """
         Updates task details.
         """
-        existing_task = self._task_manager.get_task(task_id)
-        if not existing_task:
-            raise ValueError(f"Task with ID '{task_id}' not found.")
+        with self._task_manager.task_lock(task_id):
+            existing_task = self._task_manager.get_task(task_id)
+            if not existing_task:
+                raise ValueError(f"Task with ID '{task_id}' not found.")
 
-        updated_title = new_title if new_title is not None else existing_task.title
-        updated_description = new_description if new_description is not None else existing_task.description
+            updated_title = new_title if new_title is not None else existing_task.title
+            updated_description = new_description if new_description is not None else existing_task.description
         
-        # Ensure at least one field is being updated
-        if updated_title == existing_task.title and updated_description == existing_task.description:
-            raise ValueError("No changes detected. Title and description are the same as current values.")
-
-        updated_task = Task(
-            id=existing_task.id,
-            title=updated_title,
-            description=updated_description,
-            is_complete=existing_task.is_complete
-        )
-        self._task_manager.update_task(updated_task)
+            # Ensure at least one field is being updated
+            if updated_title == existing_task.title and updated_description == existing_task.description:
+                raise ValueError("No changes detected. Title and description are the same as current values.")
+
+            updated_task = Task(
+                id=existing_task.id,
+                title=updated_title,
+                description=updated_description,
+                is_complete=existing_task.is_complete
+            )
+            self._task_manager.update_task(updated_task)
+            if self._journal is not None:
+                self._journal.record("update", [(existing_task, updated_task)])
         return updated_task
 
     def remove_task(self, task_id: str) -> None:
         """
         Deletes a task.
         """
-        self._task_manager.delete_task(task_id)
+        if self._journal is None:
+            self._task_manager.delete_task(task_id)
+            return
+        with self._task_manager.task_lock(task_id):
+            removed_task = self._task_manager.get_task(task_id)
+            self._task_manager.delete_task(task_id)
+            self._journal.record("delete", [(removed_task, None)])
 
     def set_task_completion_status(self, task_id: str, is_complete: bool) -> Task:
         """
         Marks task as complete/incomplete.
         """
-        existing_task = self._task_manager.get_task(task_id)
-        if not existing_task:
-            raise ValueError(f"Task with ID '{task_id}' not found.")
+        with self._task_manager.task_lock(task_id):
+            existing_task = self._task_manager.get_task(task_id)
+            if not existing_task:
+                raise ValueError(f"Task with ID '{task_id}' not found.")
         
-        if existing_task.is_complete == is_complete:
-            status_str = "completed" if is_complete else "incomplete"
-            raise ValueError(f"Task with ID '{task_id}' is already {status_str}.")
-
-        updated_task = Task(
-            id=existing_task.id,
-            title=existing_task.title,
-            description=existing_task.description,
-            is_complete=is_complete
-        )
-        self._task_manager.update_task(updated_task)
+            if existing_task.is_complete == is_complete:
+                status_str = "completed" if is_complete else "incomplete"
+                raise ValueError(f"Task with ID '{task_id}' is already {status_str}.")
+
+            updated_task = Task(
+                id=existing_task.id,
+                title=existing_task.title,
+                description=existing_task.description,
+                is_complete=is_complete
+            )
+            self._task_manager.update_task(updated_task)
+            if self._journal is not None:
+                self._journal.record("mark", [(existing_task, updated_task)])
         return updated_task
+
+    def create_many(self, items: Iterable[Union[Tuple[str, Optional[str]], Tuple[str, Optional[str], bool]]]
+                    ) -> BulkResult:
+        """
+        Creates many tasks from (title, description) pairs in one atomic batch.
+        An item may carry a third element, is_complete (e.g. when importing);
+        otherwise new tasks are incomplete.
+        Invalid items are reported and skipped; IDs are reserved as one block.
+        """
+        result = BulkResult()
+        valid: List[Tuple[str, Optional[str], bool]] = []
+        for position, (title, description, *status) in enumerate(items):
+            try:
+                InputValidator.is_not_empty(title, "Task title")
+            except ValueError as e:
+                result.errors.append((position, str(e)))
+                continue
+            valid.append((title, description, bool(status and status[0])))
+
+        task_ids = self._id_generator.reserve_ids(len(valid))
+        new_tasks = [Task(id=task_id, title=title, description=description, is_complete=is_complete)
+                     for task_id, (title, description, is_complete) in zip(task_ids, valid)]
+        with self._task_manager.task_locks(task_ids):
+            self._task_manager.apply_batch(added=new_tasks)
+            if self._journal is not None:
+                self._journal.record("bulk add", [(None, task) for task in new_tasks])
+        result.succeeded = new_tasks
+        return result
+
+    def delete_many(self, task_ids: Iterable[str]) -> BulkResult:
+        """
+        Deletes many tasks in one atomic batch. Unknown or repeated IDs are reported and skipped.
+        """
+        task_ids = list(task_ids)
+        with self._task_manager.task_locks(task_ids):
+            result = BulkResult()
+            valid: List[str] = []
+            seen: Set[str] = set()
+            for position, task_id in enumerate(task_ids):
+                error = self._check_batch_target(task_id, seen)
+                if error:
+                    result.errors.append((position, error))
+                    continue
+                valid.append(task_id)
+            removed = [self._task_manager.get_task(task_id) for task_id in valid] if self._journal is not None else []
+            self._task_manager.apply_batch(deleted=valid)
+            if self._journal is not None:
+                self._journal.record("bulk delete", [(task, None) for task in removed])
+        result.succeeded = valid
+        return result
+
+    def set_completion_many(self, task_ids: Iterable[str], is_complete: bool) -> BulkResult:
+        """
+        Marks many tasks complete/incomplete in one atomic batch. Unknown IDs and
+        tasks already in the requested state are reported and skipped.
+        """
+        task_ids = list(task_ids)
+        with self._task_manager.task_locks(task_ids):
+            result = BulkResult()
+            previous: List[Task] = []
+            updated: List[Task] = []
+            seen: Set[str] = set()
+            for position, task_id in enumerate(task_ids):
+                error = self._check_batch_target(task_id, seen)
+                existing_task = None if error else self._task_manager.get_task(task_id)
+                if existing_task is not None and existing_task.is_complete == is_complete:
+                    status_str = "completed" if is_complete else "incomplete"
+                    error = f"Task with ID '{task_id}' is already {status_str}."
+                if error:
+                    result.errors.append((position, error))
+                    continue
+                previous.append(existing_task)
+                updated.append(replace(existing_task, is_complete=is_complete))
+            self._task_manager.apply_batch(updated=updated)
+            if self._journal is not None:
+                self._journal.record("bulk mark", zip(previous, updated))
+        result.succeeded = updated
+        return result
+
+    def modify_many(self, changes: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> BulkResult:
+        """
+        Applies many (task_id, new_title, new_description) changes in one atomic batch.
+        None leaves a field unchanged; items that change nothing are reported and skipped.
+        """
+        changes = list(changes)
+        with self._task_manager.task_locks(task_id for task_id, _, _ in changes):
+            result = BulkResult()
+            previous: List[Task] = []
+            updated: List[Task] = []
+            seen: Set[str] = set()
+            for position, (task_id, new_title, new_description) in enumerate(changes):
+                error = self._check_batch_target(task_id, seen)
+                if error:
+                    result.errors.append((position, error))
+                    continue
+                existing_task = self._task_manager.get_task(task_id)
+                updated_title = new_title if new_title is not None else existing_task.title
+                updated_description = new_description if new_description is not None else existing_task.description
+                if updated_title == existing_task.title and updated_description == existing_task.description:
+                    result.errors.append((position, f"No changes detected for task with ID '{task_id}'."))
+                    continue
+                previous.append(existing_task)
+                updated.append(replace(existing_task, title=updated_title, description=updated_description))
+            self._task_manager.apply_batch(updated=updated)
+            if self._journal is not None:
+                self._journal.record("bulk update", zip(previous, updated))
+        result.succeeded = updated
+        return result
+
+    def undo(self) -> JournalEntry:
+        """
+        Reverts the most recent journaled operation as one atomic batch and returns it.
+        Raises ValueError if undo is disabled, nothing is left to undo, or its tasks have changed since.
+        """
+        if self._journal is None:
+            raise ValueError("Undo history is disabled.")
+        return self._journal.undo(self._apply_journal_entry, self._entry_locks)
+
+    def redo(self) -> JournalEntry:
+        """
+        Reapplies the most recently undone operation as one atomic batch and returns it.
+        Raises ValueError if undo is disabled, nothing is left to redo, or its tasks have changed since.
+        """
+        if self._journal is None:
+            raise ValueError("Undo history is disabled.")
+        return self._journal.redo(self._apply_journal_entry, self._entry_locks)
+
+    def journal_group(self, operation: str) -> ContextManager:
+        """
+        Within the returned context, every operation this thread performs is journaled
+        as a single entry named `operation` (see UndoJournal.group).
+        """
+        return self._journal.group(operation) if self._journal is not None else nullcontext()
+
+    def journal_info(self) -> Optional[JournalInfo]:
+        return self._journal.info() if self._journal is not None else None
+
+    def _entry_locks(self, entry: JournalEntry) -> ContextManager:
+        return self._task_manager.task_locks(delta[0] for delta in entry.deltas)
+
+    def _apply_journal_entry(self, entry: JournalEntry, undo: bool) -> None:
+        """
+        Moves every task in the entry from its new values back to the old ones (or the
+        reverse to redo), after checking that each task still holds the values expected.
+        """
+        current_offset, target_offset = (2, 1) if undo else (1, 2)
+        added: List[Task] = []
+        updated: List[Task] = []
+        deleted: List[str] = []
+        for delta in entry.deltas:
+            task_id, field_name = delta[0], delta[1]
+            current = self._task_manager.get_task(task_id)
+            if field_name in (TASK_ADDED, TASK_DELETED):
+                if current != delta[1 + current_offset]:
+                    raise ValueError(self._journal_conflict(entry, undo, task_id))
+                target = delta[1 + target_offset]
+                if target is None:
+                    deleted.append(task_id)
+                else:
+                    added.append(target)
+                continue
+            if current is None:
+                raise ValueError(self._journal_conflict(entry, undo, task_id))
+            changes = {}
+            for position in range(1, len(delta), 3):
+                if getattr(current, delta[position]) != delta[position + current_offset]:
+                    raise ValueError(self._journal_conflict(entry, undo, task_id))
+                changes[delta[position]] = delta[position + target_offset]
+            updated.append(replace(current, **changes))
+        self._task_manager.apply_batch(added=added, updated=updated, deleted=deleted)
+
+    @staticmethod
+    def _journal_conflict(entry: JournalEntry, undo: bool, task_id: str) -> str:
+        return (f"Cannot {'undo' if undo else 'redo'} {entry.describe()}: "
+                f"task with ID '{task_id}' has changed since.")
+
+    def _check_batch_target(self, task_id: str, seen: Set[str]) -> Optional[str]:
+        """
+        Returns an error message if a bulk operation cannot target this task, else None.
+        """
+        if task_id in seen:
+            return f"Task with ID '{task_id}' appears more than once."
+        seen.add(task_id)
+        if self._task_manager.get_task(task_id) is None:
+            return f"Task with ID '{task_id}' not found."
+        return None
@@ -0,0 +1,188 @@
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from todo_app.domain.task import Task
+from todo_app.services.query_engine import QueryEngine
+from todo_app.services.task_lifecycle_service import TaskLifecycleService
+from todo_app.utils.input_validator import InputValidator
+
+TRANSFER_FORMATS = ("jsonl", "csv")
+CSV_COLUMNS = ("id", "title", "description", "is_complete")
+# Rows inserted per atomic batch on import, and tasks fetched per page on export.
+IMPORT_CHUNK_SIZE = 5000
+EXPORT_PAGE_SIZE = 1000
+# Rejected rows beyond this many are counted but not kept, so memory stays bounded.
+MAX_REPORTED_REJECTS = 20
+
+_TRUE_VALUES = ("true", "1", "yes")
+_FALSE_VALUES = ("false", "0", "no", "")
+
+# A parsed row: (line number, title, description, is_complete), or (line number, error message).
+_ParsedRow = Union[Tuple[int, str, Optional[str], bool], Tuple[int, str]]
+
+@dataclass
+class TransferResult:
+    """
+    Outcome of an import or export: rows written (or imported), rows rejected with
+    the first MAX_REPORTED_REJECTS (line number, message) pairs, and elapsed time.
+    """
+    rows: int = 0
+    rejected_count: int = 0
+    rejected: List[Tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def reject(self, line_number: int, message: str) -> None:
+        self.rejected_count += 1
+        if len(self.rejected) < MAX_REPORTED_REJECTS:
+            self.rejected.append((line_number, message))
+
+def format_for_path(path: str) -> Optional[str]:
+    """
+    Guesses the transfer format from a file extension (.jsonl/.ndjson or .csv).
+    """
+    lowered = path.lower()
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lowered.endswith(".csv"):
+        return "csv"
+    return None
+
+def _parse_completion(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return False
+    raise ValueError(f"is_complete must be true or false, got {value!r}.")
+
+def _parse_record(line_number: int, record: Dict[str, Any]) -> _ParsedRow:
+    title = record.get("title")
+    description = record.get("description")
+    try:
+        if title is not None and not isinstance(title, str):
+            raise ValueError("Task title must be a string.")
+        InputValidator.is_not_empty(title, "Task title")
+        if description is not None and not isinstance(description, str):
+            raise ValueError("Task description must be a string.")
+        is_complete = _parse_completion(record.get("is_complete", False))
+    except ValueError as e:
+        return line_number, str(e)
+    return line_number, title, description or None, is_complete
+
+def _parse_jsonl(source: TextIO) -> Iterator[_ParsedRow]:
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Each line must be a JSON object."
+            continue
+        yield _parse_record(line_number, record)
+
+def _parse_csv(source: TextIO) -> Iterator[_ParsedRow]:
+    reader = csv.DictReader(source)
+    if reader.fieldnames is None:
+        return
+    if "title" not in reader.fieldnames:
+        raise ValueError("CSV header must include a 'title' column.")
+    for record in reader:
+        if None in record:
+            yield reader.line_num, "Row has more fields than the header."
+            continue
+        yield _parse_record(reader.line_num, record)
+
+def _task_to_jsonl(task: Task) -> str:
+    return json.dumps({"id": task.id, "title": task.title, "description": task.description,
+                       "is_complete": task.is_complete}, ensure_ascii=False) + "\n"
+
+class TaskTransferService:
+    """
+    Streams tasks to and from JSON Lines or CSV files.
+
+    Both directions are generator pipelines: export writes each page of a
+    QueryEngine.iter_tasks cursor as it arrives, and import parses, validates
+    and inserts IMPORT_CHUNK_SIZE rows at a time through
+    TaskLifecycleService.create_many. Memory use is bounded by one page or
+    chunk however large the file is. Imported tasks get new IDs; an "id"
+    field or column in the file is ignored.
+    """
+    def __init__(self, lifecycle_service: TaskLifecycleService, query_engine: QueryEngine):
+        self._lifecycle_service = lifecycle_service
+        self._query_engine = query_engine
+
+    def export_tasks(self, out: TextIO, transfer_format: str) -> TransferResult:
+        """
+        Writes every task in ID order to `out`. CSV output should be opened with newline="".
+        """
+        if transfer_format not in TRANSFER_FORMATS:
+            raise ValueError(f"Unknown format '{transfer_format}'. Choose one of: {', '.join(TRANSFER_FORMATS)}.")
+        result = TransferResult()
+        started = time.perf_counter()
+        pages = self._query_engine.iter_tasks(page_size=EXPORT_PAGE_SIZE)
+        if transfer_format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(CSV_COLUMNS)
+            for page in pages:
+                writer.writerows((task.id, task.title, task.description or "", "true" if task.is_complete else "false")
+                                 for task in page)
+                result.rows += len(page)
+        else:
+            for page in pages:
+                out.writelines(map(_task_to_jsonl, page))
+                result.rows += len(page)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def import_tasks(self, source: TextIO, transfer_format: str,
+                     chunk_size: int = IMPORT_CHUNK_SIZE) -> TransferResult:
+        """
+        Adds a task for every valid row of `source`; each chunk of rows is one atomic batch,
+        and the whole import is a single undo journal entry. Invalid rows are rejected
+        (and reported by line number) without stopping the import.
+        Raises ValueError if the format is unknown or a CSV file has no title column.
+        """
+        if transfer_format not in TRANSFER_FORMATS:
+            raise ValueError(f"Unknown format '{transfer_format}'. Choose one of: {', '.join(TRANSFER_FORMATS)}.")
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be a positive number.")
+        result = TransferResult()
+        started = time.perf_counter()
+        rows = _parse_csv(source) if transfer_format == "csv" else _parse_jsonl(source)
+        with self._lifecycle_service.journal_group("import"):
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                self._import_chunk(chunk, result)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _import_chunk(self, chunk: Iterable[_ParsedRow], result: TransferResult) -> None:
+        line_numbers: List[int] = []
+        items: List[Tuple[str, Optional[str], bool]] = []
+        for row in chunk:
+            if len(row) == 2:
+                result.reject(*row)
+            else:
+                line_numbers.append(row[0])
+                items.append(row[1:])
+        if not items:
+            return
+        bulk_result = self._lifecycle_service.create_many(items)
+        for position, message in bulk_result.errors:
+            result.reject(line_numbers[position], message)
+        result.rows += len(bulk_result.succeeded)
@@ -0,0 +1,266 @@
+import struct
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter_ns
+from typing import Callable, ContextManager, Deque, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from todo_app.domain.task import Task
+
+# Most recent operations that can be undone.
+DEFAULT_CAPACITY = 1000
+# Task changes held across all of them; older operations are forgotten to stay under it.
+DEFAULT_MAX_DELTAS = 100_000
+
+# Sizes used to estimate retained memory without walking every object with sys.getsizeof.
+_TUPLE_BYTES = sys.getsizeof(())
+_POINTER_BYTES = struct.calcsize("P")
+# Stand-ins for the field name when a whole task was added or deleted.
+TASK_ADDED = "+"
+TASK_DELETED = "-"
+
+# A task's change as a flat tuple: (task_id, field, old, new[, field, old, new...]).
+# For TASK_ADDED old is None and new the task; for TASK_DELETED the reverse.
+Delta = tuple
+
+class JournalEntry(NamedTuple):
+    """
+    One undoable operation: its name and the deltas of every task it changed.
+    A NamedTuple rather than a dataclass because one is built on every write.
+    """
+    operation: str
+    deltas: Tuple[Delta, ...]
+
+    def describe(self) -> str:
+        count = len(self.deltas)
+        return f"{self.operation} ({count} task{'' if count == 1 else 's'})"
+
+class JournalInfo(NamedTuple):
+    undo_entries: int
+    redo_entries: int
+    deltas: int
+    bytes: int
+    recorded: int
+    record_ns: int
+
+    def describe(self) -> str:
+        entries = self.undo_entries + self.redo_entries
+        per_entry = self.bytes / entries if entries else 0
+        per_record = self.record_ns / self.recorded if self.recorded else 0
+        return (f"Undo journal: {self.undo_entries} undo and {self.redo_entries} redo entries, "
+                f"{self.deltas} task deltas, ~{self.bytes / 1024:,.1f} KiB (~{per_entry:,.0f} B per entry); "
+                f"recording took {per_record:,.0f} ns per mutation over {self.recorded} mutations.")
+
+def _delta_bytes(delta: Delta) -> int:
+    """
+    Approximate memory a delta keeps alive: the tuple and its old values. New
+    values are shared with the store for as long as they are current.
+    """
+    size = _TUPLE_BYTES + _POINTER_BYTES * len(delta)
+    for old in delta[2::3]:
+        if old.__class__ is str:
+            size += sys.getsizeof(old)
+        elif old.__class__ is Task:
+            size += (sys.getsizeof(old) + sys.getsizeof(vars(old)) + sys.getsizeof(old.title)
+                     + (sys.getsizeof(old.description) if old.description is not None else 0))
+    return size
+
+def diff_tasks(before: Optional[Task], after: Optional[Task]) -> Optional[Delta]:
+    """
+    Returns the delta turning `before` into `after` (either may be None for an
+    addition or deletion), or None if they do not differ.
+    """
+    if before is None:
+        return after.id, TASK_ADDED, None, after
+    if after is None:
+        return before.id, TASK_DELETED, before, None
+    delta: Delta = (after.id,)
+    if before.title != after.title:
+        delta += ("title", before.title, after.title)
+    if before.description != after.description:
+        delta += ("description", before.description, after.description)
+    if before.is_complete != after.is_complete:
+        delta += ("is_complete", before.is_complete, after.is_complete)
+    return delta if len(delta) > 1 else None
+
+class _Group:
+    """
+    Deltas collected by an open UndoJournal.group. Collection stops once they
+    exceed the journal's delta limit, as the entry could not be kept anyway.
+    """
+    __slots__ = ("deltas", "size", "overflowed")
+
+    def __init__(self):
+        self.deltas: List[Delta] = []
+        self.size = 0
+        self.overflowed = False
+
+    def add(self, deltas: List[Delta], size: int, max_deltas: int) -> None:
+        if self.overflowed:
+            return
+        if len(self.deltas) + len(deltas) > max_deltas:
+            self.overflowed = True
+            self.deltas = []
+            return
+        self.deltas.extend(deltas)
+        self.size += size
+
+class UndoJournal:
+    """
+    Bounded undo/redo history of task operations, stored as field-level deltas.
+
+    Each recorded operation (a batch counts as one) becomes a JournalEntry
+    holding, per task it changed, only the fields that changed with their old
+    and new values; a completion toggle costs a few pointers, and a new value
+    shares its object with the store. Entries sit in a ring buffer of
+    `capacity` entries that also forgets the oldest ones once more than
+    `max_deltas` task changes are held. An operation larger than that on its
+    own is not journaled and clears the history, since older entries could no
+    longer be undone in order.
+
+    undo and redo hand the top entry to an `apply` callback and move it to the
+    other stack only if the callback succeeded, so both are O(1) in the length
+    of the history. Recording a new operation clears the redo stack.
+
+    Operations a thread records inside `with journal.group(name):` become a
+    single entry, appended when the block ends; an import applied in chunks is
+    thereby undone in one step. Other threads keep recording their own entries
+    meanwhile, which end up below the group's.
+
+    Callers that record while holding per-task locks pass undo and redo a
+    `locks` callback returning those locks for an entry's tasks. They are taken
+    before the journal's own lock, in the same order as when recording, so an
+    undo cannot deadlock with, or interleave into, a concurrent operation.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_deltas: int = DEFAULT_MAX_DELTAS):
+        if capacity <= 0:
+            raise ValueError("Journal capacity must be positive.")
+        if max_deltas <= 0:
+            raise ValueError("Journal delta limit must be positive.")
+        self._max_deltas = max_deltas
+        self._undo: Deque[Tuple[JournalEntry, int]] = deque(maxlen=capacity)
+        self._redo: List[Tuple[JournalEntry, int]] = []
+        self._deltas = 0
+        self._bytes = 0
+        self._recorded = 0
+        self._record_ns = 0
+        self._lock = threading.Lock()
+        # The current thread's open group, if any, as a _Group.
+        self._local = threading.local()
+
+    def record(self, operation: str, changes: Iterable[Tuple[Optional[Task], Optional[Task]]]) -> None:
+        """
+        Journals one operation from its (before, after) task pairs. Pairs that change nothing are skipped.
+        """
+        started = perf_counter_ns()
+        deltas: List[Delta] = []
+        size = 0
+        for before, after in changes:
+            delta = diff_tasks(before, after)
+            if delta is not None:
+                deltas.append(delta)
+                size += _delta_bytes(delta)
+        if not deltas:
+            return
+        group = getattr(self._local, "group", None)
+        if group is not None:
+            group.add(deltas, size, self._max_deltas)
+            with self._lock:
+                self._recorded += 1
+                self._record_ns += perf_counter_ns() - started
+            return
+        self._append(operation, deltas, size, started)
+
+    @contextmanager
+    def group(self, operation: str) -> Iterator[None]:
+        """
+        Journals everything this thread records inside the block as one entry named
+        `operation`, appended when the block ends (even if it raised, since the
+        operations recorded so far were applied). A nested group joins the outer one.
+        """
+        if getattr(self._local, "group", None) is not None:
+            yield
+            return
+        group = self._local.group = _Group()
+        try:
+            yield
+        finally:
+            self._local.group = None
+            if group.overflowed:
+                self.clear()
+            elif group.deltas:
+                self._append(operation, group.deltas, group.size)
+
+    def _append(self, operation: str, deltas: List[Delta], size: int, started: Optional[int] = None) -> None:
+        """
+        Pushes an entry made of `deltas` (with `size` their estimated bytes) onto the
+        undo stack. With `started`, also counts it as a mutation recorded since then.
+        """
+        entry = JournalEntry(operation, tuple(deltas))
+        size += _TUPLE_BYTES * 3 + _POINTER_BYTES * (4 + len(deltas))
+        with self._lock:
+            if self._redo:
+                self._clear_stack(self._redo)
+            if len(deltas) > self._max_deltas:
+                self._clear_stack(self._undo)
+            else:
+                while self._undo and (len(self._undo) == self._undo.maxlen
+                                      or self._deltas + len(deltas) > self._max_deltas):
+                    self._forget(*self._undo.popleft())
+                self._undo.append((entry, size))
+                self._deltas += len(deltas)
+                self._bytes += size
+            if started is not None:
+                self._recorded += 1
+                self._record_ns += perf_counter_ns() - started
+
+    def _forget(self, entry: JournalEntry, size: int) -> None:
+        self._deltas -= len(entry.deltas)
+        self._bytes -= size
+
+    def _clear_stack(self, stack) -> None:
+        for entry, size in stack:
+            self._forget(entry, size)
+        stack.clear()
+
+    def undo(self, apply: Callable[[JournalEntry, bool], None],
+             locks: Optional[Callable[[JournalEntry], ContextManager]] = None) -> JournalEntry:
+        """
+        Calls apply(entry, True) for the latest operation and moves it to the redo stack.
+        Raises ValueError if there is nothing to undo; errors from apply leave both stacks unchanged.
+        """
+        return self._move(self._undo, self._redo, apply, True, locks)
+
+    def redo(self, apply: Callable[[JournalEntry, bool], None],
+             locks: Optional[Callable[[JournalEntry], ContextManager]] = None) -> JournalEntry:
+        """
+        Calls apply(entry, False) for the latest undone operation and moves it back to the undo stack.
+        Raises ValueError if there is nothing to redo; errors from apply leave both stacks unchanged.
+        """
+        return self._move(self._redo, self._undo, apply, False, locks)
+
+    def _move(self, source, target, apply: Callable[[JournalEntry, bool], None], undo: bool,
+              locks: Optional[Callable[[JournalEntry], ContextManager]]) -> JournalEntry:
+        while True:
+            with self._lock:
+                if not source:
+                    raise ValueError(f"Nothing to {'undo' if undo else 'redo'}.")
+                entry = source[-1][0]
+            with locks(entry) if locks is not None else nullcontext():
+                with self._lock:
+                    # Another operation may have been recorded or undone while the locks were taken.
+                    if not source or source[-1][0] is not entry:
+                        continue
+                    apply(entry, undo)
+                    target.append(source.pop())
+                    return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_stack(self._undo)
+            self._clear_stack(self._redo)
+
+    def info(self) -> JournalInfo:
+        with self._lock:
+            return JournalInfo(len(self._undo), len(self._redo), self._deltas, self._bytes,
+                               self._recorded, self._record_ns)
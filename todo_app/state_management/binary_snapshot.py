@@ -0,0 +1,230 @@
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, Iterator, MutableMapping, NamedTuple, Optional, Set
+from todo_app.domain.task import Task
+from todo_app.state_management.task_indexes import id_sort_key
+
+BINARY_SNAPSHOT_MAGIC = b"TODOSNAP"
+BINARY_SNAPSHOT_VERSION = 1
+
+# magic, format version, reserved, CRC32 of everything after the header,
+# task count, heap size, generation, sequence
+_HEADER = struct.Struct("<8sHHIQQQQ")
+# id, title and description offsets into the heap; their lengths (-1 for a
+# missing description); flags (bit 0: complete)
+_RECORD = struct.Struct("<QQQIIiI")
+_FLAG_COMPLETE = 1
+_CHECKSUM_CHUNK_SIZE = 1 << 24
+
+class BinarySnapshotHeader(NamedTuple):
+    count: int
+    generation: int
+    sequence: int
+
+def is_binary_snapshot(path: str) -> bool:
+    """
+    Returns True if the file at `path` starts with the binary snapshot magic.
+    """
+    with open(path, "rb") as snapshot_file:
+        return snapshot_file.read(len(BINARY_SNAPSHOT_MAGIC)) == BINARY_SNAPSHOT_MAGIC
+
+def write_binary_snapshot(path: str, tasks: Iterable[Task], generation: int, sequence: int) -> int:
+    """
+    Writes `tasks` to `path` in the binary snapshot format and fsyncs it.
+    Returns the number of tasks written.
+    """
+    ordered = sorted(tasks, key=lambda task: id_sort_key(task.id))
+    records = bytearray(len(ordered) * _RECORD.size)
+    heap_parts = []
+    heap_size = 0
+    pack_into = _RECORD.pack_into
+    for slot, task in enumerate(ordered):
+        task_id = task.id.encode("utf-8")
+        title = task.title.encode("utf-8")
+        id_offset, title_offset = heap_size, heap_size + len(task_id)
+        heap_size = title_offset + len(title)
+        heap_parts += (task_id, title)
+        if task.description is None:
+            description_offset, description_length = 0, -1
+        else:
+            description = task.description.encode("utf-8")
+            description_offset, description_length = heap_size, len(description)
+            heap_size += description_length
+            heap_parts.append(description)
+        pack_into(records, slot * _RECORD.size, id_offset, title_offset, description_offset,
+                  len(task_id), len(title), description_length, _FLAG_COMPLETE if task.is_complete else 0)
+    heap = b"".join(heap_parts)
+    checksum = zlib.crc32(heap, zlib.crc32(records))
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(_HEADER.pack(BINARY_SNAPSHOT_MAGIC, BINARY_SNAPSHOT_VERSION, 0, checksum,
+                                         len(ordered), heap_size, generation, sequence))
+        snapshot_file.write(records)
+        snapshot_file.write(heap)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    return len(ordered)
+
+class MappedSnapshot:
+    """
+    Read-only access to a binary snapshot through mmap.
+
+    File layout (little-endian):
+      header   magic, format version, CRC32, task count, heap size, generation, sequence
+      records  one fixed-width record per task, sorted by id_sort_key
+      heap     the UTF-8 text the records point into
+
+    Opening maps the file and checks its header, size and (unless disabled)
+    checksum; nothing is decoded. A task is built only when its slot is read,
+    and IDs are found by binary search over the records, decoding one ID per step.
+    """
+    def __init__(self, path: str, verify_checksum: bool = True):
+        self._path = path
+        with open(path, "rb") as snapshot_file:
+            size = os.fstat(snapshot_file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Snapshot '{path}' is truncated.")
+            self._map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, checksum, count, heap_size, generation, sequence = _HEADER.unpack_from(self._map)
+            if magic != BINARY_SNAPSHOT_MAGIC:
+                raise ValueError(f"'{path}' is not a binary snapshot.")
+            if version != BINARY_SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported binary snapshot version: {version}")
+            self._heap_start = _HEADER.size + count * _RECORD.size
+            if self._heap_start + heap_size != size:
+                raise ValueError(f"Snapshot '{path}' is truncated or has trailing data.")
+            if verify_checksum and self._checksum() != checksum:
+                raise ValueError(f"Snapshot '{path}' is corrupt (checksum mismatch).")
+        except Exception:
+            self._map.close()
+            raise
+        self.header = BinarySnapshotHeader(count, generation, sequence)
+
+    def _checksum(self) -> int:
+        checksum = 0
+        for start in range(_HEADER.size, len(self._map), _CHECKSUM_CHUNK_SIZE):
+            checksum = zlib.crc32(self._map[start:start + _CHECKSUM_CHUNK_SIZE], checksum)
+        return checksum
+
+    def __len__(self) -> int:
+        return self.header.count
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._heap_start + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def task_id(self, slot: int) -> str:
+        id_offset, _, _, id_length, _, _, _ = _RECORD.unpack_from(self._map, _HEADER.size + slot * _RECORD.size)
+        return self._text(id_offset, id_length)
+
+    def task(self, slot: int) -> Task:
+        id_offset, title_offset, description_offset, id_length, title_length, description_length, flags = (
+            _RECORD.unpack_from(self._map, _HEADER.size + slot * _RECORD.size))
+        return Task(
+            id=self._text(id_offset, id_length),
+            title=self._text(title_offset, title_length),
+            description=self._text(description_offset, description_length) if description_length >= 0 else None,
+            is_complete=bool(flags & _FLAG_COMPLETE),
+        )
+
+    def find(self, task_id: str) -> int:
+        """
+        Returns the slot holding the ID, or -1.
+        """
+        key = id_sort_key(task_id)
+        low, high = 0, self.header.count
+        while low < high:
+            middle = (low + high) // 2
+            if id_sort_key(self.task_id(middle)) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.header.count and self.task_id(low) == task_id:
+            return low
+        return -1
+
+    def task_ids(self) -> Iterator[str]:
+        task_id = self.task_id
+        for slot in range(self.header.count):
+            yield task_id(slot)
+
+    def tasks(self) -> Iterator[Task]:
+        """
+        Decodes every task in ID order.
+        """
+        task = self.task
+        for slot in range(self.header.count):
+            yield task(slot)
+
+    def close(self) -> None:
+        self._map.close()
+
+class MappedTaskStore(MutableMapping[str, Task]):
+    """
+    A TaskManager store backed by a MappedSnapshot plus an in-memory overlay.
+
+    Reads decode the task from the mapped file on every access. Writes never
+    touch the file: added and updated tasks go to the overlay, and IDs of mapped
+    tasks that were updated or deleted are hidden, so the store always reflects
+    the snapshot with later changes applied on top.
+    """
+    def __init__(self, snapshot: MappedSnapshot):
+        self._snapshot = snapshot
+        self._overlay: Dict[str, Task] = {}
+        self._hidden: Set[str] = set()
+
+    def _mapped_slot(self, task_id: str) -> int:
+        if task_id in self._hidden:
+            return -1
+        return self._snapshot.find(task_id)
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self._overlay.get(task_id)
+        if task is not None:
+            return task
+        slot = self._mapped_slot(task_id)
+        if slot < 0:
+            raise KeyError(task_id)
+        return self._snapshot.task(slot)
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        if task_id not in self._overlay and self._mapped_slot(task_id) >= 0:
+            self._hidden.add(task_id)
+        self._overlay[task_id] = task
+
+    def __delitem__(self, task_id: str) -> None:
+        if self._overlay.pop(task_id, None) is not None:
+            return
+        if self._mapped_slot(task_id) < 0:
+            raise KeyError(task_id)
+        self._hidden.add(task_id)
+
+    def __contains__(self, task_id: object) -> bool:
+        if not isinstance(task_id, str):
+            return False
+        return task_id in self._overlay or self._mapped_slot(task_id) >= 0
+
+    def __len__(self) -> int:
+        return len(self._snapshot) - len(self._hidden) + len(self._overlay)
+
+    def __iter__(self) -> Iterator[str]:
+        hidden = self._hidden
+        for task_id in self._snapshot.task_ids():
+            if task_id not in hidden:
+                yield task_id
+        yield from list(self._overlay)
+
+    def values(self) -> Iterator[Task]:  # type: ignore[override]
+        hidden = self._hidden
+        for task in self._snapshot.tasks():
+            if task.id not in hidden:
+                yield task
+        yield from list(self._overlay.values())
+
+    def close(self) -> None:
+        """
+        Unmaps the snapshot file. The store must not be used afterwards.
+        """
+        self._snapshot.close()
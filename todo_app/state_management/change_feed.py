@@ -0,0 +1,121 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Deque, Iterator, List, NamedTuple, Optional
+from todo_app.domain.task import Task
+
+CHANGE_ADDED = "added"
+CHANGE_UPDATED = "updated"
+CHANGE_DELETED = "deleted"
+
+class ChangeEvent(NamedTuple):
+    """
+    One mutation of the task store. `before` is None for an addition and `after`
+    is None for a deletion. A NamedTuple rather than a dataclass because one is
+    built on every write.
+    """
+    sequence: int
+    kind: str
+    before: Optional[Task]
+    after: Optional[Task]
+
+    @property
+    def task_id(self) -> str:
+        return (self.after or self.before).id
+
+class ChangeFeedGapError(ValueError):
+    """
+    Raised when events older than the feed still retains are requested.
+    """
+
+class ChangeFeed:
+    """
+    Ordered log of store mutations, numbered by the store version each one produced.
+
+    The most recent `retention` events are kept so a consumer that lags behind
+    (or restarts with a saved sequence number) can catch up with events_since;
+    older history is only available by rebuilding from the store itself.
+    Subscribers are called synchronously, in sequence order, after each event
+    is recorded.
+    """
+    def __init__(self, retention: int = 100_000):
+        if retention <= 0:
+            raise ValueError("Change feed retention must be positive.")
+        self._events: Deque[ChangeEvent] = deque(maxlen=retention)
+        self._subscribers: List[Callable[[ChangeEvent], None]] = []
+        self._last_sequence = 0
+        self._suspended = False
+        self._lock = threading.Lock()
+
+    @property
+    def last_sequence(self) -> int:
+        """
+        Sequence number of the latest event (0 before any).
+        """
+        return self._last_sequence
+
+    @property
+    def oldest_sequence(self) -> int:
+        """
+        Sequence number of the oldest event still retained (last_sequence + 1 if none are).
+        """
+        with self._lock:
+            return self._events[0].sequence if self._events else self._last_sequence + 1
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        self._subscribers.remove(callback)
+
+    def publish(self, sequence: int, kind: str, before: Optional[Task], after: Optional[Task]) -> None:
+        """
+        Records an event and notifies every subscriber.
+        """
+        if self._suspended:
+            self._last_sequence = sequence
+            return
+        event = ChangeEvent(sequence, kind, before, after)
+        with self._lock:
+            self._events.append(event)
+            self._last_sequence = sequence
+        for callback in self._subscribers:
+            callback(event)
+
+    def events_since(self, sequence: int) -> List[ChangeEvent]:
+        """
+        Returns every event after `sequence`, oldest first.
+        Raises ChangeFeedGapError if some of them are no longer retained.
+        """
+        with self._lock:
+            if sequence >= self._last_sequence:
+                return []
+            oldest = self._events[0].sequence if self._events else self._last_sequence + 1
+            if sequence + 1 < oldest:
+                raise ChangeFeedGapError(
+                    f"Events after sequence {sequence} are no longer retained (oldest is {oldest})."
+                )
+            return list(islice(self._events, sequence + 1 - oldest, None))
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """
+        Skips recording and notification inside the block (e.g. while bulk-loading
+        a snapshot); only the sequence number advances. Events from before the
+        block are dropped as well, since the history now has a hole.
+        """
+        self._suspended = True
+        try:
+            yield
+        finally:
+            self._suspended = False
+            self.restart_at(self._last_sequence)
+
+    def restart_at(self, sequence: int) -> None:
+        """
+        Drops retained events and continues numbering after `sequence`.
+        """
+        with self._lock:
+            self._events.clear()
+            self._last_sequence = sequence
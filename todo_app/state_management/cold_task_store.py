@@ -0,0 +1,218 @@
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from todo_app.domain.task import Task
+from todo_app.state_management.write_ahead_log import fsync_directory
+
+# Every block starts with its compressed payload length and the payload's CRC32.
+_BLOCK_HEADER = struct.Struct("<II")
+# Rewrite the file once removed records outnumber live ones and exceed this count.
+_MIN_DEAD_RECORDS_BEFORE_COMPACTION = 10_000
+_COMPACTION_CHUNK_SIZE = 1000
+
+def _encode_block(payload: dict) -> bytes:
+    compressed = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return _BLOCK_HEADER.pack(len(compressed), zlib.crc32(compressed)) + compressed
+
+class ColdTaskStore:
+    """
+    Append-only, compressed on-disk store for archived (completed) tasks.
+
+    The file is a sequence of blocks, each a zlib-compressed JSON object that
+    either adds tasks ({"a": [[id, title, description], ...]}) or removes
+    them ({"d": [id, ...]}). An in-memory index maps every archived ID to the
+    offset of the block holding it, so a lookup reads and decompresses one
+    block (the last one read is cached). Opening replays the file to rebuild
+    the index and truncates a torn final block. Removed tasks leave dead
+    records behind until compaction rewrites the file with live tasks only.
+    """
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._dead_records = 0
+        self._cached_offset = -1
+        self._cached_block: Dict[str, list] = {}
+        self._load_index()
+        self._file = open(path, "ab")
+        self._reader = open(path, "rb")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._index
+
+    @staticmethod
+    def _read_blocks(path: str) -> Iterator[Tuple[int, int, dict]]:
+        """
+        Yields (offset, end offset, payload) for every intact block, stopping at a torn or corrupt one.
+        """
+        with open(path, "rb") as archive_file:
+            offset = 0
+            while True:
+                header = archive_file.read(_BLOCK_HEADER.size)
+                if len(header) < _BLOCK_HEADER.size:
+                    return
+                length, checksum = _BLOCK_HEADER.unpack(header)
+                compressed = archive_file.read(length)
+                if len(compressed) < length or zlib.crc32(compressed) != checksum:
+                    return
+                end = offset + _BLOCK_HEADER.size + length
+                yield offset, end, json.loads(zlib.decompress(compressed))
+                offset = end
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self._path):
+            return
+        valid_length = 0
+        for offset, valid_length, payload in self._read_blocks(self._path):
+            for record in payload.get("a", ()):
+                if record[0] in self._index:
+                    self._dead_records += 1
+                self._index[record[0]] = offset
+            for task_id in payload.get("d", ()):
+                if self._index.pop(task_id, None) is not None:
+                    self._dead_records += 1
+        if os.path.getsize(self._path) != valid_length:
+            with open(self._path, "r+b") as archive_file:
+                archive_file.truncate(valid_length)
+
+    def _append_block(self, payload: dict) -> int:
+        offset = self._file.tell()
+        self._file.write(_encode_block(payload))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return offset
+
+    def add_many(self, tasks: Iterable[Task]) -> None:
+        """
+        Archives tasks as one durable block. Archiving an ID again replaces the older copy.
+        """
+        records = [[task.id, task.title, task.description] for task in tasks]
+        if not records:
+            return
+        with self._lock:
+            offset = self._append_block({"a": records})
+            for record in records:
+                if record[0] in self._index:
+                    self._dead_records += 1
+                self._index[record[0]] = offset
+
+    def remove_many(self, task_ids: Iterable[str]) -> None:
+        """
+        Removes archived tasks as one durable block. Raises ValueError for an ID that is not archived.
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return
+        with self._lock:
+            for task_id in task_ids:
+                if task_id not in self._index:
+                    raise ValueError(f"Task with ID '{task_id}' is not archived.")
+            self._append_block({"d": task_ids})
+            for task_id in task_ids:
+                del self._index[task_id]
+            self._dead_records += len(task_ids)
+            if self._dead_records >= _MIN_DEAD_RECORDS_BEFORE_COMPACTION and self._dead_records > len(self._index):
+                self._compact_locked()
+
+    def _read_block(self, offset: int) -> Dict[str, list]:
+        if offset != self._cached_offset:
+            self._reader.seek(offset)
+            length, _ = _BLOCK_HEADER.unpack(self._reader.read(_BLOCK_HEADER.size))
+            payload = json.loads(zlib.decompress(self._reader.read(length)))
+            self._cached_block = {record[0]: record for record in payload["a"]}
+            self._cached_offset = offset
+        return self._cached_block
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """
+        Returns the archived task, or None if the ID is not archived.
+        """
+        with self._lock:
+            offset = self._index.get(task_id)
+            if offset is None:
+                return None
+            record = self._read_block(offset)[task_id]
+        return Task(id=record[0], title=record[1], description=record[2], is_complete=True)
+
+    def get_many(self, task_ids: Iterable[str]) -> List[Task]:
+        """
+        Returns the archived tasks with the given IDs, in the given order, reading
+        each block involved once. IDs that are not archived are skipped.
+        """
+        task_ids = list(task_ids)
+        with self._lock:
+            by_offset: Dict[int, List[str]] = {}
+            for task_id in task_ids:
+                offset = self._index.get(task_id)
+                if offset is not None:
+                    by_offset.setdefault(offset, []).append(task_id)
+            records: Dict[str, list] = {}
+            for offset in sorted(by_offset):
+                block = self._read_block(offset)
+                for task_id in by_offset[offset]:
+                    records[task_id] = block[task_id]
+        return [Task(id=task_id, title=records[task_id][1], description=records[task_id][2], is_complete=True)
+                for task_id in task_ids if task_id in records]
+
+    def task_ids(self) -> List[str]:
+        """
+        Returns the IDs of all archived tasks, in no particular order, without reading the file.
+        """
+        with self._lock:
+            return list(self._index)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Yields every archived task, in archiving order, reading the file once.
+        """
+        for offset, _, payload in self._read_blocks(self._path):
+            for task_id, title, description in payload.get("a", ()):
+                if self._index.get(task_id) == offset:
+                    yield Task(id=task_id, title=title, description=description, is_complete=True)
+
+    def _compact_locked(self) -> None:
+        self._file.flush()
+        temp_path = self._path + ".tmp"
+        index: Dict[str, int] = {}
+        with open(temp_path, "wb") as compacted:
+            chunk: List[list] = []
+            for task in self.iter_tasks():
+                chunk.append([task.id, task.title, task.description])
+                if len(chunk) == _COMPACTION_CHUNK_SIZE:
+                    self._write_compacted(compacted, chunk, index)
+                    chunk = []
+            self._write_compacted(compacted, chunk, index)
+            compacted.flush()
+            os.fsync(compacted.fileno())
+        self._file.close()
+        self._reader.close()
+        os.replace(temp_path, self._path)
+        fsync_directory(os.path.dirname(os.path.abspath(self._path)))
+        self._file = open(self._path, "ab")
+        self._reader = open(self._path, "rb")
+        self._index = index
+        self._dead_records = 0
+        self._cached_offset = -1
+
+    @staticmethod
+    def _write_compacted(compacted, records: List[list], index: Dict[str, int]) -> None:
+        if not records:
+            return
+        offset = compacted.tell()
+        compacted.write(_encode_block({"a": records}))
+        for record in records:
+            index[record[0]] = offset
+
+    def close(self) -> None:
+        self._file.close()
+        self._reader.close()
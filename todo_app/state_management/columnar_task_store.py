@@ -0,0 +1,222 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, MutableMapping, Optional, Tuple
+from todo_app.domain.task import Task
+from todo_app.utils.id_generator import parse_numeric_id
+
+# Compaction runs once dead slots (or unreferenced heap bytes) outnumber live ones
+# and exceed these minimums, which keeps its amortized cost constant per mutation.
+_MIN_DEAD_SLOTS_BEFORE_COMPACTION = 1024
+_MIN_GARBAGE_BYTES_BEFORE_COMPACTION = 1 << 20
+
+class ColumnarTaskStore(MutableMapping[str, Task]):
+    """
+    A compact, column-oriented storage engine for TaskManager.
+
+    Each task occupies one slot across parallel columns:
+      ids            array of signed 64-bit integers
+      live/complete  bitsets (one bit per slot)
+      title/desc     offset and length arrays into a shared UTF-8 byte heap
+
+    That is roughly 32 bytes per task plus the text itself, instead of a Task
+    object, its __dict__ and separate str objects per task. Task objects are only
+    built when a caller reads one. Task IDs must be decimal integer strings.
+
+    Lookups use binary search over the ids column while IDs arrive in ascending
+    order (the normal case with sequential IDs) and fall back to a slot dictionary
+    otherwise. Deletions leave tombstones that are reclaimed by periodic compaction.
+    """
+    def __init__(self):
+        self._reset_columns()
+
+    def _reset_columns(self) -> None:
+        self._ids = array("q")
+        self._live = bytearray()
+        self._complete = bytearray()
+        self._title_offsets = array("Q")
+        self._title_lengths = array("I")
+        self._description_offsets = array("Q")
+        self._description_lengths = array("i")  # -1 encodes a missing description
+        self._heap = bytearray()
+        self._live_count = 0
+        self._garbage_bytes = 0
+        self._slot_by_id: Optional[Dict[int, int]] = None  # only used once IDs arrive out of order
+
+    # Only canonical decimal IDs round-trip through the integer column unchanged.
+    _parse_id = staticmethod(parse_numeric_id)
+    # Tells TaskManager every ID is a canonical integer, so its indexes can hold ints instead of strings.
+    numeric_ids = True
+
+    def _find_slot(self, numeric_id: int) -> int:
+        """
+        Returns the slot holding the ID (live or tombstoned), or -1.
+        """
+        if self._slot_by_id is not None:
+            return self._slot_by_id.get(numeric_id, -1)
+        slot = bisect_left(self._ids, numeric_id)
+        if slot < len(self._ids) and self._ids[slot] == numeric_id:
+            return slot
+        return -1
+
+    @staticmethod
+    def _get_bit(bits: bytearray, slot: int) -> bool:
+        return bool(bits[slot >> 3] & (1 << (slot & 7)))
+
+    @staticmethod
+    def _set_bit(bits: bytearray, slot: int, value: bool) -> None:
+        if value:
+            bits[slot >> 3] |= 1 << (slot & 7)
+        else:
+            bits[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+
+    def _live_slot(self, task_id: str) -> int:
+        numeric_id = self._parse_id(task_id)
+        if numeric_id is None:
+            return -1
+        slot = self._find_slot(numeric_id)
+        if slot >= 0 and self._get_bit(self._live, slot):
+            return slot
+        return -1
+
+    def _store_text(self, text: str) -> Tuple[int, int]:
+        encoded = text.encode("utf-8")
+        offset = len(self._heap)
+        self._heap += encoded
+        return offset, len(encoded)
+
+    def _materialize(self, slot: int) -> Task:
+        heap = self._heap
+        title_offset = self._title_offsets[slot]
+        title = heap[title_offset:title_offset + self._title_lengths[slot]].decode("utf-8")
+        description_length = self._description_lengths[slot]
+        description = None
+        if description_length >= 0:
+            description_offset = self._description_offsets[slot]
+            description = heap[description_offset:description_offset + description_length].decode("utf-8")
+        return Task(id=str(self._ids[slot]), title=title, description=description,
+                    is_complete=self._get_bit(self._complete, slot))
+
+    def _write_fields(self, slot: int, task: Task) -> None:
+        self._title_offsets[slot], self._title_lengths[slot] = self._store_text(task.title)
+        if task.description is None:
+            self._description_offsets[slot], self._description_lengths[slot] = 0, -1
+        else:
+            self._description_offsets[slot], self._description_lengths[slot] = self._store_text(task.description)
+        self._set_bit(self._complete, slot, task.is_complete)
+
+    def _release_text(self, slot: int) -> None:
+        self._garbage_bytes += self._title_lengths[slot] + max(self._description_lengths[slot], 0)
+
+    def _append_slot(self, numeric_id: int) -> int:
+        slot = len(self._ids)
+        if self._slot_by_id is None and slot and numeric_id < self._ids[-1]:
+            # Out-of-order ID: binary search no longer works, switch to a dictionary.
+            self._slot_by_id = {existing_id: index for index, existing_id in enumerate(self._ids)}
+        self._ids.append(numeric_id)
+        if self._slot_by_id is not None:
+            self._slot_by_id[numeric_id] = slot
+        for column in (self._title_offsets, self._title_lengths,
+                       self._description_offsets, self._description_lengths):
+            column.append(0)
+        if slot >> 3 >= len(self._live):
+            self._live.append(0)
+            self._complete.append(0)
+        return slot
+
+    def __getitem__(self, task_id: str) -> Task:
+        slot = self._live_slot(task_id)
+        if slot < 0:
+            raise KeyError(task_id)
+        return self._materialize(slot)
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        numeric_id = self._parse_id(task_id)
+        if numeric_id is None or task.id != task_id:
+            raise ValueError(f"Columnar store requires numeric task IDs, got '{task_id}'.")
+        slot = self._find_slot(numeric_id)
+        if slot < 0:
+            slot = self._append_slot(numeric_id)
+        if self._get_bit(self._live, slot):
+            self._release_text(slot)
+        else:
+            self._set_bit(self._live, slot, True)
+            self._live_count += 1
+        self._write_fields(slot, task)
+        self._maybe_compact()
+
+    def __delitem__(self, task_id: str) -> None:
+        slot = self._live_slot(task_id)
+        if slot < 0:
+            raise KeyError(task_id)
+        self._set_bit(self._live, slot, False)
+        self._release_text(slot)
+        self._live_count -= 1
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        dead_slots = len(self._ids) - self._live_count
+        if dead_slots >= _MIN_DEAD_SLOTS_BEFORE_COMPACTION and dead_slots > self._live_count:
+            self.compact()
+        elif (self._garbage_bytes >= _MIN_GARBAGE_BYTES_BEFORE_COMPACTION
+              and 2 * self._garbage_bytes > len(self._heap)):
+            self.compact()
+
+    def __contains__(self, task_id: object) -> bool:
+        return isinstance(task_id, str) and self._live_slot(task_id) >= 0
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def _live_slots(self) -> Iterator[int]:
+        live = self._live
+        for slot in range(len(self._ids)):
+            if live[slot >> 3] & (1 << (slot & 7)):
+                yield slot
+
+    def __iter__(self) -> Iterator[str]:
+        ids = self._ids
+        for slot in self._live_slots():
+            yield str(ids[slot])
+
+    def values(self) -> Iterator[Task]:  # type: ignore[override]
+        materialize = self._materialize
+        for slot in self._live_slots():
+            yield materialize(slot)
+
+    def compact(self) -> None:
+        """
+        Drops tombstoned slots and unreferenced heap bytes by rebuilding every column.
+        """
+        live_slots = list(self._live_slots())
+        old_heap = self._heap
+        old_title_offsets, old_title_lengths = self._title_offsets, self._title_lengths
+        old_description_offsets, old_description_lengths = self._description_offsets, self._description_lengths
+        old_ids, old_complete = self._ids, self._complete
+
+        self._reset_columns()
+        if any(old_ids[a] > old_ids[b] for a, b in zip(live_slots, live_slots[1:])):
+            self._slot_by_id = {}
+        for slot in live_slots:
+            new_slot = self._append_slot(old_ids[slot])
+            title_offset = old_title_offsets[slot]
+            self._title_offsets[new_slot], self._title_lengths[new_slot] = len(self._heap), old_title_lengths[slot]
+            self._heap += old_heap[title_offset:title_offset + old_title_lengths[slot]]
+            description_length = old_description_lengths[slot]
+            if description_length >= 0:
+                description_offset = old_description_offsets[slot]
+                self._description_offsets[new_slot] = len(self._heap)
+                self._heap += old_heap[description_offset:description_offset + description_length]
+            self._description_lengths[new_slot] = description_length
+            self._set_bit(self._complete, new_slot, self._get_bit(old_complete, slot))
+            self._set_bit(self._live, new_slot, True)
+        self._live_count = len(live_slots)
+
+    def memory_usage(self) -> int:
+        """
+        Returns the bytes held by the columns and heap (excluding interpreter overhead).
+        """
+        columns = (self._ids, self._title_offsets, self._title_lengths,
+                   self._description_offsets, self._description_lengths)
+        total = sum(column.buffer_info()[1] * column.itemsize for column in columns)
+        total += len(self._live) + len(self._complete) + len(self._heap)
+        return total
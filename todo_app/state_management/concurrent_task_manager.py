@@ -0,0 +1,119 @@
+import threading
+from contextlib import ExitStack
+from typing import ContextManager, Iterable, List, MutableMapping, Optional, Sequence, Tuple
+from todo_app.domain.task import Task
+from todo_app.state_management.segmented_task_store import SegmentedTaskStore
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.state_management.task_snapshot import TaskSnapshot
+
+# Tasks fetched per commit-lock acquisition by scan_tasks.
+SCAN_PAGE_SIZE = 1000
+
+class ConcurrentTaskManager(TaskManager):
+    """
+    A TaskManager that can be shared between threads.
+
+    Locking is two-level:
+      - striped per-task locks (task_lock) serialize read-modify-write sequences
+        on the same task, e.g. TaskLifecycleService.modify_task, while operations
+        on different tasks proceed independently; task_locks takes the stripes
+        of several tasks at once, always in stripe order so that two multi-task
+        operations cannot deadlock;
+      - one short commit lock guards the store and its indexes while a mutation
+        or an index read is applied.
+
+    Full scans never hold the commit lock: get_all_tasks and snapshot() read a
+    versioned immutable view, taken at most once per store version and shared by
+    every reader until the next write. With the default SegmentedTaskStore that
+    view shares its segments with the store (copy-on-write per segment), so taking
+    it holds the commit lock for O(segments) rather than for a copy of every task.
+    scan_tasks takes the lock once per page of the ID index instead, so it returns
+    matches in ID order without sorting and stops as soon as it has `limit` of them.
+    """
+    def __init__(self, store: Optional[MutableMapping[str, Task]] = None, stripes: int = 64):
+        if stripes <= 0:
+            raise ValueError("Number of lock stripes must be positive.")
+        self._commit_lock = threading.RLock()
+        self._stripes = [threading.RLock() for _ in range(stripes)]
+        if store is None:
+            store = SegmentedTaskStore()
+        super().__init__(store)
+
+    def task_lock(self, task_id: str) -> ContextManager:
+        return self._stripes[hash(task_id) % len(self._stripes)]
+
+    def task_locks(self, task_ids: Iterable[str]) -> ContextManager:
+        stack = ExitStack()
+        for position in sorted({hash(task_id) % len(self._stripes) for task_id in task_ids}):
+            stack.enter_context(self._stripes[position])
+        return stack
+
+    def add_task(self, task: Task) -> None:
+        with self._commit_lock:
+            super().add_task(task)
+
+    def update_task(self, updated_task: Task) -> None:
+        with self._commit_lock:
+            super().update_task(updated_task)
+
+    def delete_task(self, task_id: str) -> None:
+        with self._commit_lock:
+            super().delete_task(task_id)
+
+    def apply_batch(self, added: Sequence[Task] = (), updated: Sequence[Task] = (),
+                    deleted: Sequence[str] = ()) -> None:
+        with self._commit_lock:
+            super().apply_batch(added, updated, deleted)
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        with self._commit_lock:
+            return super().get_task(task_id)
+
+    def get_all_tasks(self) -> List[Task]:
+        return self.snapshot().get_all_tasks()
+
+    def count_tasks(self, is_complete: Optional[bool] = None) -> int:
+        with self._commit_lock:
+            return super().count_tasks(is_complete)
+
+    def find_tasks(self, is_complete: Optional[bool] = None, order_by: str = "id",
+                   limit: Optional[int] = None, offset: int = 0,
+                   after_id: Optional[str] = None) -> List[Task]:
+        with self._commit_lock:
+            return super().find_tasks(is_complete, order_by, limit, offset, after_id)
+
+    def scan_tasks(self, contains: str, is_complete: Optional[bool] = None,
+                   limit: Optional[int] = None) -> List[Task]:
+        """
+        Walks the ID index one page at a time, holding the commit lock only while
+        a page is fetched, and stops as soon as `limit` matches are found. Pages
+        are read at successive versions, so a task changed during the scan is
+        matched with either its old or its new values.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        needle = contains.casefold()
+        matches: List[Task] = []
+        cursor = None
+        while limit is None or len(matches) < limit:
+            page = self.find_tasks(is_complete, "id", SCAN_PAGE_SIZE, after_id=cursor)
+            for task in page:
+                if self._contains_text(task, needle):
+                    matches.append(task)
+                    if len(matches) == limit:
+                        break
+            if len(page) < SCAN_PAGE_SIZE:
+                break
+            cursor = page[-1].id
+        return matches
+
+    def search_tasks(self, query: str, limit: int = 10) -> List[Tuple[float, Task]]:
+        with self._commit_lock:
+            return super().search_tasks(query, limit)
+
+    def snapshot(self) -> TaskSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+        with self._commit_lock:
+            return super().snapshot()
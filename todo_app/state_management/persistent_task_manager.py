@@ -0,0 +1,287 @@
+import glob
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Iterator, List, MutableMapping, Optional, Sequence
+from todo_app.domain.task import Task
+from todo_app.state_management.binary_snapshot import (MappedSnapshot, MappedTaskStore, is_binary_snapshot,
+                                                       write_binary_snapshot)
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.state_management.write_ahead_log import DurabilityMode, WriteAheadLog, fsync_directory
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_CHUNK_SIZE = 4096
+SNAPSHOT_FORMATS = ("json", "binary")
+
+@dataclass(frozen=True)
+class RecoveryStats:
+    """
+    Describes how the persisted state was rebuilt on startup.
+    """
+    snapshot_tasks: int
+    replayed_operations: int
+    seconds: float
+
+def _encode_task(op: str, task: Task) -> list:
+    return [op, task.id, task.title, task.description, task.is_complete]
+
+def _decode_task(record: list) -> Task:
+    return Task(id=record[1], title=record[2], description=record[3], is_complete=record[4])
+
+class PersistentTaskManager(TaskManager):
+    """
+    A TaskManager whose mutations are recorded in a write-ahead log.
+    The log is periodically compacted into a snapshot so that recovery only
+    has to replay the operations made since the last snapshot. A mutation is
+    applied in memory first, so the store validates it before anything is
+    logged, and reverted if its log record cannot be appended.
+
+    On-disk layout inside `data_dir`:
+      tasks.snapshot       generation N of the store, as JSON (a header line, then
+                           chunks of task rows) or binary (see MappedSnapshot)
+      tasks.<N>.wal        operations applied after snapshot generation N
+
+    `snapshot_format` picks the format compact() writes; either is loaded. With
+    the default dict store a binary snapshot is memory-mapped rather than read:
+    tasks are decoded when first touched and indexes are built on the first
+    query that needs them, so startup does not grow with the size of the store.
+    """
+    def __init__(self, data_dir: str, durability: DurabilityMode = DurabilityMode.ALWAYS,
+                 fsync_interval_ms: int = 100, snapshot_every: int = 100_000,
+                 store: Optional[MutableMapping[str, Task]] = None, snapshot_format: str = "json"):
+        super().__init__(store)
+        if snapshot_every <= 0:
+            raise ValueError("Snapshot interval must be a positive number of operations.")
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            raise ValueError(
+                f"Unknown snapshot format '{snapshot_format}'. Choose one of: {', '.join(SNAPSHOT_FORMATS)}."
+            )
+        self._snapshot_format = snapshot_format
+        self._can_map = store is None
+        os.makedirs(data_dir, exist_ok=True)
+        self._data_dir = data_dir
+        self._durability = durability
+        self._fsync_interval_ms = fsync_interval_ms
+        self._snapshot_every = snapshot_every
+        self._operations_since_snapshot = 0
+        self._generation = 0
+        self._in_batch = False
+        self._wal: Optional[WriteAheadLog] = None
+        self.recovery_stats = self._recover()
+        self._wal = self._open_log()
+
+    @property
+    def _snapshot_path(self) -> str:
+        return os.path.join(self._data_dir, "tasks.snapshot")
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self._data_dir, f"tasks.{generation}.wal")
+
+    def _open_log(self) -> WriteAheadLog:
+        return WriteAheadLog(self._log_path(self._generation), self._durability, self._fsync_interval_ms)
+
+    def _recover(self) -> RecoveryStats:
+        """
+        Loads the latest snapshot and replays the log written after it.
+        """
+        started = time.perf_counter()
+        snapshot_tasks = self._load_snapshot()
+
+        log_path = self._log_path(self._generation)
+        replayed = 0
+        valid_length = 0
+        for valid_length, record in WriteAheadLog.read_records(log_path):
+            self._apply_record(record)
+            replayed += 1
+        if os.path.exists(log_path) and os.path.getsize(log_path) != valid_length:
+            # Drop the torn tail left by a crash mid-write before appending again.
+            with open(log_path, "r+b") as log_file:
+                log_file.truncate(valid_length)
+
+        # Logs from older generations are already folded into the snapshot.
+        for stale_path in glob.glob(os.path.join(self._data_dir, "tasks.*.wal")):
+            if stale_path != log_path:
+                os.remove(stale_path)
+
+        self._operations_since_snapshot = replayed
+        return RecoveryStats(snapshot_tasks, replayed, time.perf_counter() - started)
+
+    def _load_snapshot(self) -> int:
+        if not os.path.exists(self._snapshot_path):
+            return 0
+        if is_binary_snapshot(self._snapshot_path):
+            return self._load_binary_snapshot()
+        with open(self._snapshot_path, "rb") as snapshot_file:
+            header = json.loads(snapshot_file.readline())
+            if header.get("version") != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+            self._generation = header["generation"]
+            add = super().add_task
+            with self._feed.suspended():
+                for line in snapshot_file:
+                    for record in json.loads(line):
+                        add(_decode_task(record))
+        # Resume numbering where the snapshot left off, so change feed sequence
+        # numbers (and the version) mean the same thing across restarts.
+        self._version = header.get("sequence", self._version)
+        self._feed.restart_at(self._version)
+        return header["count"]
+
+    def _load_binary_snapshot(self) -> int:
+        snapshot = MappedSnapshot(self._snapshot_path)
+        self._generation = snapshot.header.generation
+        if self._can_map:
+            self._use_store(MappedTaskStore(snapshot))
+        else:
+            # Integer keys and other storage engines need every task copied in.
+            try:
+                add = super().add_task
+                with self._feed.suspended():
+                    for task in snapshot.tasks():
+                        add(task)
+            finally:
+                snapshot.close()
+        self._version = snapshot.header.sequence
+        self._feed.restart_at(self._version)
+        return snapshot.header.count
+
+    def _apply_record(self, record: list) -> None:
+        op = record[0]
+        if op == "a":
+            super().add_task(_decode_task(record))
+        elif op == "u":
+            super().update_task(_decode_task(record))
+        elif op == "d":
+            super().delete_task(record[1])
+        elif op == "b":
+            added, updated, deleted = record[1]
+            super().apply_batch([_decode_task(r) for r in added], [_decode_task(r) for r in updated], deleted)
+        else:
+            raise ValueError(f"Unknown log operation '{op}'.")
+
+    def add_task(self, task: Task) -> None:
+        super().add_task(task)
+        self._log(_encode_task("a", task), partial(super().delete_task, task.id))
+
+    def update_task(self, updated_task: Task) -> None:
+        existing_task = self.get_task(updated_task.id)
+        super().update_task(updated_task)
+        self._log(_encode_task("u", updated_task), partial(super().update_task, existing_task))
+
+    def delete_task(self, task_id: str) -> None:
+        existing_task = self.get_task(task_id)
+        super().delete_task(task_id)
+        self._log(["d", task_id], partial(super().add_task, existing_task))
+
+    def apply_batch(self, added: Sequence[Task] = (), updated: Sequence[Task] = (),
+                    deleted: Sequence[str] = ()) -> None:
+        previous = [self.get_task(task.id) for task in updated]
+        removed = [self.get_task(task_id) for task_id in deleted]
+        super().apply_batch(added, updated, deleted)
+        # A single record keeps the batch atomic across a crash as well.
+        self._log(["b", [[_encode_task("a", t) for t in added],
+                         [_encode_task("u", t) for t in updated],
+                         list(deleted)]],
+                  partial(super().apply_batch, removed, previous, [task.id for task in added]))
+
+    def _log(self, record: list, undo: Callable[[], None]) -> None:
+        """
+        Logs a mutation that was just applied in memory, where the store has
+        validated it. If the record cannot be appended, `undo` reverts the
+        mutation before the error propagates, so memory never runs ahead of the log.
+        """
+        try:
+            self._wal.append(record)
+        except Exception:
+            undo()
+            raise
+        self._operations_since_snapshot += 1
+        if self._operations_since_snapshot >= self._snapshot_every and not self._in_batch:
+            self.compact()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group-commits every mutation made inside the block with a single fsync.
+        """
+        outer = not self._in_batch
+        self._in_batch = True
+        try:
+            with self._wal.batch():
+                yield
+        finally:
+            if outer:
+                self._in_batch = False
+                if self._operations_since_snapshot >= self._snapshot_every:
+                    self.compact()
+
+    def compact(self) -> None:
+        """
+        Writes the current state as a new snapshot generation and starts a fresh log.
+        The snapshot rename is the commit point: a crash before it leaves the old
+        snapshot and log intact, a crash after it leaves a complete new snapshot.
+        """
+        self._wal.sync()
+        next_generation = self._generation + 1
+        tasks = self.get_all_tasks()
+        temp_path = self._snapshot_path + ".tmp"
+        if self._snapshot_format == "binary":
+            write_binary_snapshot(temp_path, tasks, next_generation, self._version)
+        else:
+            self._write_json_snapshot(temp_path, tasks, next_generation)
+        os.replace(temp_path, self._snapshot_path)
+        fsync_directory(self._data_dir)
+        if isinstance(self._tasks, MappedTaskStore):
+            # Map the new file so the overlay of changes since the old one is released.
+            # The contents are the same, so the indexes stay valid.
+            mapped_tasks = self._tasks
+            if self._snapshot_format == "binary":
+                self._tasks = MappedTaskStore(MappedSnapshot(self._snapshot_path, verify_checksum=False))
+            else:
+                self._tasks = {task.id: task for task in tasks}
+            mapped_tasks.close()
+
+        old_log_path = self._wal.path
+        self._wal.close()
+        self._generation = next_generation
+        self._wal = self._open_log()
+        os.remove(old_log_path)
+        self._operations_since_snapshot = 0
+
+    def _write_json_snapshot(self, path: str, tasks: List[Task], generation: int) -> None:
+        with open(path, "wb") as snapshot_file:
+            header = {"version": SNAPSHOT_FORMAT_VERSION, "generation": generation, "count": len(tasks),
+                      "sequence": self._version}
+            snapshot_file.write(json.dumps(header).encode("utf-8") + b"\n")
+            # Rows are written in chunks, one JSON array per line, so loading
+            # needs one json.loads call per chunk rather than per task.
+            for start in range(0, len(tasks), SNAPSHOT_CHUNK_SIZE):
+                rows = [_encode_task("a", t) for t in tasks[start:start + SNAPSHOT_CHUNK_SIZE]]
+                snapshot_file.write(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                snapshot_file.write(b"\n")
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+
+    def close(self) -> None:
+        """
+        Flushes the log and releases file handles. The manager must not be used afterwards.
+        """
+        if self._wal is not None:
+            self._wal.close()
+        if isinstance(self._tasks, MappedTaskStore):
+            self._tasks.close()
+
+def convert_snapshot(data_dir: str, snapshot_format: str) -> RecoveryStats:
+    """
+    Rewrites the snapshot in `data_dir` in the given format, folding in the
+    write-ahead log. Returns how long loading the old state took.
+    """
+    task_manager = PersistentTaskManager(data_dir, snapshot_format=snapshot_format)
+    try:
+        task_manager.compact()
+    finally:
+        task_manager.close()
+    return task_manager.recovery_stats
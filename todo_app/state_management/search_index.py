@@ -0,0 +1,226 @@
+import heapq
+import math
+import re
+from collections import Counter
+from itertools import takewhile
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from todo_app.domain.task import Task
+from todo_app.state_management.task_indexes import id_sort_key
+from todo_app.utils.sorted_index import SortedIndex
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Matches in a title count more than matches in a description.
+TITLE_WEIGHT = 2
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Splits text into case-folded word tokens.
+    """
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+def _term_frequencies(task: Task) -> Counter:
+    frequencies = Counter(tokenize(task.description))
+    for token in tokenize(task.title):
+        frequencies[token] += TITLE_WEIGHT
+    return frequencies
+
+# A token's postings: a (document, frequency) tuple while a single task contains
+# it, else a {document: frequency} dict. Many tokens (numbers, names) occur in
+# one task only, and the tuple is a quarter of the size of a one-entry dict.
+_Postings = Union[Tuple[Any, int], Dict[Any, int]]
+
+def _posting_count(postings: _Postings) -> int:
+    return 1 if type(postings) is tuple else len(postings)
+
+def _posting_items(postings: _Postings) -> Iterable[Tuple[Any, int]]:
+    return (postings,) if type(postings) is tuple else postings.items()
+
+def _identity(value: Any) -> Any:
+    return value
+
+def parse_query(query: str) -> List[List[str]]:
+    """
+    Splits a query into its OR-separated groups of AND-ed terms, dropping empty groups.
+    A term ending in "*" is a prefix term.
+    """
+    groups: List[List[str]] = [[]]
+    for term in query.split():
+        if term == "OR":
+            groups.append([])
+            continue
+        tokens = tokenize(term)
+        if term.endswith("*") and tokens:
+            # Only the last token of a term like "to-do*" is treated as a prefix.
+            tokens[-1] += "*"
+        groups[-1].extend(tokens)
+    return [terms for terms in groups if terms]
+
+def _matching_tokens(term: str, frequencies: Counter) -> List[str]:
+    if term.endswith("*"):
+        prefix = term[:-1]
+        return [token for token in frequencies if token.startswith(prefix)]
+    return [term] if term in frequencies else []
+
+def search_stream(tasks: Iterable[Task], query: str, limit: int = 10) -> List[Tuple[float, str]]:
+    """
+    Ranks tasks read in a single pass, with the same query syntax and scores as
+    an InvertedIndex over those tasks, without building one: only the document
+    frequencies of tokens the query matches are counted, and only matching
+    tasks are kept until the pass ends. Returns up to `limit` (score, task_id)
+    pairs, best match first.
+    """
+    if limit < 0:
+        raise ValueError("Limit cannot be negative.")
+    groups = parse_query(query)
+    terms = {term for group in groups for term in group}
+    document_count = 0
+    document_frequencies: Counter = Counter()
+    # (task ID, matched tokens of every matched term, frequencies of those tokens)
+    candidates: List[Tuple[str, Dict[str, List[str]], Dict[str, int]]] = []
+    for task in tasks:
+        document_count += 1
+        frequencies = _term_frequencies(task)
+        matched: Dict[str, List[str]] = {}
+        for term in terms:
+            tokens = _matching_tokens(term, frequencies)
+            if tokens:
+                matched[term] = tokens
+        if not matched:
+            continue
+        matched_tokens = {token for tokens in matched.values() for token in tokens}
+        document_frequencies.update(matched_tokens)
+        if any(all(term in matched for term in group) for group in groups):
+            candidates.append((task.id, matched, {token: frequencies[token] for token in matched_tokens}))
+
+    scores: List[Tuple[float, str]] = []
+    for task_id, matched, frequencies in candidates:
+        score = 0.0
+        for group in groups:
+            if all(term in matched for term in group):
+                score += sum(frequencies[token] * math.log(1 + document_count / document_frequencies[token])
+                             for term in group for token in matched[term])
+        scores.append((score, task_id))
+    return heapq.nsmallest(limit, scores, key=lambda hit: (-hit[0], id_sort_key(hit[1])))
+
+class InvertedIndex:
+    """
+    Token -> {task_id: weighted term frequency} postings over task titles and descriptions.
+    Updated incrementally on every mutation; a sorted vocabulary supports prefix terms.
+    With `numeric_ids` (for stores that only accept canonical decimal IDs) the
+    postings are keyed by one int per task rather than by its ID string.
+
+    Query syntax:
+      alpha beta          tasks containing both terms (AND)
+      alpha OR beta       tasks containing either term
+      alph*               any term starting with "alph" (every such term in the vocabulary)
+    AND binds tighter than OR, so "a b OR c" means (a AND b) OR c.
+    Results are ranked by the sum of tf-idf scores of the matched terms.
+    """
+    def __init__(self, numeric_ids: bool = False):
+        self._postings: Dict[str, _Postings] = {}
+        self._vocabulary = SortedIndex()
+        self._document_count = 0
+        # Document keys are task IDs, or their integer values with numeric_ids;
+        # ranking ties are broken in ID order either way.
+        self._document = int if numeric_ids else _identity
+        self._task_id = str if numeric_ids else _identity
+        self._rank_key = _identity if numeric_ids else id_sort_key
+
+    def add(self, task: Task) -> None:
+        self._document_count += 1
+        document = self._document(task.id)
+        all_postings = self._postings
+        for token, frequency in _term_frequencies(task).items():
+            postings = all_postings.get(token)
+            if postings is None:
+                all_postings[token] = (document, frequency)
+                self._vocabulary.add(token)
+            elif type(postings) is tuple:
+                all_postings[token] = {postings[0]: postings[1], document: frequency}
+            else:
+                postings[document] = frequency
+
+    def remove(self, task: Task) -> None:
+        self._document_count -= 1
+        document = self._document(task.id)
+        all_postings = self._postings
+        for token in _term_frequencies(task):
+            postings = all_postings[token]
+            if type(postings) is tuple:
+                del all_postings[token]
+                self._vocabulary.remove(token)
+                continue
+            del postings[document]
+            if len(postings) == 1:
+                all_postings[token] = next(iter(postings.items()))
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Re-indexes a task whose text changed; status-only updates cost nothing.
+        """
+        if old_task.title == new_task.title and old_task.description == new_task.description:
+            return
+        self.remove(old_task)
+        self.add(new_task)
+
+    def _expand(self, term: str) -> List[str]:
+        if not term.endswith("*"):
+            return [term]
+        prefix = term[:-1]
+        # The vocabulary is sorted, so the matching terms are one contiguous run starting at the prefix.
+        return list(takewhile(lambda token: token.startswith(prefix),
+                              self._vocabulary.iter_from(prefix, inclusive=True)))
+
+    def _term_scores(self, tokens: Iterable[str]) -> Dict[Any, float]:
+        """
+        Scores every document matching any of the tokens (a single query term, possibly expanded).
+        """
+        scores: Dict[Any, float] = {}
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            idf = math.log(1 + self._document_count / _posting_count(postings))
+            for document, frequency in _posting_items(postings):
+                scores[document] = scores.get(document, 0.0) + frequency * idf
+        return scores
+
+    def _match_all(self, terms: List[str]) -> Dict[Any, float]:
+        expansions = [self._expand(term) for term in terms]
+        if any(not tokens for tokens in expansions):
+            return {}
+        # Intersect starting from the rarest term so the candidate set stays small.
+        expansions.sort(key=lambda tokens: sum(_posting_count(self._postings[t]) for t in tokens
+                                               if t in self._postings))
+        result = self._term_scores(expansions[0])
+        for tokens in expansions[1:]:
+            if not result:
+                break
+            if len(tokens) == 1 and type(self._postings.get(tokens[0])) is dict:
+                postings = self._postings[tokens[0]]
+                idf = math.log(1 + self._document_count / len(postings))
+                result = {document: score + postings[document] * idf
+                          for document, score in result.items() if document in postings}
+            else:
+                term_scores = self._term_scores(tokens)
+                result = {document: score + term_scores[document]
+                          for document, score in result.items() if document in term_scores}
+        return result
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[float, str]]:
+        """
+        Returns up to `limit` (score, task_id) pairs, best match first.
+        """
+        if limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        scores: Dict[Any, float] = {}
+        for terms in parse_query(query):
+            for document, score in self._match_all(terms).items():
+                scores[document] = scores.get(document, 0.0) + score
+
+        rank_key = self._rank_key
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], rank_key(item[0])))
+        return [(score, self._task_id(document)) for document, score in best]
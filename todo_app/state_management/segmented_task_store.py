@@ -0,0 +1,111 @@
+from itertools import chain
+from typing import Dict, Iterator, Mapping, MutableMapping, Set, ValuesView
+from todo_app.domain.task import Task
+
+# Decimal IDs are grouped in blocks of 2**SEGMENT_BITS consecutive values, so a
+# segment holds tasks created together and iterating one stays cache-friendly.
+SEGMENT_BITS = 10
+# Other IDs are spread by hash over this many segments.
+HASHED_SEGMENTS = 256
+
+def _segment_key(task_id: str) -> int:
+    if task_id.isdigit() and task_id.isascii() and len(task_id) <= 18:
+        return int(task_id) >> SEGMENT_BITS
+    return -1 - hash(task_id) % HASHED_SEGMENTS
+
+class FrozenTaskMap(Mapping[str, Task]):
+    """
+    A read-only mapping over the segments a SegmentedTaskStore had when it was frozen.
+    The segments are never modified again, so the view needs no locking.
+    """
+    def __init__(self, segments: Dict[int, Dict[str, Task]], size: int):
+        self._segments = segments
+        self._size = size
+
+    def __getitem__(self, task_id: str) -> Task:
+        segment = self._segments.get(_segment_key(task_id))
+        if segment is None:
+            raise KeyError(task_id)
+        return segment[task_id]
+
+    def __contains__(self, task_id: object) -> bool:
+        segment = self._segments.get(_segment_key(task_id)) if isinstance(task_id, str) else None
+        return segment is not None and task_id in segment
+
+    def __iter__(self) -> Iterator[str]:
+        return chain.from_iterable(self._segments.values())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def values(self) -> ValuesView[Task]:
+        return _SegmentValues(self)
+
+class _SegmentValues(ValuesView):
+    # Iterates the segments directly instead of looking every key up again.
+    def __iter__(self) -> Iterator[Task]:
+        return chain.from_iterable(segment.values() for segment in self._mapping._segments.values())
+
+class SegmentedTaskStore(MutableMapping[str, Task]):
+    """
+    A storage engine for TaskManager whose contents can be frozen without copying them.
+
+    Tasks live in small segment dicts: one per block of 1024 consecutive decimal
+    IDs, or one of 256 hash buckets for other IDs. freeze() hands the current
+    segments to a FrozenTaskMap, copying only the outer table of segments, and
+    marks them all shared. The next write to a shared segment copies that one
+    segment and works on the copy, while segments nobody has written to since
+    stay shared between the store and every snapshot. A snapshot after a single
+    write therefore costs one small copy instead of a copy of the whole store.
+    """
+    def __init__(self):
+        self._segments: Dict[int, Dict[str, Task]] = {}
+        # Segments created or copied since the last freeze(); every other one is shared.
+        self._owned: Set[int] = set()
+        self._size = 0
+
+    def _writable_segment(self, task_id: str) -> Dict[str, Task]:
+        key = _segment_key(task_id)
+        segment = self._segments.get(key)
+        if key not in self._owned:
+            segment = self._segments[key] = {} if segment is None else dict(segment)
+            self._owned.add(key)
+        return segment
+
+    def freeze(self) -> FrozenTaskMap:
+        """
+        Returns an immutable view of the current contents, sharing every segment with the store.
+        """
+        self._owned = set()
+        return FrozenTaskMap(dict(self._segments), self._size)
+
+    def __getitem__(self, task_id: str) -> Task:
+        segment = self._segments.get(_segment_key(task_id))
+        if segment is None:
+            raise KeyError(task_id)
+        return segment[task_id]
+
+    def __contains__(self, task_id: object) -> bool:
+        segment = self._segments.get(_segment_key(task_id)) if isinstance(task_id, str) else None
+        return segment is not None and task_id in segment
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        segment = self._writable_segment(task_id)
+        if task_id not in segment:
+            self._size += 1
+        segment[task_id] = task
+
+    def __delitem__(self, task_id: str) -> None:
+        if task_id not in self:
+            raise KeyError(task_id)
+        del self._writable_segment(task_id)[task_id]
+        self._size -= 1
+
+    def __iter__(self) -> Iterator[str]:
+        return chain.from_iterable(self._segments.values())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def values(self) -> ValuesView[Task]:
+        return _SegmentValues(self)
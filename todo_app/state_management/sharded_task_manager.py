@@ -0,0 +1,265 @@
+import heapq
+import multiprocessing
+import threading
+import zlib
+from contextlib import nullcontext
+from itertools import islice
+from multiprocessing.connection import Connection
+from types import MappingProxyType
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, MutableMapping, Optional, Sequence, Tuple
+from todo_app.domain.task import Task
+from todo_app.state_management.task_indexes import id_sort_key, task_sort_key
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.state_management.task_snapshot import TaskSnapshot
+from todo_app.utils.id_generator import parse_numeric_id
+
+def _serve_shard(connection: Connection, store_factory: Optional[Callable[[], MutableMapping]]) -> None:
+    """
+    Worker process main loop: applies (method, args) requests to its own TaskManager
+    and answers each with (True, result) or (False, exception). None stops the worker.
+    """
+    task_manager = TaskManager(store_factory() if store_factory else None)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        method, args = request
+        try:
+            connection.send((True, getattr(task_manager, method)(*args)))
+        except Exception as e:
+            connection.send((False, e))
+
+class ShardedTaskManager:
+    """
+    Partitions tasks by ID across worker processes, each owning a TaskManager,
+    so scans, bulk loads and index maintenance run on several cores.
+
+    Exposes the TaskManager interface used by the services. Point operations go
+    to the owning shard (numeric IDs by value modulo the shard count, others by
+    CRC32). Counts, ordered reads, scans and searches are sent to every shard at
+    once and merged here: ordered results with heapq.merge on the same sort keys
+    the per-shard indexes use. apply_batch stays atomic across shards by
+    validating every shard's part before any shard applies its part.
+
+    Calls are serialized by one lock, so the manager can be shared by threads,
+    but like a plain TaskManager it offers no per-task locking. Search scores are
+    computed per shard (each with its own term statistics), which is close to,
+    but not exactly, the single-store ranking. Call close() to stop the workers.
+    """
+    def __init__(self, shard_count: int = 4, store_factory: Optional[Callable[[], MutableMapping]] = None):
+        if shard_count <= 0:
+            raise ValueError("Number of shards must be positive.")
+        context = multiprocessing.get_context("spawn")
+        self._connections: List[Connection] = []
+        self._workers = []
+        for _ in range(shard_count):
+            parent_end, worker_end = context.Pipe()
+            worker = context.Process(target=_serve_shard, args=(worker_end, store_factory), daemon=True)
+            worker.start()
+            worker_end.close()
+            self._connections.append(parent_end)
+            self._workers.append(worker)
+        self._lock = threading.RLock()
+        self._version = 0
+        self._snapshot: Optional[TaskSnapshot] = None
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._connections)
+
+    @property
+    def version(self) -> int:
+        """
+        A counter bumped by every change to the store.
+        """
+        return self._version
+
+    def shard_for(self, task_id: str) -> int:
+        """
+        Returns the index of the shard that owns the task ID.
+        """
+        numeric_id = parse_numeric_id(task_id)
+        if numeric_id is None:
+            numeric_id = zlib.crc32(task_id.encode("utf-8"))
+        return numeric_id % len(self._connections)
+
+    def _fan_out(self, requests: Dict[int, Tuple[str, tuple]]) -> Dict[int, Any]:
+        """
+        Sends each shard its (method, args) request, then collects every reply, so
+        the shards work in parallel. The first error, including a worker that
+        died, is raised only once every other reply is in, so no stale reply is
+        left in a pipe to be mistaken for the answer to a later request.
+        """
+        with self._lock:
+            sent = []
+            error: Optional[Exception] = None
+            for shard, request in requests.items():
+                try:
+                    self._connections[shard].send(request)
+                except (OSError, EOFError):
+                    if error is None:
+                        error = RuntimeError(f"Shard worker {shard} exited unexpectedly.")
+                    continue
+                sent.append(shard)
+            results: Dict[int, Any] = {}
+            for shard in sent:
+                try:
+                    ok, result = self._connections[shard].recv()
+                except (OSError, EOFError):
+                    if error is None:
+                        error = RuntimeError(f"Shard worker {shard} exited unexpectedly.")
+                    continue
+                if ok:
+                    results[shard] = result
+                elif error is None:
+                    error = result
+        if error is not None:
+            raise error
+        return results
+
+    def _call(self, shard: int, method: str, *args) -> Any:
+        return self._fan_out({shard: (method, args)})[shard]
+
+    def _broadcast(self, method: str, *args) -> List[Any]:
+        results = self._fan_out({shard: (method, args) for shard in range(len(self._connections))})
+        return [results[shard] for shard in range(len(self._connections))]
+
+    def add_task(self, task: Task) -> None:
+        """
+        Adds a task to its shard. Raises ValueError if ID already exists.
+        """
+        self._call(self.shard_for(task.id), "add_task", task)
+        self._version += 1
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """
+        Retrieves a task by ID from its shard. Returns None if not found.
+        """
+        return self._call(self.shard_for(task_id), "get_task", task_id)
+
+    def get_all_tasks(self) -> List[Task]:
+        """
+        Returns a list of all tasks, shard by shard.
+        """
+        return [task for tasks in self._broadcast("get_all_tasks") for task in tasks]
+
+    def update_task(self, updated_task: Task) -> None:
+        """
+        Updates an existing task. Raises ValueError if task does not exist.
+        """
+        self._call(self.shard_for(updated_task.id), "update_task", updated_task)
+        self._version += 1
+
+    def delete_task(self, task_id: str) -> None:
+        """
+        Deletes a task by ID. Raises ValueError if task does not exist.
+        """
+        self._call(self.shard_for(task_id), "delete_task", task_id)
+        self._version += 1
+
+    def apply_batch(self, added: Sequence[Task] = (), updated: Sequence[Task] = (),
+                    deleted: Sequence[str] = ()) -> None:
+        """
+        Applies many mutations as one atomic batch across all shards; either all
+        take effect or (with a ValueError) none do.
+        """
+        parts: Dict[int, Tuple[List[Task], List[Task], List[str]]] = {}
+        for task in added:
+            parts.setdefault(self.shard_for(task.id), ([], [], []))[0].append(task)
+        for task in updated:
+            parts.setdefault(self.shard_for(task.id), ([], [], []))[1].append(task)
+        for task_id in deleted:
+            parts.setdefault(self.shard_for(task_id), ([], [], []))[2].append(task_id)
+        if not parts:
+            return
+        with self._lock:
+            # A repeated ID always lands twice in the same shard, so per-shard validation covers it.
+            self._fan_out({shard: ("validate_batch", part) for shard, part in parts.items()})
+            self._fan_out({shard: ("apply_batch", part) for shard, part in parts.items()})
+            self._version += 1
+
+    def count_tasks(self, is_complete: Optional[bool] = None) -> int:
+        """
+        Returns the number of tasks, optionally only those with the given completion status.
+        """
+        return sum(self._broadcast("count_tasks", is_complete))
+
+    def find_tasks(self, is_complete: Optional[bool] = None, order_by: str = "id",
+                   limit: Optional[int] = None, offset: int = 0,
+                   after_id: Optional[str] = None) -> List[Task]:
+        """
+        Returns tasks in `order_by` order, merging the first offset + limit tasks of every shard.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        if offset < 0:
+            raise ValueError("Offset cannot be negative.")
+        per_shard_limit = None if limit is None else offset + limit
+        shard_results = self._broadcast("find_tasks", is_complete, order_by, per_shard_limit, 0, after_id)
+        merged = heapq.merge(*shard_results, key=lambda task: task_sort_key(task, order_by))
+        return list(islice(merged, offset, None if limit is None else offset + limit))
+
+    def scan_tasks(self, contains: str, is_complete: Optional[bool] = None,
+                   limit: Optional[int] = None) -> List[Task]:
+        """
+        Scans every shard in parallel for tasks containing the text and merges the matches in ID order.
+        """
+        shard_results = self._broadcast("scan_tasks", contains, is_complete, limit)
+        merged = heapq.merge(*shard_results, key=lambda task: id_sort_key(task.id))
+        return list(islice(merged, limit))
+
+    def search_tasks(self, query: str, limit: int = 10) -> List[Tuple[float, Task]]:
+        """
+        Returns up to `limit` (score, task) pairs, best match first, from the best matches of every shard.
+        """
+        shard_results = self._broadcast("search_tasks", query, limit)
+        return heapq.nsmallest(limit, (hit for hits in shard_results for hit in hits),
+                               key=lambda hit: (-hit[0], id_sort_key(hit[1].id)))
+
+    def snapshot(self) -> TaskSnapshot:
+        """
+        Returns an immutable view of all shards, gathered once per store version.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._version:
+            version = self._version
+            tasks = {task.id: task for task in self.get_all_tasks()}
+            complete_count = sum(1 for task in tasks.values() if task.is_complete)
+            snapshot = TaskSnapshot(
+                version=version,
+                tasks=MappingProxyType(tasks),
+                complete_count=complete_count,
+                incomplete_count=len(tasks) - complete_count,
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    def task_lock(self, task_id: str) -> ContextManager:
+        """
+        A no-op, as for a plain TaskManager.
+        """
+        return nullcontext()
+
+    def task_locks(self, task_ids: Iterable[str]) -> ContextManager:
+        return nullcontext()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes. The tasks they held are discarded.
+        """
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            for worker, connection in zip(self._workers, self._connections):
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+                connection.close()
+            self._connections = []
+            self._workers = []
@@ -0,0 +1,129 @@
+import heapq
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from todo_app.domain.task import Task
+from todo_app.utils.sorted_index import SortedIndex
+
+ORDER_FIELDS = ("id", "title")
+
+def id_sort_key(task_id: str) -> Tuple:
+    """
+    Orders numeric IDs numerically and places any non-numeric IDs after them.
+    The ID itself is the last element so the key can be mapped back to its task.
+    """
+    if task_id.isdigit():
+        return (0, int(task_id), task_id)
+    return (1, 0, task_id)
+
+def task_sort_key(task: Task, order_by: str) -> Tuple:
+    """
+    Returns the key a task is ordered by in the given index.
+    """
+    if order_by == "id":
+        return id_sort_key(task.id)
+    if order_by == "title":
+        return (task.title.casefold(),) + id_sort_key(task.id)
+    raise ValueError(f"Cannot order tasks by '{order_by}'. Choose one of: {', '.join(ORDER_FIELDS)}.")
+
+def _numeric_title_key(task: Task) -> bytes:
+    # UTF-8 bytes compare in code point order, like the casefolded str; the
+    # NUL separator sorts a title before its extensions, and the big-endian
+    # ID breaks ties in numeric order.
+    return task.title.casefold().encode("utf-8") + b"\0" + int(task.id).to_bytes(8, "big")
+
+def _numeric_title_key_id(key: bytes) -> str:
+    return str(int.from_bytes(key[-8:], "big"))
+
+class TaskIndexes:
+    """
+    Secondary indexes over the task store, kept current on every mutation.
+    For each ordering and completion status there is one sorted index, so
+    status filters, counts and ordered top-k reads never scan the whole store.
+
+    With `numeric_ids` (for stores that only accept canonical decimal IDs, such
+    as ColumnarTaskStore) the keys are compact: ID indexes hold the IDs in
+    int64 arrays and title indexes one bytes object per task, instead of
+    tuples of Python objects. The order is the same either way.
+    """
+    def __init__(self, numeric_ids: bool = False):
+        self._numeric_ids = numeric_ids
+        self._sort_keys: Dict[str, Callable[[Task], Any]]
+        self._key_ids: Dict[str, Callable[[Any], str]]
+        if numeric_ids:
+            self._sort_keys = {"id": lambda task: int(task.id), "title": _numeric_title_key}
+            self._key_ids = {"id": str, "title": _numeric_title_key_id}
+        else:
+            self._sort_keys = {order_by: lambda task, order_by=order_by: task_sort_key(task, order_by)
+                               for order_by in ORDER_FIELDS}
+            self._key_ids = {order_by: lambda key: key[-1] for order_by in ORDER_FIELDS}
+        self._indexes: Dict[Tuple[str, bool], SortedIndex] = {
+            (order_by, status): SortedIndex(typecode="q" if numeric_ids and order_by == "id" else None)
+            for order_by in ORDER_FIELDS for status in (False, True)
+        }
+
+    def add(self, task: Task) -> None:
+        for order_by, sort_key in self._sort_keys.items():
+            self._indexes[(order_by, task.is_complete)].add(sort_key(task))
+
+    def remove(self, task: Task) -> None:
+        for order_by, sort_key in self._sort_keys.items():
+            self._indexes[(order_by, task.is_complete)].remove(sort_key(task))
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Re-indexes a task, touching only the indexes whose keys actually changed.
+        """
+        status_changed = old_task.is_complete != new_task.is_complete
+        for order_by, sort_key in self._sort_keys.items():
+            old_key = sort_key(old_task)
+            new_key = sort_key(new_task)
+            if status_changed or old_key != new_key:
+                self._indexes[(order_by, old_task.is_complete)].remove(old_key)
+                self._indexes[(order_by, new_task.is_complete)].add(new_key)
+
+    def count(self, is_complete: Optional[bool] = None) -> int:
+        """
+        Returns the number of indexed tasks, optionally restricted to one status. O(1).
+        """
+        if is_complete is None:
+            return len(self._indexes[("id", False)]) + len(self._indexes[("id", True)])
+        return len(self._indexes[("id", is_complete)])
+
+    def iter_task_ids(self, order_by: str = "id", is_complete: Optional[bool] = None,
+                      offset: int = 0, after_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Lazily yields task IDs in index order.
+        `after_id` resumes an ID-ordered iteration after the given task (a cursor);
+        `offset` skips that many matching tasks first.
+        """
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"Cannot order tasks by '{order_by}'. Choose one of: {', '.join(ORDER_FIELDS)}.")
+        if after_id is not None and order_by != "id":
+            raise ValueError("A cursor (after_id) can only be used with order_by='id'.")
+        if offset < 0:
+            raise ValueError("Offset cannot be negative.")
+
+        statuses = (False, True) if is_complete is None else (is_complete,)
+        after_key = None
+        if after_id is not None:
+            if not self._numeric_ids:
+                after_key = id_sort_key(after_id)
+            elif after_id.isdigit():
+                after_key = int(after_id)
+            else:
+                # Non-numeric IDs sort after every numeric one, so nothing follows.
+                return
+        if len(statuses) == 1:
+            index = self._indexes[(order_by, statuses[0])]
+            if after_key is None:
+                keys = index.iter_from_position(offset)
+            else:
+                keys = index.iter_from(after_key)
+                for _ in range(offset):
+                    if next(keys, None) is None:
+                        return
+        else:
+            keys = heapq.merge(*(self._indexes[(order_by, status)].iter_from(after_key) for status in statuses))
+            for _ in range(offset):
+                if next(keys, None) is None:
+                    return
+        yield from map(self._key_ids[order_by], keys)
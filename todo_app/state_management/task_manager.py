@@ -1,13 +1,77 @@
-from typing import Dict, List, Optional
+from contextlib import nullcontext
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import ContextManager, Iterable, List, MutableMapping, Optional, Sequence, Set, Tuple
 from todo_app.domain.task import Task
+from todo_app.state_management.change_feed import CHANGE_ADDED, CHANGE_DELETED, CHANGE_UPDATED, ChangeFeed
+from todo_app.state_management.search_index import InvertedIndex
+from todo_app.state_management.task_indexes import TaskIndexes
+from todo_app.state_management.task_snapshot import TaskSnapshot
 
 class TaskManager:
     """
     Manages the authoritative in-memory collection of Task objects.
     It is the single source of truth for all task data.
+    Secondary indexes (completion status, ordering) and a full-text index are
+    maintained alongside the collection on every mutation.
+
+    The collection itself is any mutable mapping of ID to Task: a plain dict by
+    default, or an alternative storage engine such as ColumnarTaskStore.
+
+    Every mutation is also published on a ChangeFeed, numbered by the version it
+    produced, for consumers such as materialized views.
     """
-    def __init__(self):
-        self._tasks: Dict[str, Task] = {}
+    def __init__(self, store: Optional[MutableMapping[str, Task]] = None):
+        self._version = 0
+        self._feed = ChangeFeed()
+        self._use_store({} if store is None else store)
+
+    def _use_store(self, store: MutableMapping) -> None:
+        """
+        Makes `store` the collection. Indexes over the tasks it already holds are
+        built the first time a query needs them, so adopting a large pre-populated
+        store (such as a memory-mapped snapshot) costs nothing up front.
+        """
+        self._tasks: MutableMapping = store
+        # Stores that only hold canonical integer IDs get int-keyed indexes, a fraction of the size.
+        self._numeric_ids = getattr(store, "numeric_ids", False)
+        self._snapshot: Optional[TaskSnapshot] = None
+        if len(store):
+            self._indexes: Optional[TaskIndexes] = None
+            self._search_index: Optional[InvertedIndex] = None
+        else:
+            self._indexes = TaskIndexes(self._numeric_ids)
+            self._search_index = InvertedIndex(self._numeric_ids)
+
+    def _task_indexes(self) -> TaskIndexes:
+        if self._indexes is None:
+            indexes = TaskIndexes(self._numeric_ids)
+            for task in self._tasks.values():
+                indexes.add(task)
+            self._indexes = indexes
+        return self._indexes
+
+    def _text_index(self) -> InvertedIndex:
+        if self._search_index is None:
+            search_index = InvertedIndex(self._numeric_ids)
+            for task in self._tasks.values():
+                search_index.add(task)
+            self._search_index = search_index
+        return self._search_index
+
+    @property
+    def version(self) -> int:
+        """
+        A counter bumped by every change to the store.
+        """
+        return self._version
+
+    @property
+    def change_feed(self) -> ChangeFeed:
+        """
+        The ordered feed of mutations; event sequence numbers equal the store version.
+        """
+        return self._feed
 
     def add_task(self, task: Task) -> None:
         """
@@ -15,7 +79,7 @@ class TaskManager:
         """
         if task.id in self._tasks:
             raise ValueError(f"Task with ID '{task.id}' already exists.")
-        self._tasks[task.id] = task
+        self._insert(task)
 
     def get_task(self, task_id: str) -> Optional[Task]:
         """
@@ -33,9 +97,10 @@ class TaskManager:
         """
         Updates an existing task. Raises ValueError if task does not exist.
         """
-        if updated_task.id not in self._tasks:
+        existing_task = self._tasks.get(updated_task.id)
+        if existing_task is None:
             raise ValueError(f"Task with ID '{updated_task.id}' does not exist.")
-        self._tasks[updated_task.id] = updated_task
+        self._replace(existing_task, updated_task)
 
     def delete_task(self, task_id: str) -> None:
         """
@@ -43,4 +108,162 @@ class TaskManager:
         """
         if task_id not in self._tasks:
             raise ValueError(f"Task with ID '{task_id}' does not exist.")
-        del self._tasks[task_id]
+        self._remove(task_id)
+
+    def apply_batch(self, added: Sequence[Task] = (), updated: Sequence[Task] = (),
+                    deleted: Sequence[str] = ()) -> None:
+        """
+        Applies many mutations as one atomic batch. Every change is validated
+        before any is applied, so either all of them take effect or (with a
+        ValueError) none do. A task ID may appear only once across the batch.
+        """
+        self.validate_batch(added, updated, deleted)
+        for task in added:
+            self._insert(task)
+        for task in updated:
+            self._replace(self._tasks[task.id], task)
+        for task_id in deleted:
+            self._remove(task_id)
+
+    def validate_batch(self, added: Sequence[Task] = (), updated: Sequence[Task] = (),
+                       deleted: Sequence[str] = ()) -> None:
+        """
+        Raises the ValueError apply_batch would raise for this batch, without applying anything.
+        """
+        seen: Set[str] = set()
+        for task_id in chain((task.id for task in added), (task.id for task in updated), deleted):
+            if task_id in seen:
+                raise ValueError(f"Task with ID '{task_id}' appears more than once in the batch.")
+            seen.add(task_id)
+        for task in added:
+            if task.id in self._tasks:
+                raise ValueError(f"Task with ID '{task.id}' already exists.")
+        for task_id in chain((task.id for task in updated), deleted):
+            if task_id not in self._tasks:
+                raise ValueError(f"Task with ID '{task_id}' does not exist.")
+
+    def _insert(self, task: Task) -> None:
+        self._tasks[task.id] = task
+        self._version += 1
+        if self._indexes is not None:
+            self._indexes.add(task)
+        if self._search_index is not None:
+            self._search_index.add(task)
+        self._feed.publish(self._version, CHANGE_ADDED, None, task)
+
+    def _replace(self, existing_task: Task, updated_task: Task) -> None:
+        self._tasks[updated_task.id] = updated_task
+        self._version += 1
+        if self._indexes is not None:
+            self._indexes.replace(existing_task, updated_task)
+        if self._search_index is not None:
+            self._search_index.replace(existing_task, updated_task)
+        self._feed.publish(self._version, CHANGE_UPDATED, existing_task, updated_task)
+
+    def _remove(self, task_id: str) -> Task:
+        removed_task = self._tasks.pop(task_id)
+        self._version += 1
+        if self._indexes is not None:
+            self._indexes.remove(removed_task)
+        if self._search_index is not None:
+            self._search_index.remove(removed_task)
+        self._feed.publish(self._version, CHANGE_DELETED, removed_task, None)
+        return removed_task
+
+    def count_tasks(self, is_complete: Optional[bool] = None) -> int:
+        """
+        Returns the number of tasks, optionally only those with the given completion status.
+        """
+        return self._task_indexes().count(is_complete)
+
+    def find_tasks(self, is_complete: Optional[bool] = None, order_by: str = "id",
+                   limit: Optional[int] = None, offset: int = 0,
+                   after_id: Optional[str] = None) -> List[Task]:
+        """
+        Returns tasks in `order_by` order ("id" or "title"), optionally filtered by
+        completion status. Only the requested window is materialized: the cost is
+        proportional to offset + limit, not to the size of the store.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        task_ids = self._task_indexes().iter_task_ids(order_by, is_complete, offset, after_id)
+        if limit is not None:
+            task_ids = islice(task_ids, limit)
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in task_ids]
+
+    @staticmethod
+    def _contains_text(task: Task, needle: str) -> bool:
+        if needle in task.title.casefold():
+            return True
+        return task.description is not None and needle in task.description.casefold()
+
+    def scan_tasks(self, contains: str, is_complete: Optional[bool] = None,
+                   limit: Optional[int] = None) -> List[Task]:
+        """
+        Returns tasks in ID order whose title or description contains the text
+        (case-insensitively), optionally filtered by completion status. Unlike
+        search_tasks this matches arbitrary substrings, so it visits every task
+        of the requested status until `limit` matches are found.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        needle = contains.casefold()
+        tasks, matches = self._tasks, []
+        if limit == 0:
+            return matches
+        for task_id in self._task_indexes().iter_task_ids("id", is_complete):
+            task = tasks[task_id]
+            if self._contains_text(task, needle):
+                matches.append(task)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def search_tasks(self, query: str, limit: int = 10) -> List[Tuple[float, Task]]:
+        """
+        Returns up to `limit` (score, task) pairs matching a full-text query, best match first.
+        See InvertedIndex for the query syntax.
+        """
+        tasks = self._tasks
+        return [(score, tasks[task_id]) for score, task_id in self._text_index().search(query, limit)]
+
+    def snapshot(self) -> TaskSnapshot:
+        """
+        Returns an immutable view of the store as of now. The copy is taken once
+        per store version and shared by every reader until the next mutation;
+        stores with a freeze() method (SegmentedTaskStore) provide it without copying.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._version:
+            freeze = getattr(self._tasks, "freeze", None)
+            if freeze is not None:
+                # Copy-on-write stores hand out an immutable view without copying.
+                tasks = freeze()
+            elif type(self._tasks) is dict:
+                tasks = MappingProxyType(dict(self._tasks))
+            else:
+                tasks = MappingProxyType({task.id: task for task in self._tasks.values()})
+            indexes = self._task_indexes()
+            snapshot = TaskSnapshot(
+                version=self._version,
+                tasks=tasks,
+                complete_count=indexes.count(True),
+                incomplete_count=indexes.count(False),
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    def task_lock(self, task_id: str) -> ContextManager:
+        """
+        Returns the lock that serializes read-modify-write sequences on one task.
+        A plain TaskManager is single-threaded, so this is a no-op.
+        """
+        return nullcontext()
+
+    def task_locks(self, task_ids: Iterable[str]) -> ContextManager:
+        """
+        Holds the task_lock of every listed task at once, for read-validate-apply
+        sequences over several tasks such as bulk operations. A no-op here too.
+        """
+        return nullcontext()
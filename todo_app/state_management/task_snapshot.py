@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import List, Mapping, Optional
+from todo_app.domain.task import Task
+
+@dataclass(frozen=True)
+class TaskSnapshot:
+    """
+    An immutable, point-in-time view of the task store.
+    `version` is the store version it was taken at; the counts were captured
+    together with the tasks, so they always agree with them.
+    """
+    version: int
+    tasks: Mapping[str, Task]
+    complete_count: int
+    incomplete_count: int
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        return self.tasks.get(task_id)
+
+    def get_all_tasks(self) -> List[Task]:
+        return list(self.tasks.values())
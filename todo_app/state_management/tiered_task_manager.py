@@ -0,0 +1,445 @@
+import heapq
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain, dropwhile, islice
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from todo_app.domain.task import Task
+from todo_app.state_management.change_feed import ChangeEvent, ChangeFeed
+from todo_app.state_management.cold_task_store import ColdTaskStore
+from todo_app.state_management.search_index import search_stream
+from todo_app.state_management.task_indexes import id_sort_key, task_sort_key
+from todo_app.state_management.task_manager import TaskManager
+from todo_app.state_management.task_snapshot import TaskSnapshot
+from todo_app.state_management.write_ahead_log import fsync_directory
+from todo_app.utils.id_generator import parse_numeric_id
+from todo_app.utils.sorted_index import SortedIndex
+
+# Tasks written to the cold store per block when archiving.
+ARCHIVE_BLOCK_SIZE = 1000
+# Rewrite the completion log once it holds this many more records than completed tasks.
+_MIN_STALE_COMPLETIONS_BEFORE_COMPACTION = 10_000
+_INT64_LIMIT = 1 << 63
+
+def _read_completion_log(path: str) -> Dict[str, float]:
+    """
+    Returns the latest completion time logged for every task ID, skipping a torn final line.
+    """
+    completed_at: Dict[str, float] = {}
+    if not os.path.exists(path):
+        return completed_at
+    with open(path, encoding="utf-8") as log_file:
+        for line in log_file:
+            try:
+                task_id, timestamp = json.loads(line)
+            except ValueError:
+                continue
+            completed_at[task_id] = timestamp
+    return completed_at
+
+def _smallest(tasks: Iterable[Task], count: Optional[int], key: Callable[[Task], Any]) -> List[Task]:
+    return sorted(tasks, key=key) if count is None else heapq.nsmallest(count, tasks, key=key)
+
+class _ArchivedIDs:
+    """
+    The IDs of archived tasks in ID order, updated as tasks enter and leave the
+    archive. Canonical numeric IDs are held in an int64 index, 8 bytes each;
+    any other IDs as their id_sort_key.
+    """
+    def __init__(self, task_ids: Iterable[str]):
+        self._numeric = SortedIndex(typecode="q")
+        self._other = SortedIndex()
+        for task_id in sorted(task_ids, key=id_sort_key):
+            self.add(task_id)
+
+    @staticmethod
+    def _numeric_id(task_id: str) -> Optional[int]:
+        numeric_id = parse_numeric_id(task_id)
+        return numeric_id if numeric_id is not None and numeric_id < _INT64_LIMIT else None
+
+    def add(self, task_id: str) -> None:
+        numeric_id = self._numeric_id(task_id)
+        if numeric_id is None:
+            self._other.add(id_sort_key(task_id))
+        else:
+            self._numeric.add(numeric_id)
+
+    def remove(self, task_id: str) -> None:
+        numeric_id = self._numeric_id(task_id)
+        if numeric_id is None:
+            self._other.remove(id_sort_key(task_id))
+        else:
+            self._numeric.remove(numeric_id)
+
+    def iter_from(self, after_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Yields archived IDs in ID order, starting after `after_id` if given.
+        """
+        after_key = None if after_id is None else id_sort_key(after_id)
+        if after_key is None:
+            numeric_ids: Iterable[int] = self._numeric
+        elif after_key[0] == 0:
+            numeric_ids = self._numeric.iter_from(after_key[1], inclusive=True)
+        else:
+            numeric_ids = ()
+        numeric_keys = ((0, numeric_id, str(numeric_id)) for numeric_id in numeric_ids)
+        if after_key is not None:
+            numeric_keys = dropwhile(lambda key: key <= after_key, numeric_keys)
+        for key in heapq.merge(numeric_keys, self._other.iter_from(after_key)):
+            yield key[-1]
+
+class TieredTaskManager:
+    """
+    Splits tasks into a hot working set, held by an ordinary TaskManager, and
+    a cold archive of tasks that were completed more than `archive_after`
+    seconds ago, held by a ColdTaskStore on disk.
+
+    Exposes the TaskManager interface used by the services. get_task falls
+    through to the archive. Listings, counts, scans and searches cover both
+    tiers: counts are O(1), and queries for incomplete tasks only touch the
+    working set, since every archived task is complete. Other queries merge
+    the working set's results with the archive's. ID-ordered pages walk an
+    index of archived IDs, updated as tasks are archived, promoted and deleted,
+    and read only the blocks holding the page; title order, scans and searches
+    stream the archive file once, keeping only the matches needed. Snapshots and
+    the change feed cover the working set only. Updating an archived task (for
+    example marking it incomplete) promotes it back into the working set, and
+    deleting one removes it from the archive.
+
+    Completion times are tracked from the hot manager's change feed. With a
+    `completion_log` path they are appended to that file (and flushed on every
+    sweep), so a restart keeps aging tasks from when they were completed; any
+    completed task without a logged time, such as one whose record was still
+    buffered at a crash, is aged from the moment the manager was created.
+    Opening reads only the logged tasks; completed tasks missing from the log
+    are looked up in the working set's status index by the first sweep. The
+    log is rewritten with current entries only when opened and once stale
+    records pile up. Timestamps come from `clock`, wall-clock time by default
+    so that they stay meaningful across restarts.
+
+    Archiving happens in the background of ordinary mutations: at most once
+    per `sweep_interval` seconds, a mutation archives up to one block of due
+    tasks, and further mutations continue while tasks remain due, so no write
+    pays for more than one block. archive_due() archives everything due at once.
+
+    Moving a task between tiers writes the destination first. A crash in
+    between leaves the task in both tiers, and on the next start the hot
+    copy wins.
+    """
+    def __init__(self, hot: TaskManager, cold: ColdTaskStore, archive_after: float,
+                 sweep_interval: Optional[float] = None, clock: Callable[[], float] = time.time,
+                 completion_log: Optional[str] = None):
+        if archive_after < 0:
+            raise ValueError("Archive age must not be negative.")
+        self._hot = hot
+        self._cold = cold
+        self._archive_after = archive_after
+        self._sweep_interval = archive_after / 10 if sweep_interval is None else sweep_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        # Bumped on every change to the archive; part of `version`.
+        self._cold_changes = 0
+        # Completed hot tasks in completion order, with the time each was completed.
+        self._completed_at: "OrderedDict[str, float]" = OrderedDict()
+        now = clock()
+        self._created_at = now
+        self._next_sweep = now + self._sweep_interval
+        cold.remove_many([task_id for task_id in cold.task_ids() if hot.get_task(task_id) is not None])
+        self._cold_ids = _ArchivedIDs(cold.task_ids())
+        logged = _read_completion_log(completion_log) if completion_log is not None else {}
+        completed: List[Tuple[float, str]] = []
+        for task_id, completed_at in logged.items():
+            task = hot.get_task(task_id)
+            if task is not None and task.is_complete:
+                completed.append((completed_at, task_id))
+        completed.sort()
+        self._completed_at.update((task_id, completed_at) for completed_at, task_id in completed)
+        # Whether completed hot tasks missing from the log have been looked for.
+        self._unlogged_found = False
+        self._completion_log_path = completion_log
+        self._completion_log = None
+        self._completion_records = 0
+        if completion_log is not None:
+            self._rewrite_completion_log()
+        hot.change_feed.subscribe(self._on_change)
+
+    @property
+    def hot(self) -> TaskManager:
+        return self._hot
+
+    @property
+    def version(self) -> int:
+        """
+        A counter bumped by every change to either tier.
+        """
+        return self._hot.version + self._cold_changes
+
+    @property
+    def change_feed(self) -> ChangeFeed:
+        """
+        The working set's change feed; archiving a task appears as its deletion.
+        """
+        return self._hot.change_feed
+
+    @property
+    def archived_count(self) -> int:
+        return len(self._cold)
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        # An edit re-ages a completed task, since it evidently still changes.
+        self._completed_at.pop(event.task_id, None)
+        if event.after is not None and event.after.is_complete:
+            completed_at = self._completed_at[event.after.id] = self._clock()
+            if self._completion_log is not None:
+                self._completion_log.write(json.dumps([event.after.id, completed_at]) + "\n")
+                self._completion_records += 1
+
+    def _rewrite_completion_log(self) -> None:
+        """
+        Replaces the completion log with one record per completed hot task.
+        """
+        if self._completion_log is not None:
+            self._completion_log.close()
+        path = self._completion_log_path
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as log_file:
+            for task_id, completed_at in self._completed_at.items():
+                log_file.write(json.dumps([task_id, completed_at]) + "\n")
+            log_file.flush()
+            os.fsync(log_file.fileno())
+        os.replace(temp_path, path)
+        fsync_directory(os.path.dirname(os.path.abspath(path)))
+        self._completion_log = open(path, "a", encoding="utf-8")
+        self._completion_records = len(self._completed_at)
+
+    def _flush_completion_log(self) -> None:
+        if self._completion_log is None:
+            return
+        if self._completion_records - len(self._completed_at) >= _MIN_STALE_COMPLETIONS_BEFORE_COMPACTION:
+            self._rewrite_completion_log()
+        else:
+            self._completion_log.flush()
+
+    def _find_unlogged_completions(self) -> None:
+        """
+        Starts tracking completed hot tasks that have no logged completion time,
+        aging them from the moment the manager was created.
+        """
+        self._unlogged_found = True
+        if self._hot.count_tasks(True) == len(self._completed_at):
+            return
+        completed = [(completed_at, task_id) for task_id, completed_at in self._completed_at.items()]
+        cursor = None
+        while True:
+            page = self._hot.find_tasks(True, limit=ARCHIVE_BLOCK_SIZE, after_id=cursor)
+            if not page:
+                break
+            completed += [(self._created_at, task.id) for task in page if task.id not in self._completed_at]
+            cursor = page[-1].id
+        completed.sort()
+        self._completed_at = OrderedDict((task_id, completed_at) for completed_at, task_id in completed)
+        if self._completion_log is not None:
+            self._rewrite_completion_log()
+
+    def _archive_changed(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        self._cold_changes += 1
+        for task_id in added:
+            self._cold_ids.add(task_id)
+        for task_id in removed:
+            self._cold_ids.remove(task_id)
+
+    def _maybe_archive(self) -> None:
+        if self._clock() >= self._next_sweep:
+            self.archive_due(max_blocks=1)
+
+    def archive_due(self, max_blocks: Optional[int] = None) -> int:
+        """
+        Moves tasks completed more than `archive_after` seconds ago to the cold
+        store, ARCHIVE_BLOCK_SIZE at a time: all of them, or at most `max_blocks`
+        blocks. Returns the number of tasks archived.
+        """
+        with self._lock:
+            if not self._unlogged_found:
+                self._find_unlogged_completions()
+            now = self._clock()
+            self._next_sweep = now + self._sweep_interval
+            self._flush_completion_log()
+            cutoff = now - self._archive_after
+            archived = 0
+            blocks = 0
+            while True:
+                due: List[str] = []
+                for task_id, completed_at in self._completed_at.items():
+                    if completed_at > cutoff or len(due) == ARCHIVE_BLOCK_SIZE:
+                        break
+                    due.append(task_id)
+                if not due:
+                    return archived
+                if max_blocks is not None and blocks == max_blocks:
+                    # More is due: let the next mutation carry on instead of waiting a sweep interval.
+                    self._next_sweep = now
+                    return archived
+                tasks = [self._hot.get_task(task_id) for task_id in due]
+                self._cold.add_many(tasks)
+                self._archive_changed(added=due)
+                self._hot.apply_batch(deleted=due)
+                archived += len(due)
+                blocks += 1
+
+    def add_task(self, task: Task) -> None:
+        """
+        Adds a task to the working set. Raises ValueError if ID already exists in either tier.
+        """
+        with self._lock:
+            if task.id in self._cold:
+                raise ValueError(f"Task with ID '{task.id}' already exists.")
+            self._hot.add_task(task)
+            self._maybe_archive()
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """
+        Retrieves a task by ID from the working set, else from the archive. Returns None if not found.
+        """
+        task = self._hot.get_task(task_id)
+        if task is None:
+            task = self._cold.get(task_id)
+        return task
+
+    def get_all_tasks(self) -> List[Task]:
+        """
+        Returns a list of all tasks, the working set's first.
+        """
+        with self._lock:
+            if not len(self._cold):
+                return self._hot.get_all_tasks()
+            return self._hot.get_all_tasks() + list(self._cold.iter_tasks())
+
+    def update_task(self, updated_task: Task) -> None:
+        """
+        Updates an existing task, promoting it if it is archived. Raises ValueError if task does not exist.
+        """
+        with self._lock:
+            if updated_task.id in self._cold:
+                self._hot.add_task(updated_task)
+                self._cold.remove_many([updated_task.id])
+                self._archive_changed(removed=[updated_task.id])
+            else:
+                self._hot.update_task(updated_task)
+            self._maybe_archive()
+
+    def delete_task(self, task_id: str) -> None:
+        """
+        Deletes a task by ID from whichever tier holds it. Raises ValueError if task does not exist.
+        """
+        with self._lock:
+            if task_id in self._cold:
+                self._cold.remove_many([task_id])
+                self._archive_changed(removed=[task_id])
+            else:
+                self._hot.delete_task(task_id)
+            self._maybe_archive()
+
+    def apply_batch(self, added: Sequence[Task] = (), updated: Sequence[Task] = (),
+                    deleted: Sequence[str] = ()) -> None:
+        """
+        Applies many mutations as one batch: the working set's part is atomic, and
+        archived tasks that are updated or deleted leave the archive only after it succeeded.
+        """
+        with self._lock:
+            cold = self._cold
+            seen: Set[str] = set()
+            for task_id in chain((task.id for task in added), (task.id for task in updated), deleted):
+                if task_id in seen:
+                    raise ValueError(f"Task with ID '{task_id}' appears more than once in the batch.")
+                seen.add(task_id)
+            for task in added:
+                if task.id in cold:
+                    raise ValueError(f"Task with ID '{task.id}' already exists.")
+            promoted = [task for task in updated if task.id in cold]
+            archived_deleted = [task_id for task_id in deleted if task_id in cold]
+            self._hot.apply_batch(
+                added=list(added) + promoted,
+                updated=[task for task in updated if task.id not in cold],
+                deleted=[task_id for task_id in deleted if task_id not in cold],
+            )
+            if promoted or archived_deleted:
+                removed = [task.id for task in promoted] + archived_deleted
+                cold.remove_many(removed)
+                self._archive_changed(removed=removed)
+            self._maybe_archive()
+
+    def count_tasks(self, is_complete: Optional[bool] = None) -> int:
+        """
+        Returns the number of tasks in both tiers, optionally only those with the given status.
+        """
+        with self._lock:
+            archived = 0 if is_complete is False else len(self._cold)
+            return self._hot.count_tasks(is_complete) + archived
+
+    def find_tasks(self, is_complete: Optional[bool] = None, order_by: str = "id",
+                   limit: Optional[int] = None, offset: int = 0,
+                   after_id: Optional[str] = None) -> List[Task]:
+        """
+        Returns tasks from both tiers in the requested order; see TaskManager.find_tasks.
+        """
+        with self._lock:
+            if is_complete is False or not len(self._cold):
+                return self._hot.find_tasks(is_complete, order_by, limit, offset, after_id)
+            # Each tier returns its first offset + limit matches; the merged page is cut from those.
+            needed = None if limit is None else offset + limit
+            hot = self._hot.find_tasks(is_complete, order_by, needed, 0, after_id)
+            if order_by == "id":
+                cold = self._cold.get_many(islice(self._cold_ids.iter_from(after_id), needed))
+            else:
+                cold = _smallest(self._cold.iter_tasks(), needed, lambda task: task_sort_key(task, order_by))
+        merged = heapq.merge(hot, cold, key=lambda task: task_sort_key(task, order_by))
+        return list(islice(merged, offset, needed))
+
+    def scan_tasks(self, contains: str, is_complete: Optional[bool] = None,
+                   limit: Optional[int] = None) -> List[Task]:
+        """
+        Returns tasks from both tiers in ID order whose title or description contains the text.
+        """
+        with self._lock:
+            if is_complete is False or not len(self._cold):
+                return self._hot.scan_tasks(contains, is_complete, limit)
+            hot = self._hot.scan_tasks(contains, is_complete, limit)
+            needle = contains.casefold()
+            matches = (task for task in self._cold.iter_tasks()
+                       if needle in task.title.casefold()
+                       or (task.description is not None and needle in task.description.casefold()))
+            cold = _smallest(matches, limit, lambda task: id_sort_key(task.id))
+        return list(islice(heapq.merge(hot, cold, key=lambda task: id_sort_key(task.id)), limit))
+
+    def search_tasks(self, query: str, limit: int = 10) -> List[Tuple[float, Task]]:
+        """
+        Returns up to `limit` (score, task) pairs from the best matches of both tiers.
+        Each tier scores against its own term statistics, as the shards of a ShardedTaskManager do.
+        """
+        with self._lock:
+            hits = self._hot.search_tasks(query, limit)
+            if len(self._cold):
+                ranked = search_stream(self._cold.iter_tasks(), query, limit)
+                tasks = self._cold.get_many(task_id for _, task_id in ranked)
+                hits += [(score, task) for (score, _), task in zip(ranked, tasks)]
+        return heapq.nsmallest(limit, hits, key=lambda hit: (-hit[0], id_sort_key(hit[1].id)))
+
+    def snapshot(self) -> TaskSnapshot:
+        return self._hot.snapshot()
+
+    def task_lock(self, task_id: str) -> ContextManager:
+        return self._hot.task_lock(task_id)
+
+    def task_locks(self, task_ids: Iterable[str]) -> ContextManager:
+        return self._hot.task_locks(task_ids)
+
+    def close(self) -> None:
+        """
+        Stops tracking the working set and closes the archive and completion log files.
+        """
+        self._hot.change_feed.unsubscribe(self._on_change)
+        if self._completion_log is not None:
+            self._completion_log.close()
+        self._cold.close()
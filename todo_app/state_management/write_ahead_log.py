@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+# Buffered records are written to the file once this many are pending.
+_WRITE_THRESHOLD = 1024
+
+class DurabilityMode(Enum):
+    """
+    Controls when appended log records are forced to stable storage.
+    """
+    ALWAYS = "always"      # fsync before every mutation returns
+    INTERVAL = "interval"  # fsync from a background thread every N milliseconds
+    NEVER = "never"        # leave flushing to the operating system
+
+class WriteAheadLog:
+    """
+    Append-only log of task mutations, one JSON array per line.
+    Records are buffered in memory and written out as a group, so a batch of
+    mutations costs a single write and (depending on the durability mode) a single fsync.
+    """
+    def __init__(self, path: str, durability: DurabilityMode = DurabilityMode.ALWAYS,
+                 fsync_interval_ms: int = 100):
+        if fsync_interval_ms <= 0:
+            raise ValueError("fsync interval must be a positive number of milliseconds.")
+        self._path = path
+        self._durability = durability
+        self._fsync_interval = fsync_interval_ms / 1000.0
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._batch_depth = 0
+        self._dirty = False
+        self._file = open(path, "ab")
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+        if durability is DurabilityMode.INTERVAL:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="wal-flusher", daemon=True)
+            self._flusher.start()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def append(self, record: list) -> None:
+        """
+        Queues a record for the log. Outside a batch the record is committed
+        according to the durability mode before this call returns.
+        """
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._closed:
+                raise ValueError("Write-ahead log is closed.")
+            self._pending.append(line)
+            if self._batch_depth == 0:
+                self._commit_locked()
+            elif len(self._pending) >= _WRITE_THRESHOLD:
+                # Long batches still stream to the file; only the fsync waits for the end.
+                self._write_pending_locked()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Groups all records appended inside the block into a single commit.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and not self._closed:
+                    self._commit_locked()
+
+    def sync(self) -> None:
+        """
+        Writes out any buffered records and forces them to disk regardless of durability mode.
+        """
+        with self._lock:
+            if not self._closed:
+                self._write_pending_locked()
+                self._fsync_locked()
+
+    def close(self) -> None:
+        """
+        Flushes outstanding records and releases the file handle.
+        """
+        if self._flusher is not None:
+            self._stop_flusher.set()
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._closed:
+                return
+            self._write_pending_locked()
+            if self._durability is not DurabilityMode.NEVER:
+                self._fsync_locked()
+            self._file.close()
+            self._closed = True
+
+    def _commit_locked(self) -> None:
+        if self._durability is DurabilityMode.NEVER:
+            # Keep records buffered until they are worth a write call.
+            if len(self._pending) >= _WRITE_THRESHOLD:
+                self._write_pending_locked()
+            return
+        self._write_pending_locked()
+        if self._durability is DurabilityMode.ALWAYS:
+            self._fsync_locked()
+
+    def _write_pending_locked(self) -> None:
+        if not self._pending:
+            return
+        self._pending.append("")
+        self._file.write("\n".join(self._pending).encode("utf-8"))
+        self._file.flush()
+        self._pending.clear()
+        self._dirty = True
+
+    def _fsync_locked(self) -> None:
+        if self._dirty:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flusher.wait(self._fsync_interval):
+            with self._lock:
+                if not self._closed:
+                    self._fsync_locked()
+
+    @staticmethod
+    def read_records(path: str, chunk_lines: int = 8192) -> Iterator[Tuple[int, list]]:
+        """
+        Yields (end_offset, record) for every complete record in the log.
+        Lines are decoded a chunk at a time with a single json.loads call, which is
+        several times faster than decoding them one by one. Reading stops at the
+        first torn or corrupt line, which can only be the tail of a write that never finished.
+        """
+        if not os.path.exists(path):
+            return
+        offset = 0
+        with open(path, "rb") as log_file:
+            while True:
+                raw_lines = list(islice(log_file, chunk_lines))
+                if not raw_lines:
+                    return
+                try:
+                    if not raw_lines[-1].endswith(b"\n"):
+                        raise ValueError("torn tail")
+                    records = json.loads(b"[" + b",".join(raw_lines) + b"]")
+                except ValueError:
+                    records = None
+                if records is not None and len(records) == len(raw_lines):
+                    for raw_line, record in zip(raw_lines, records):
+                        offset += len(raw_line)
+                        yield offset, record
+                    continue
+                for raw_line in raw_lines:
+                    if not raw_line.endswith(b"\n"):
+                        return
+                    try:
+                        record = json.loads(raw_line)
+                    except ValueError:
+                        return
+                    offset += len(raw_line)
+                    yield offset, record
+                return
+
+def fsync_directory(directory: str) -> None:
+    """
+    Makes a rename or file creation inside the directory durable where the platform allows it.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
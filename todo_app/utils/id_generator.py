@@ -1,13 +1,151 @@
+import json
+import os
+import threading
+from typing import List, Optional, Tuple
+from todo_app.state_management.write_ahead_log import fsync_directory
+
 class SequentialIDGenerator:
     """
-    Generates unique sequential integer IDs. IDs reset on application start.
+    Generates unique sequential integer IDs. IDs reset on application start
+    unless a starting point is supplied (e.g. the highest ID recovered from disk).
+    Safe to share between threads.
+    """
+    def __init__(self, start: int = 0):
+        self._current_id = start
+        self._lock = threading.Lock()
+
+    def generate_id(self) -> str:
+        """
+        Generates a new sequential integer ID as a string.
+        """
+        with self._lock:
+            self._current_id += 1
+            return str(self._current_id)
+
+    def reserve_ids(self, count: int) -> List[str]:
+        """
+        Reserves a contiguous block of `count` IDs in one step.
+        """
+        if count < 0:
+            raise ValueError("Cannot reserve a negative number of IDs.")
+        with self._lock:
+            first = self._current_id + 1
+            self._current_id += count
+        return [str(value) for value in range(first, first + count)]
+
+def parse_numeric_id(task_id: str) -> Optional[int]:
+    """
+    Returns the integer value of a canonical decimal ID ("42", not "042" or "４２"),
+    or None for anything else. Only canonical IDs round-trip through int and back.
+    """
+    if (isinstance(task_id, str) and task_id.isascii() and task_id.isdigit()
+            and (task_id[0] != "0" or task_id == "0")):
+        return int(task_id)
+    return None
+
+class BlockIDGenerator:
+    """
+    Generates sequential integer IDs from blocks reserved ahead of use, optionally
+    persisting the reservation so a restart never hands out an ID twice.
+
+    IDs are grouped into blocks of `block_size`; block b covers
+    b * block_size + 1 .. (b + 1) * block_size. When `state_path` is given, the
+    next unreserved block is written there (atomically, and fsynced) before any
+    ID of a new block is handed out, and close() also records the last ID
+    actually issued. After a clean shutdown allocation resumes right after that
+    ID, within the same block; after a crash the last issued ID is unknown, so
+    it resumes from the next unreserved block, skipping whatever was left of the
+    previous one.
+
+    Interchangeable with SequentialIDGenerator; safe to share between threads.
     """
-    def __init__(self):
-        self._current_id = 0
+    def __init__(self, state_path: Optional[str] = None, block_size: int = 1000, start: int = 0):
+        if block_size <= 0:
+            raise ValueError("Block size must be positive.")
+        self._state_path = state_path
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        # IDs self._next_id .. self._block_end (inclusive) are reserved and unused.
+        self._next_id = 0
+        self._block_end = -1
+        # Never reuse IDs at or below `start` (e.g. the highest ID already stored).
+        self._next_block = -(-start // block_size)
+        saved_block, last_id = self._load_state()
+        if saved_block is not None and saved_block > self._next_block:
+            self._next_block = saved_block
+            last_block = saved_block - 1
+            if last_id is not None and max(start, last_block * block_size) <= last_id:
+                self._next_id = last_id + 1
+                self._block_end = (last_block + 1) * block_size
+                # Until the next close() the last issued ID is unknown again.
+                self._save_state()
+
+    def _load_state(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Returns the saved next unreserved block and last issued ID (None when unknown).
+        """
+        if self._state_path is None or not os.path.exists(self._state_path):
+            return None, None
+        with open(self._state_path, encoding="utf-8") as state_file:
+            state = json.load(state_file)
+        if state.get("block_size") != self._block_size:
+            raise ValueError(
+                f"ID state in '{self._state_path}' was written with block size {state.get('block_size')}; "
+                f"it cannot be resumed with {self._block_size}."
+            )
+        return state["next_block"], state.get("last_id")
+
+    def _save_state(self, last_id: Optional[int] = None) -> None:
+        if self._state_path is None:
+            return
+        temp_path = self._state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump({"next_block": self._next_block, "block_size": self._block_size, "last_id": last_id}, state_file)
+            state_file.flush()
+            os.fsync(state_file.fileno())
+        os.replace(temp_path, self._state_path)
+        fsync_directory(os.path.dirname(os.path.abspath(self._state_path)))
+
+    def _reserve_block(self) -> None:
+        block = self._next_block
+        self._next_block = block + 1
+        self._save_state()
+        self._next_id = block * self._block_size + 1
+        self._block_end = (block + 1) * self._block_size
 
     def generate_id(self) -> str:
         """
         Generates a new sequential integer ID as a string.
         """
-        self._current_id += 1
-        return str(self._current_id)
+        with self._lock:
+            if self._next_id > self._block_end:
+                self._reserve_block()
+            task_id = self._next_id
+            self._next_id += 1
+        return str(task_id)
+
+    def reserve_ids(self, count: int) -> List[str]:
+        """
+        Reserves `count` IDs in one step. They are ascending and contiguous, spanning
+        a block boundary when the current block runs out.
+        """
+        if count < 0:
+            raise ValueError("Cannot reserve a negative number of IDs.")
+        task_ids: List[str] = []
+        with self._lock:
+            while len(task_ids) < count:
+                if self._next_id > self._block_end:
+                    self._reserve_block()
+                last = min(self._block_end, self._next_id + count - len(task_ids) - 1)
+                task_ids.extend(str(value) for value in range(self._next_id, last + 1))
+                self._next_id = last + 1
+        return task_ids
+
+    def close(self) -> None:
+        """
+        Records the last issued ID, so the next run continues right after it
+        instead of at the next block. Nothing may be generated after this.
+        """
+        with self._lock:
+            if self._next_id <= self._block_end:
+                self._save_state(self._next_id - 1)
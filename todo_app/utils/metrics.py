@@ -0,0 +1,224 @@
+import functools
+import json
+from collections import Counter
+from itertools import repeat
+from operator import rshift
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency histogram layout: values below 16ns get a bucket each; above that every
+# power of two is split into 8 linear sub-buckets, so a bucket's width is at most
+# 12.5% of its value. 512 buckets reach far beyond any realistic latency.
+_SUB_BUCKET_BITS = 3
+_HISTOGRAM_SIZE = 512
+# Raw latencies are buffered and folded into the histogram this many at a time.
+_FOLD_EVERY = 1024
+
+def _bucket_index(elapsed_ns: int) -> int:
+    if elapsed_ns < 16:
+        return elapsed_ns if elapsed_ns > 0 else 0
+    shift = elapsed_ns.bit_length() - (_SUB_BUCKET_BITS + 1)
+    return min((shift << _SUB_BUCKET_BITS) + (elapsed_ns >> shift), _HISTOGRAM_SIZE - 1)
+
+def _bucket_bounds(index: int) -> Tuple[int, float]:
+    """Returns the [lower, upper) latency range in nanoseconds covered by a bucket."""
+    if index < 16:
+        return index, index + 1
+    if index == _HISTOGRAM_SIZE - 1:
+        return _bucket_bounds(index - 1)[1], float("inf")
+    shift = (index >> _SUB_BUCKET_BITS) - 1
+    lower = ((index & 7) + 8) << shift
+    return lower, lower + (1 << shift)
+
+def error_type_name(error: BaseException) -> str:
+    """
+    Classifies an exception the way the dispatcher reports it: TypeError, ValueError or other.
+    """
+    if isinstance(error, TypeError):
+        return "TypeError"
+    if isinstance(error, ValueError):
+        return "ValueError"
+    return "other"
+
+class OperationStats:
+    """
+    Call count, errors by type and a latency histogram for one named operation.
+
+    Recording only appends the raw latency to a short buffer; the buffer is
+    folded into the histogram every _FOLD_EVERY calls (or when the stats are
+    read), which keeps the per-call cost to a list append. Updates
+    take no lock; under threads a few samples may be lost, which is acceptable
+    for diagnostics.
+    """
+    __slots__ = ("errors", "total_ns", "max_ns", "_folded_calls", "_buckets", "pending")
+
+    def __init__(self):
+        self.pending: List[int] = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.errors: Dict[str, int] = {}
+        self.total_ns = 0
+        self.max_ns = 0
+        self._folded_calls = 0
+        self._buckets = [0] * _HISTOGRAM_SIZE
+        # Cleared in place: timed wrappers hold a reference to this list.
+        self.pending.clear()
+
+    @property
+    def calls(self) -> int:
+        return self._folded_calls + len(self.pending)
+
+    def record(self, elapsed_ns: int, error_type: Optional[str] = None) -> None:
+        self.pending.append(elapsed_ns)
+        if error_type is not None:
+            self.errors[error_type] = self.errors.get(error_type, 0) + 1
+        if len(self.pending) >= _FOLD_EVERY:
+            self.fold()
+
+    def fold(self) -> None:
+        """
+        Moves the buffered latencies into the histogram. Latencies are counted in C
+        after dropping the low bits that no bucket in range can distinguish, so the
+        Python work is per distinct value rather than per call.
+        """
+        pending = self.pending
+        if not pending:
+            return
+        shortest, longest = min(pending), max(pending)
+        # The narrowest bucket in range is 1/8 of the shortest latency's power of two.
+        shift = max(0, shortest.bit_length() - (_SUB_BUCKET_BITS + 1))
+        buckets = self._buckets
+        for quantum, count in Counter(map(rshift, pending, repeat(shift))).items():
+            buckets[_bucket_index(quantum << shift)] += count
+        self._folded_calls += len(pending)
+        self.total_ns += sum(pending)
+        if longest > self.max_ns:
+            self.max_ns = longest
+        pending.clear()
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the latency (in nanoseconds) below which `fraction` of the calls completed.
+        """
+        self.fold()
+        if not self._folded_calls:
+            return 0.0
+        rank = max(1, int(fraction * self._folded_calls + 0.5))
+        seen = 0
+        for index, count in enumerate(self._buckets):
+            seen += count
+            if seen >= rank:
+                lower, upper = _bucket_bounds(index)
+                return min((lower + upper) / 2, float(self.max_ns))
+        return float(self.max_ns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        self.fold()
+        calls = self._folded_calls
+        return {
+            "calls": calls,
+            "errors": dict(self.errors),
+            "mean_us": round(self.total_ns / calls / 1000, 3) if calls else 0.0,
+            "p50_us": round(self.percentile(0.50) / 1000, 3),
+            "p95_us": round(self.percentile(0.95) / 1000, 3),
+            "p99_us": round(self.percentile(0.99) / 1000, 3),
+            "max_us": round(self.max_ns / 1000, 3),
+        }
+
+class Metrics:
+    """
+    Registry of per-operation counters and latency histograms.
+
+    Nothing is measured unless a Metrics instance is handed to a component:
+    instrumented code holds the OperationStats it records into, so enabling
+    costs two clock reads and a few increments per call, and disabled code
+    paths contain no measurement at all.
+    """
+    def __init__(self):
+        self._operations: Dict[str, OperationStats] = {}
+
+    def operation(self, name: str) -> OperationStats:
+        """
+        Returns the stats for `name`, creating them on first use.
+        """
+        stats = self._operations.get(name)
+        if stats is None:
+            stats = self._operations[name] = OperationStats()
+        return stats
+
+    def timed(self, name: str, function: Callable) -> Callable:
+        """
+        Wraps `function` so every call is counted and timed under `name`.
+        Exceptions are recorded by type and re-raised.
+        """
+        stats = self.operation(name)
+        clock = perf_counter_ns
+        pending = stats.pending
+        append = pending.append
+
+        @functools.wraps(function)
+        def measured(*args, **kwargs):
+            started = clock()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                stats.record(clock() - started, error_type_name(e))
+                raise
+            # OperationStats.record, inlined for the common successful call.
+            append(clock() - started)
+            if len(pending) >= _FOLD_EVERY:
+                stats.fold()
+            return result
+        return measured
+
+    def instrument(self, target: object, method_names: Iterable[str], prefix: str) -> None:
+        """
+        Replaces each named method on the `target` instance with a timed version
+        recorded as `prefix + method name`.
+        """
+        for method_name in method_names:
+            setattr(target, method_name, self.timed(prefix + method_name, getattr(target, method_name)))
+
+    def reset(self) -> None:
+        """
+        Zeroes every operation in place; instrumented code keeps recording into the same stats.
+        """
+        for stats in self._operations.values():
+            stats.reset()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the stats of every operation that has been called at least once, by name.
+        """
+        return {name: self._operations[name].to_dict()
+                for name in sorted(self._operations) if self._operations[name].calls}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the current metrics to `path` as JSON.
+        """
+        with open(path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(self.to_json())
+
+    def report(self) -> str:
+        """
+        Formats one line per operation with call counts, errors and latency percentiles.
+        """
+        recorded = self.to_dict()
+        if not recorded:
+            return "No operations recorded yet."
+        lines = [f"{'operation':<38} {'calls':>8} {'errors':>7} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'max us':>9}"]
+        for name, stats in recorded.items():
+            error_count = sum(stats["errors"].values())
+            lines.append(
+                f"{name:<38} {stats['calls']:>8} {error_count:>7} {stats['p50_us']:>9.1f} "
+                f"{stats['p95_us']:>9.1f} {stats['p99_us']:>9.1f} {stats['max_us']:>9.1f}"
+            )
+            if stats["errors"]:
+                breakdown = ", ".join(f"{kind}={count}" for kind, count in sorted(stats["errors"].items()))
+                lines.append(f"{'':<38} errors: {breakdown}")
+        return "\n".join(lines)
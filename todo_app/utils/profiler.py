@@ -0,0 +1,208 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from types import FrameType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Rows shown in the hotspot and allocation tables.
+DEFAULT_TOP = 25
+# Seconds between stack samples for the collapsed-stack output.
+DEFAULT_SAMPLE_INTERVAL = 0.001
+
+_active_lock = threading.Lock()
+_active = False
+
+def profile_requested(argv: Sequence[str]) -> bool:
+    """
+    Returns True if the command-line arguments ask for --profile, so profiling
+    can start before argparse (and the imports it would wait for) has run.
+    """
+    return any(arg == "--profile" or arg.startswith("--profile=") for arg in argv)
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+@dataclass(frozen=True)
+class Hotspot:
+    function: str
+    calls: int
+    own_seconds: float
+    cumulative_seconds: float
+
+@dataclass(frozen=True)
+class AllocationSite:
+    location: str
+    size_bytes: int
+    blocks: int
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """
+    What one profiling run measured: functions ranked by their own time,
+    the sites holding the most traced memory when it ended, and sampled call
+    stacks counted per distinct stack.
+    """
+    label: str
+    seconds: float
+    peak_bytes: int
+    hotspots: List[Hotspot]
+    allocations: List[AllocationSite]
+    stacks: Dict[str, int]
+
+    def format(self) -> str:
+        lines = [f"Profile '{self.label}': {self.seconds:.3f}s wall, peak traced memory "
+                 f"{self.peak_bytes / 1024:,.1f} KiB, {sum(self.stacks.values())} stack samples.", "",
+                 f"{'calls':>10} {'own ms':>10} {'cum ms':>10}  function"]
+        for hotspot in self.hotspots:
+            lines.append(f"{hotspot.calls:>10} {hotspot.own_seconds * 1000:>10.2f} "
+                         f"{hotspot.cumulative_seconds * 1000:>10.2f}  {hotspot.function}")
+        lines += ["", f"{'KiB':>10} {'blocks':>10}  allocation site (live at end)"]
+        for site in self.allocations:
+            lines.append(f"{site.size_bytes / 1024:>10.1f} {site.blocks:>10}  {site.location}")
+        return "\n".join(lines)
+
+    def write_folded(self, path: str) -> None:
+        """
+        Writes the sampled stacks in collapsed-stack format ("outer;inner count"
+        per line), the input format of flamegraph.pl, speedscope and similar tools.
+        """
+        with open(path, "w", encoding="utf-8") as folded_file:
+            for stack, count in sorted(self.stacks.items()):
+                folded_file.write(f"{stack} {count}\n")
+
+    def save(self, directory: str) -> Tuple[str, str]:
+        """
+        Writes <label>.txt (the tables) and <label>.folded (the stacks) into
+        `directory` and returns their paths.
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.label.replace(os.sep, "_").replace(" ", "_"))
+        with open(base + ".txt", "w", encoding="utf-8") as report_file:
+            report_file.write(self.format() + "\n")
+        self.write_folded(base + ".folded")
+        return base + ".txt", base + ".folded"
+
+class Profiler:
+    """
+    Profiles the calling thread between start() and stop() three ways at once:
+    cProfile for per-function time, tracemalloc for allocation sites, and a
+    sampling thread that records the thread's call stack every
+    `sample_interval` seconds for flame graphs.
+
+    The sampler only runs when the profiled thread yields the GIL, so the GIL
+    switch interval is shortened to the sample interval while profiling. All
+    three add overhead, so absolute times are inflated; the rankings are what
+    matter. Only one Profiler can run at a time.
+    """
+    def __init__(self, label: str, sample_interval: float = DEFAULT_SAMPLE_INTERVAL, top: int = DEFAULT_TOP):
+        if sample_interval <= 0:
+            raise ValueError("Sample interval must be positive.")
+        self.label = label
+        self._sample_interval = sample_interval
+        self._top = top
+        self._profile = cProfile.Profile()
+        self._stacks: Counter = Counter()
+        self._stop_sampling = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+        self._switch_interval = 0.0
+        self._started = 0.0
+        self.report: Optional[ProfileReport] = None
+
+    def start(self) -> "Profiler":
+        global _active
+        with _active_lock:
+            if _active:
+                raise ValueError("Another profile is already running.")
+            _active = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self._sample_interval))
+        self._sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),),
+                                         name="profiler-sampler", daemon=True)
+        self._sampler.start()
+        self._started = time.perf_counter()
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Some other profiler (e.g. python -m cProfile) already owns the hooks.
+            self._finish()
+            raise ValueError("Another profiler is already active in this process.") from None
+        return self
+
+    def _sample(self, thread_id: int) -> None:
+        stacks = self._stacks
+        while not self._stop_sampling.wait(self._sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                stacks[";".join(reversed(names))] += 1
+
+    def _finish(self) -> None:
+        """
+        Stops the sampler and tracemalloc (if this profiler started it) and releases the single-profiler slot.
+        """
+        global _active
+        self._stop_sampling.set()
+        self._sampler.join()
+        sys.setswitchinterval(self._switch_interval)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        with _active_lock:
+            _active = False
+
+    def stop(self) -> ProfileReport:
+        self._profile.disable()
+        seconds = time.perf_counter() - self._started
+        # Stop sampling first so the snapshot filtering below stays out of the stacks.
+        self._stop_sampling.set()
+        self._sampler.join()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        self._finish()
+        return ProfileReport(
+            label=self.label,
+            seconds=seconds,
+            peak_bytes=peak_bytes,
+            hotspots=self._hotspots(),
+            allocations=[
+                AllocationSite(str(statistic.traceback[0]), statistic.size, statistic.count)
+                for statistic in snapshot.statistics("lineno")[:self._top]
+            ],
+            stacks=dict(self._stacks),
+        )
+
+    def _hotspots(self) -> List[Hotspot]:
+        stats = pstats.Stats(self._profile).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:self._top]
+        return [
+            Hotspot(
+                function=f"{function} ({os.path.basename(path)}:{line})" if line else function,
+                calls=calls,
+                own_seconds=own_seconds,
+                cumulative_seconds=cumulative_seconds,
+            )
+            for (path, line, function), (_, calls, own_seconds, cumulative_seconds, _) in ranked
+        ]
+
+    def __enter__(self) -> "Profiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.report = self.stop()
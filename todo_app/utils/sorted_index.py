@@ -0,0 +1,112 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Iterator, List, MutableSequence, Optional
+
+class SortedIndex:
+    """
+    An ordered collection of comparable keys stored as a list of bounded buckets.
+    Inserts and removals touch a single bucket (O(log n) search plus a short memmove),
+    the length is tracked as a counter, and ordered iteration can start at any key
+    or position without sorting or copying the whole collection.
+
+    With an array `typecode` (e.g. "q" for 64-bit integers) the buckets are
+    typed arrays, storing each key in 8 bytes instead of as a Python object.
+    """
+    def __init__(self, bucket_size: int = 1000, typecode: Optional[str] = None):
+        if bucket_size < 2:
+            raise ValueError("Bucket size must be at least 2.")
+        self._bucket_size = bucket_size
+        self._typecode = typecode
+        self._buckets: List[MutableSequence[Any]] = []
+        self._maxes: List[Any] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __contains__(self, key: Any) -> bool:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        bucket = self._buckets[pos]
+        i = bisect_left(bucket, key)
+        return i < len(bucket) and bucket[i] == key
+
+    def add(self, key: Any) -> None:
+        """
+        Inserts a key, keeping the collection ordered.
+        """
+        if not self._buckets:
+            self._buckets.append([key] if self._typecode is None else array(self._typecode, [key]))
+            self._maxes.append(key)
+            self._len = 1
+            return
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            # Appending past the current maximum is the common case for sequential IDs.
+            pos -= 1
+            self._buckets[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._buckets[pos], key)
+        self._len += 1
+        bucket = self._buckets[pos]
+        if len(bucket) > 2 * self._bucket_size:
+            half = len(bucket) // 2
+            self._buckets.insert(pos + 1, bucket[half:])
+            del bucket[half:]
+            self._maxes.insert(pos, bucket[-1])
+
+    def remove(self, key: Any) -> None:
+        """
+        Removes a key. Raises ValueError if it is not present.
+        """
+        pos = bisect_left(self._maxes, key)
+        if pos < len(self._maxes):
+            bucket = self._buckets[pos]
+            i = bisect_left(bucket, key)
+            if i < len(bucket) and bucket[i] == key:
+                del bucket[i]
+                self._len -= 1
+                if bucket:
+                    self._maxes[pos] = bucket[-1]
+                else:
+                    del self._buckets[pos]
+                    del self._maxes[pos]
+                return
+        raise ValueError(f"Key {key!r} is not in the index.")
+
+    def iter_from(self, key: Optional[Any] = None, inclusive: bool = False) -> Iterator[Any]:
+        """
+        Iterates keys in order, starting after `key` (or at it when inclusive).
+        With no key the iteration starts at the smallest key.
+        """
+        if key is None:
+            yield from self
+            return
+        find = bisect_left if inclusive else bisect_right
+        pos = find(self._maxes, key)
+        if pos == len(self._maxes):
+            return
+        bucket = self._buckets[pos]
+        yield from bucket[find(bucket, key):]
+        for bucket in self._buckets[pos + 1:]:
+            yield from bucket
+
+    def iter_from_position(self, position: int) -> Iterator[Any]:
+        """
+        Iterates keys in order, skipping the first `position` keys.
+        """
+        if position < 0:
+            raise ValueError("Position cannot be negative.")
+        for pos, bucket in enumerate(self._buckets):
+            if position < len(bucket):
+                yield from bucket[position:]
+                for rest in self._buckets[pos + 1:]:
+                    yield from rest
+                return
+            position -= len(bucket)